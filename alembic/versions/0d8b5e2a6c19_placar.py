@@ -0,0 +1,40 @@
+"""placar
+
+Revision ID: 0d8b5e2a6c19
+Revises: 6e1c3a9f4b27
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d8b5e2a6c19'
+down_revision: Union[str, None] = '6e1c3a9f4b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A tabela nasce vazia: a carga dos votos a preenche ano a ano, ou todas as proposições
+    de uma vez com `python -m utils.placar`.
+    """
+    op.create_table('placar',
+    sa.Column('id_proposicao', sa.Integer(), nullable=False),
+    sa.Column('sessoes', sa.Integer(), nullable=False),
+    sa.Column('total_votos', sa.Integer(), nullable=False),
+    sa.Column('conteudo', sa.Text(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['id_proposicao'], ['proposicao.id'], ),
+    sa.PrimaryKeyConstraint('id_proposicao')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('placar')
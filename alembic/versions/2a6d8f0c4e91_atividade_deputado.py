@@ -0,0 +1,47 @@
+"""atividade_deputado
+
+Revision ID: 2a6d8f0c4e91
+Revises: 7c3e9a1f5b48
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6d8f0c4e91'
+down_revision: Union[str, None] = '7c3e9a1f5b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A tabela é criada vazia: preencha com `python -m utils.atividade` (ou recarregando os
+    votos) antes de servir o ranking de atuantes e o resumo dos deputados.
+    """
+    op.create_table('atividadedeputado',
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('id_deputado', sa.Integer(), nullable=False),
+    sa.Column('sessoes_votadas', sa.Integer(), nullable=False),
+    sa.Column('sessoes_do_ano', sa.Integer(), nullable=False),
+    sa.Column('proposicoes_votadas', sa.Integer(), nullable=False),
+    sa.Column('votos_sim', sa.Integer(), nullable=False),
+    sa.Column('votos_nao', sa.Integer(), nullable=False),
+    sa.Column('votos_abstencao', sa.Integer(), nullable=False),
+    sa.Column('votos_obstrucao', sa.Integer(), nullable=False),
+    sa.Column('votos_outros', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_deputado'], ['deputado.id'], ),
+    sa.PrimaryKeyConstraint('ano', 'id_deputado')
+    )
+    op.create_index('ix_atividadedeputado_id_deputado_ano', 'atividadedeputado', ['id_deputado', 'ano'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_atividadedeputado_id_deputado_ano', table_name='atividadedeputado')
+    op.drop_table('atividadedeputado')
@@ -0,0 +1,39 @@
+"""dashboard_snapshot
+
+Revision ID: 3b9d0c7e21f4
+Revises: fb1e6aad9410
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d0c7e21f4'
+down_revision: Union[str, None] = 'fb1e6aad9410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dashboardsnapshot',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('etag', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('conteudo', sa.Text(), nullable=False),
+    sa.Column('origem', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+    sa.Column('gerado_em', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_dashboardsnapshot_etag'), 'dashboardsnapshot', ['etag'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_dashboardsnapshot_etag'), table_name='dashboardsnapshot')
+    op.drop_table('dashboardsnapshot')
@@ -0,0 +1,56 @@
+"""ranking_proposicao
+
+Revision ID: 4f7a2c8e1d36
+Revises: 0d8b5e2a6c19
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7a2c8e1d36'
+down_revision: Union[str, None] = '0d8b5e2a6c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    O ranking já é preenchido aqui; depois é recalculado ao fim de cada carga.
+    """
+    op.create_table('rankingproposicao',
+    sa.Column('posicao', sa.Integer(), nullable=False),
+    sa.Column('id_proposicao', sa.Integer(), nullable=False),
+    sa.Column('id_dados_abertos', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('sigla_tipo', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('ementa', sa.TEXT(), nullable=True),
+    sa.Column('total_votacoes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_proposicao'], ['proposicao.id'], ),
+    sa.PrimaryKeyConstraint('posicao'),
+    sa.UniqueConstraint('id_proposicao')
+    )
+    op.create_index('ix_rankingproposicao_ano_posicao', 'rankingproposicao', ['ano', 'posicao'], unique=False)
+    op.create_index('ix_rankingproposicao_sigla_tipo_posicao', 'rankingproposicao', ['sigla_tipo', 'posicao'], unique=False)
+
+    op.execute(
+        'INSERT INTO rankingproposicao (posicao, id_proposicao, id_dados_abertos, sigla_tipo, ano, ementa, total_votacoes) '
+        'SELECT row_number() OVER (ORDER BY c.total_votacoes DESC, p.id), p.id, p.id_dados_abertos, p.sigla_tipo, '
+        'p.ano, p.ementa, c.total_votacoes '
+        'FROM proposicao p JOIN ('
+        'SELECT id_proposicao, count(id_votacao) AS total_votacoes FROM votacaoproposicao GROUP BY id_proposicao'
+        ') c ON c.id_proposicao = p.id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rankingproposicao_sigla_tipo_posicao', table_name='rankingproposicao')
+    op.drop_index('ix_rankingproposicao_ano_posicao', table_name='rankingproposicao')
+    op.drop_table('rankingproposicao')
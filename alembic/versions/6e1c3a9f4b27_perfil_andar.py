@@ -0,0 +1,48 @@
+"""perfil_andar
+
+Revision ID: 6e1c3a9f4b27
+Revises: b8d1f4a7c352
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1c3a9f4b27'
+down_revision: Union[str, None] = 'b8d1f4a7c352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A tabela nasce vazia: é preenchida pelo pós-ingestão da próxima carga ou por
+    `python -m tratamentoDados.pos_ingest`.
+    """
+    op.create_table('perfilandar',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('andar_chave', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('predio_chave', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('andar', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('predio', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('id_partido', sa.Integer(), nullable=True),
+    sa.Column('deputados_no_andar', sa.Integer(), nullable=False),
+    sa.Column('deputados_com_despesa', sa.Integer(), nullable=False),
+    sa.Column('quantidade_despesas', sa.Integer(), nullable=False),
+    sa.Column('total_gasto', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['id_partido'], ['partido.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ano', 'andar_chave', 'predio_chave', 'id_partido')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('perfilandar')
@@ -0,0 +1,48 @@
+"""coesao_partido
+
+Revision ID: 7c3e9a1f5b48
+Revises: 4f7a2c8e1d36
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1f5b48'
+down_revision: Union[str, None] = '4f7a2c8e1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A tabela é criada vazia: preencha com `python -m utils.coesao` (ou recarregando os votos).
+    """
+    op.create_table('coesaopartido',
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('id_votacao', sa.Integer(), nullable=False),
+    sa.Column('id_partido', sa.Integer(), nullable=False),
+    sa.Column('total_votos', sa.Integer(), nullable=False),
+    sa.Column('votos_sim', sa.Integer(), nullable=False),
+    sa.Column('votos_nao', sa.Integer(), nullable=False),
+    sa.Column('id_tipo_voto_maioria', sa.SmallInteger(), nullable=False),
+    sa.Column('votos_maioria', sa.Integer(), nullable=False),
+    sa.Column('indice_rice', sa.Float(), nullable=True),
+    sa.Column('concordancia_maioria', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['id_partido'], ['partido.id'], ),
+    sa.ForeignKeyConstraint(['id_tipo_voto_maioria'], ['tipovoto.id'], ),
+    sa.ForeignKeyConstraint(['id_votacao'], ['sessaovotacao.id'], ),
+    sa.PrimaryKeyConstraint('ano', 'id_votacao', 'id_partido')
+    )
+    op.create_index('ix_coesaopartido_id_partido_ano', 'coesaopartido', ['id_partido', 'ano'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_coesaopartido_id_partido_ano', table_name='coesaopartido')
+    op.drop_table('coesaopartido')
@@ -0,0 +1,35 @@
+"""geracao_ingest
+
+Revision ID: 8e2f61a4c0d7
+Revises: 3b9d0c7e21f4
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlmodel
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f61a4c0d7'
+down_revision: Union[str, None] = '3b9d0c7e21f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('geracaoingest',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('origem', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('concluida_em', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('geracaoingest')
@@ -0,0 +1,41 @@
+"""checkpoint_ingest
+
+Revision ID: a3e9c6f1d247
+Revises: f2b7d4c9a185
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e9c6f1d247'
+down_revision: Union[str, None] = 'f2b7d4c9a185'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('checkpointingest',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('etapa', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('unidade', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('registros', sa.Integer(), nullable=True),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('duracao_s', sa.Float(), nullable=False),
+    sa.Column('erro', sa.Text(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('etapa', 'unidade')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('checkpointingest')
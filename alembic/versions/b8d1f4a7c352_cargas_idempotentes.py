@@ -0,0 +1,51 @@
+"""cargas_idempotentes
+
+Revision ID: b8d1f4a7c352
+Revises: a3e9c6f1d247
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d1f4a7c352'
+down_revision: Union[str, None] = 'a3e9c6f1d247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Chaves naturais usadas pelos upserts das cargas. Duplicatas deixadas por cargas
+    repetidas são removidas antes, mantendo o registro mais antigo.
+    """
+    op.add_column('checkpointingest', sa.Column('posicao', sa.Integer(), nullable=True))
+
+    op.execute(
+        'DELETE FROM votacaoproposicao v USING votacaoproposicao w '
+        'WHERE v.id_votacao = w.id_votacao AND v.id_proposicao = w.id_proposicao AND v.id > w.id'
+    )
+    op.create_unique_constraint(
+        'votacaoproposicao_id_votacao_id_proposicao_key', 'votacaoproposicao', ['id_votacao', 'id_proposicao']
+    )
+
+    op.execute(
+        'DELETE FROM votoindividual v USING votoindividual w '
+        'WHERE v.ano = w.ano AND v.id_votacao = w.id_votacao AND v.id_deputado = w.id_deputado AND v.id > w.id'
+    )
+    # Em tabela particionada a restrição única precisa incluir a chave de partição (ano)
+    op.create_unique_constraint(
+        'votoindividual_id_votacao_id_deputado_ano_key', 'votoindividual', ['id_votacao', 'id_deputado', 'ano']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('votoindividual_id_votacao_id_deputado_ano_key', 'votoindividual', type_='unique')
+    op.drop_constraint('votacaoproposicao_id_votacao_id_proposicao_key', 'votacaoproposicao', type_='unique')
+    op.drop_column('checkpointingest', 'posicao')
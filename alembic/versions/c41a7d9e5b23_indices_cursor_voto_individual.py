@@ -0,0 +1,29 @@
+"""indices_cursor_voto_individual
+
+Revision ID: c41a7d9e5b23
+Revises: 8e2f61a4c0d7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a7d9e5b23'
+down_revision: Union[str, None] = '8e2f61a4c0d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_votoindividual_id_deputado_id', 'votoindividual', ['id_deputado', 'id'], unique=False)
+    op.create_index('ix_votoindividual_id_votacao_id', 'votoindividual', ['id_votacao', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_votoindividual_id_votacao_id', table_name='votoindividual')
+    op.drop_index('ix_votoindividual_id_deputado_id', table_name='votoindividual')
@@ -0,0 +1,77 @@
+"""normaliza_voto_individual
+
+Revision ID: d7a3f5e1c928
+Revises: c41a7d9e5b23
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f5e1c928'
+down_revision: Union[str, None] = 'c41a7d9e5b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+URI_DEPUTADOS = "https://dadosabertos.camara.leg.br/api/v2/deputados/"
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Troca as strings repetidas em cada voto (tipo, sigla e URIs) por chaves pequenas,
+    preservando os dados. O espaço das colunas removidas só volta ao sistema depois de um
+    `VACUUM FULL votoindividual` (ver `python -m benchmarks.tamanho_votoindividual --vacuum-full`).
+    """
+    op.create_table('tipovoto',
+    sa.Column('id', sa.SmallInteger(), autoincrement=True, nullable=False),
+    sa.Column('nome', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nome')
+    )
+    op.execute("INSERT INTO tipovoto (nome) SELECT DISTINCT tipo_voto FROM votoindividual ORDER BY tipo_voto")
+
+    op.add_column('votoindividual', sa.Column('id_tipo_voto', sa.SmallInteger(), nullable=True))
+    op.add_column('votoindividual', sa.Column('id_partido', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE votoindividual v SET id_tipo_voto = t.id FROM tipovoto t WHERE t.nome = v.tipo_voto"
+    )
+    op.execute(
+        "UPDATE votoindividual v SET id_partido = p.id FROM partido p WHERE p.sigla = v.sigla_partido_deputado"
+    )
+    op.alter_column('votoindividual', 'id_tipo_voto', nullable=False)
+    op.create_foreign_key('votoindividual_id_tipo_voto_fkey', 'votoindividual', 'tipovoto', ['id_tipo_voto'], ['id'])
+    op.create_foreign_key('votoindividual_id_partido_fkey', 'votoindividual', 'partido', ['id_partido'], ['id'])
+
+    op.drop_column('votoindividual', 'tipo_voto')
+    op.drop_column('votoindividual', 'sigla_partido_deputado')
+    op.drop_column('votoindividual', 'uri_deputado')
+    op.drop_column('votoindividual', 'uri_sessao_votacao')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('votoindividual', sa.Column('uri_sessao_votacao', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True))
+    op.add_column('votoindividual', sa.Column('uri_deputado', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True))
+    op.add_column('votoindividual', sa.Column('sigla_partido_deputado', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True))
+    op.add_column('votoindividual', sa.Column('tipo_voto', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True))
+
+    op.execute("UPDATE votoindividual v SET tipo_voto = t.nome FROM tipovoto t WHERE t.id = v.id_tipo_voto")
+    op.execute("UPDATE votoindividual v SET sigla_partido_deputado = p.sigla FROM partido p WHERE p.id = v.id_partido")
+    op.execute(
+        f"UPDATE votoindividual v SET uri_deputado = '{URI_DEPUTADOS}' || d.id_dados_abertos "
+        "FROM deputado d WHERE d.id = v.id_deputado"
+    )
+    op.execute("UPDATE votoindividual v SET uri_sessao_votacao = s.uri FROM sessaovotacao s WHERE s.id = v.id_votacao")
+    op.alter_column('votoindividual', 'tipo_voto', nullable=False)
+
+    op.drop_constraint('votoindividual_id_partido_fkey', 'votoindividual', type_='foreignkey')
+    op.drop_constraint('votoindividual_id_tipo_voto_fkey', 'votoindividual', type_='foreignkey')
+    op.drop_column('votoindividual', 'id_partido')
+    op.drop_column('votoindividual', 'id_tipo_voto')
+    op.drop_table('tipovoto')
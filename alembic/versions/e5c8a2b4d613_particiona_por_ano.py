@@ -0,0 +1,115 @@
+"""particiona_por_ano
+
+Revision ID: e5c8a2b4d613
+Revises: d7a3f5e1c928
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import logging
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c8a2b4d613'
+down_revision: Union[str, None] = 'd7a3f5e1c928'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Índices e chaves estrangeiras de cada tabela: (nome, colunas[, tabela referenciada])
+INDICES = {
+    'despesa': [('ix_despesa_id_deputado', ['id_deputado'])],
+    'votoindividual': [
+        ('ix_votoindividual_id_votacao', ['id_votacao']),
+        ('ix_votoindividual_id_deputado', ['id_deputado']),
+        ('ix_votoindividual_id_deputado_id', ['id_deputado', 'id']),
+        ('ix_votoindividual_id_votacao_id', ['id_votacao', 'id']),
+    ],
+}
+CHAVES_ESTRANGEIRAS = {
+    'despesa': [('despesa_id_deputado_fkey', 'id_deputado', 'deputado')],
+    'votoindividual': [
+        ('votoindividual_id_votacao_fkey', 'id_votacao', 'sessaovotacao'),
+        ('votoindividual_id_deputado_fkey', 'id_deputado', 'deputado'),
+        ('votoindividual_id_tipo_voto_fkey', 'id_tipo_voto', 'tipovoto'),
+        ('votoindividual_id_partido_fkey', 'id_partido', 'partido'),
+    ],
+}
+
+# Ano de cada voto: o da sessão de votação (o registro individual pode vir sem data)
+SELECT_ANO_VOTO = (
+    "SELECT v.*, COALESCE(left(s.data_hora_registro, 4), left(v.data_hora_registro, 4))::integer AS ano "
+    "FROM votoindividual_antiga v JOIN sessaovotacao s ON s.id = v.id_votacao"
+)
+
+
+def _recriar(tabela: str, particionada: bool, select_linhas: str, chave: List[str], colunas_novas: str = '') -> None:
+    """
+    Troca `tabela` por uma cópia com a mesma estrutura (particionada por ano ou não), mais
+    as `colunas_novas` (definições SQL), e move os dados. Os índices e as chaves são
+    criados depois da cópia, que fica mais rápida. Na tabela particionada, linhas sem ano
+    não têm partição: ficam de fora da cópia, com a contagem no log.
+    """
+    antiga = f'{tabela}_antiga'
+    op.execute(f'ALTER TABLE {tabela} RENAME TO {antiga}')
+    for nome, _ in INDICES[tabela]:
+        op.execute(f'DROP INDEX IF EXISTS {nome}')
+    op.execute(f'ALTER TABLE {antiga} DROP CONSTRAINT IF EXISTS {tabela}_pkey')
+
+    particao = ' PARTITION BY RANGE (ano)' if particionada else ''
+    # A chave de partição precisa existir no CREATE TABLE
+    op.execute(f'CREATE TABLE {tabela} (LIKE {antiga} INCLUDING DEFAULTS{colunas_novas}){particao}')
+    # A sequência do id passa a pertencer à nova tabela e sobrevive ao DROP da antiga
+    op.execute(f'ALTER SEQUENCE {tabela}_id_seq OWNED BY {tabela}.id')
+
+    filtro = ''
+    if particionada:
+        filtro = ' WHERE ano IS NOT NULL'
+        sem_ano = op.get_bind().execute(sa.text(f'SELECT count(*) FROM ({select_linhas}) t WHERE ano IS NULL')).scalar()
+        if sem_ano:
+            logger.warning(f'{tabela}: {sem_ano} linhas sem ano (sessão e voto sem data) ficam de fora da cópia.')
+        anos = [linha[0] for linha in op.get_bind().execute(sa.text(
+            f'SELECT DISTINCT ano FROM ({select_linhas}) t WHERE ano IS NOT NULL ORDER BY ano'
+        ))]
+        for ano in anos:
+            op.execute(f'CREATE TABLE {tabela}_{ano} PARTITION OF {tabela} FOR VALUES FROM ({ano}) TO ({ano + 1})')
+
+    colunas = ', '.join(
+        linha[0] for linha in op.get_bind().execute(sa.text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :tabela ORDER BY ordinal_position"
+        ), {'tabela': tabela})
+    )
+    op.execute(f'INSERT INTO {tabela} ({colunas}) SELECT {colunas} FROM ({select_linhas}) t{filtro}')
+    op.execute(f'DROP TABLE {antiga}')
+
+    op.create_primary_key(f'{tabela}_pkey', tabela, chave)
+    for nome, coluna, referenciada in CHAVES_ESTRANGEIRAS[tabela]:
+        op.create_foreign_key(nome, tabela, referenciada, [coluna], ['id'])
+    for nome, colunas_indice in INDICES[tabela]:
+        op.create_index(nome, tabela, colunas_indice, unique=False)
+    op.execute(f'ANALYZE {tabela}')
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    `despesa` e `votoindividual` passam a ser particionadas por RANGE (ano), uma partição
+    por ano (`<tabela>_<ano>`). As partições de anos novos são criadas pelas cargas
+    (utils/particoes.py); `python -m tratamentoDados.particoes` lista, cria, arquiva e
+    confere a poda das consultas por ano.
+    """
+    _recriar('despesa', True, 'SELECT * FROM despesa_antiga', ['id', 'ano'])
+    _recriar('votoindividual', True, SELECT_ANO_VOTO, ['id', 'ano'], colunas_novas=', ano integer NOT NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partições arquivadas (desanexadas) não voltam: só os dados ainda anexados são copiados
+    _recriar('votoindividual', False, 'SELECT * FROM votoindividual_antiga', ['id'])
+    op.drop_column('votoindividual', 'ano')
+    _recriar('despesa', False, 'SELECT * FROM despesa_antiga', ['id'])
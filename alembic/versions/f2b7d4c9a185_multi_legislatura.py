@@ -0,0 +1,57 @@
+"""multi_legislatura
+
+Revision ID: f2b7d4c9a185
+Revises: e5c8a2b4d613
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d4c9a185'
+down_revision: Union[str, None] = 'e5c8a2b4d613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('mandatodeputado',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('id_deputado', sa.Integer(), nullable=False),
+    sa.Column('id_legislatura', sa.Integer(), nullable=False),
+    sa.Column('sigla_partido', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+    sa.Column('sigla_uf', sqlmodel.sql.sqltypes.AutoString(length=2), nullable=True),
+    sa.Column('id_partido', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_deputado'], ['deputado.id'], ),
+    sa.ForeignKeyConstraint(['id_partido'], ['partido.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id_deputado', 'id_legislatura')
+    )
+    op.create_index(op.f('ix_mandatodeputado_id_deputado'), 'mandatodeputado', ['id_deputado'], unique=False)
+    op.create_index(op.f('ix_mandatodeputado_id_legislatura'), 'mandatodeputado', ['id_legislatura'], unique=False)
+    # Os deputados já carregados têm um mandato: o da legislatura em que foram lidos
+    op.execute(
+        "INSERT INTO mandatodeputado (id_deputado, id_legislatura, sigla_partido, sigla_uf, id_partido) "
+        "SELECT id, id_legislativo, sigla_partido, sigla_uf, id_partido FROM deputado WHERE id_legislativo IS NOT NULL"
+    )
+
+    op.add_column('sessaovotacao', sa.Column('ano', sa.Integer(), nullable=True))
+    op.execute("UPDATE sessaovotacao SET ano = left(data_hora_registro, 4)::integer WHERE data_hora_registro IS NOT NULL")
+    op.create_index(op.f('ix_sessaovotacao_ano'), 'sessaovotacao', ['ano'], unique=False)
+    op.create_index(op.f('ix_proposicao_ano'), 'proposicao', ['ano'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_proposicao_ano'), table_name='proposicao')
+    op.drop_index(op.f('ix_sessaovotacao_ano'), table_name='sessaovotacao')
+    op.drop_column('sessaovotacao', 'ano')
+    op.drop_index(op.f('ix_mandatodeputado_id_legislatura'), table_name='mandatodeputado')
+    op.drop_index(op.f('ix_mandatodeputado_id_deputado'), table_name='mandatodeputado')
+    op.drop_table('mandatodeputado')
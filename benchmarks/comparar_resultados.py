@@ -0,0 +1,46 @@
+"""
+Compara dois resultados do benchmark de carga e aponta regressões de latência.
+
+Uso:
+    python -m benchmarks.comparar_resultados benchmarks/resultados/antes.json benchmarks/resultados/depois.json
+"""
+import argparse
+import json
+import sys
+
+def carregar(caminho: str) -> dict:
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark.")
+    parser.add_argument("base")
+    parser.add_argument("novo")
+    parser.add_argument("--metrica", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms", "media_ms"])
+    parser.add_argument("--tolerancia", type=float, default=10.0, help="Variação percentual aceita antes de acusar regressão.")
+    args = parser.parse_args()
+
+    base, novo = carregar(args.base), carregar(args.novo)
+    regressoes = 0
+
+    print(f"Base: {base.get('commit')}  Novo: {novo.get('commit')}  Métrica: {args.metrica}\n")
+    print(f"{'endpoint':<48} {'base':>10} {'novo':>10} {'variação':>10}")
+    for template, m_novo in sorted(novo["endpoints"].items()):
+        m_base = base["endpoints"].get(template)
+        if not m_base:
+            print(f"{template:<48} {'-':>10} {m_novo[args.metrica]:>9.1f}ms {'novo':>10}")
+            continue
+
+        antes, depois = m_base[args.metrica], m_novo[args.metrica]
+        variacao = ((depois - antes) / antes * 100) if antes else 0.0
+        marcador = ""
+        if variacao > args.tolerancia:
+            regressoes += 1
+            marcador = "  <-- regressão"
+        print(f"{template:<48} {antes:>9.1f}ms {depois:>9.1f}ms {variacao:>+9.1f}%{marcador}")
+
+    print(f"\nVazão: {base.get('vazao_rps')} -> {novo.get('vazao_rps')} req/s")
+    sys.exit(1 if regressoes else 0)
+
+if __name__ == "__main__":
+    main()
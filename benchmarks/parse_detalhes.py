@@ -0,0 +1,302 @@
+"""
+Microbenchmark da leitura dos documentos de detalhe (deputado, partido, votação e proposição).
+
+Compara, sobre payloads fixos no formato da API, o caminho anterior das cargas
+(`ET.fromstring` + `findtext` no XML, `json` da biblioteca padrão na proposição) com o
+`tratamentoDados.detalhes` (XML pelos caminhos do `Documento`, JSON com orjson e sem ele)
+e com uma leitura em streaming por `iterparse`. Mede o tempo por documento e as alocações
+(pico de memória e blocos alocados durante a leitura).
+
+Uso (a partir da raiz do projeto):
+
+    python -m benchmarks.parse_detalhes [--repeticoes 2000]
+"""
+import argparse
+import io
+import json
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from typing import Callable, Dict
+
+from tratamentoDados import detalhes
+from tratamentoDados.detalhes import DEPUTADO, PARTIDO, PROPOSICAO, VOTACAO, Documento
+
+URI = "https://dadosabertos.camara.leg.br/api/v2"
+
+def _links(recurso: str) -> list:
+    return [{"rel": rel, "href": f"{URI}/{recurso}", "type": "application/json"} for rel in ("self", "first", "last")]
+
+PAYLOADS = {
+    "deputado": {
+        "dados": {
+            "id": 220593,
+            "uri": f"{URI}/deputados/220593",
+            "nomeCivil": "ABILIO JACQUES BRUNINI MOUMER",
+            "ultimoStatus": {
+                "id": 220593,
+                "uri": f"{URI}/deputados/220593",
+                "nome": "Abilio Brunini",
+                "siglaPartido": "PL",
+                "uriPartido": f"{URI}/partidos/37906",
+                "siglaUf": "MT",
+                "idLegislatura": 57,
+                "urlFoto": "https://www.camara.leg.br/internet/deputado/bandep/220593.jpg",
+                "email": "dep.abiliobrunini@camara.leg.br",
+                "data": "2023-02-01",
+                "nomeEleitoral": "Abilio Brunini",
+                "gabinete": {
+                    "nome": "416", "predio": "4", "sala": "416", "andar": "4",
+                    "telefone": "3215-5416", "email": "dep.abiliobrunini@camara.leg.br",
+                },
+                "situacao": "Exercício",
+                "condicaoEleitoral": "Titular",
+                "descricaoStatus": None,
+            },
+            "cpf": "99770962104",
+            "sexo": "M",
+            "urlWebsite": None,
+            "redeSocial": [f"https://www.instagram.com/perfil{i}" for i in range(4)],
+            "dataNascimento": "1984-01-31",
+            "dataFalecimento": None,
+            "ufNascimento": "MT",
+            "municipioNascimento": "Cuiabá",
+            "escolaridade": "Superior",
+        },
+        "links": _links("deputados/220593"),
+    },
+    "partido": {
+        "dados": {
+            "id": 37906,
+            "sigla": "PL",
+            "nome": "Partido Liberal",
+            "uri": f"{URI}/partidos/37906",
+            "status": {
+                "data": "2023-02-01T00:00",
+                "idLegislatura": "57",
+                "situacao": "Ativo",
+                "totalPosse": "99",
+                "totalMembros": "93",
+                "uriMembros": f"{URI}/deputados?idLegislatura=57&siglaPartido=PL",
+                "lider": {
+                    "uri": f"{URI}/deputados/204554", "nome": "Altineu Côrtes", "siglaPartido": "PL",
+                    "uriPartido": f"{URI}/partidos/37906", "uf": "RJ", "idLegislatura": 57,
+                    "urlFoto": "https://www.camara.leg.br/internet/deputado/bandep/204554.jpg",
+                },
+            },
+            "numeroEleitoral": None,
+            "urlLogo": "https://www.camara.leg.br/internet/Deputado/img/partidos/PL.gif",
+            "urlWebSite": None,
+            "urlFacebook": None,
+        },
+        "links": _links("partidos/37906"),
+    },
+    "votacao": {
+        "dados": {
+            "id": "2438467-47",
+            "uri": f"{URI}/votacoes/2438467-47",
+            "data": "2024-05-28",
+            "dataHoraRegistro": "2024-05-28T21:14:04",
+            "siglaOrgao": "PLEN",
+            "aprovacao": 1,
+            "votosSim": 330,
+            "votosNao": 102,
+            "votosOutros": 1,
+            "descricao": "Aprovada a Emenda de Plenário nº 3.",
+            "efeitosRegistrados": [
+                {"dataHoraResultado": "2024-05-28T21:14:04", "descResultado": "Aprovada", "tituloProposicao": f"PL {i}/2024"}
+                for i in range(3)
+            ],
+            "objetosPossiveis": [
+                {"id": 2438467 + i, "uri": f"{URI}/proposicoes/{2438467 + i}", "siglaTipo": "EMP", "numero": i, "ano": 2024,
+                 "ementa": "Emenda de Plenário ao Projeto de Lei."}
+                for i in range(6)
+            ],
+            "proposicoesAfetadas": [
+                {"id": 2438467 + i, "uri": f"{URI}/proposicoes/{2438467 + i}", "siglaTipo": "PL", "numero": 1000 + i,
+                 "ano": 2024, "ementa": "Altera a Lei nº 9.503, de 23 de setembro de 1997."}
+                for i in range(3)
+            ],
+            "ultimaApresentacaoProposicao": {"dataHoraRegistro": "2024-05-28T19:00:00", "descricao": "Emenda", "uriProposicaoCitada": None},
+        },
+        "links": _links("votacoes/2438467-47"),
+    },
+    "proposicao": {
+        "dados": {
+            "id": 2438467,
+            "uri": f"{URI}/proposicoes/2438467",
+            "siglaTipo": "PL",
+            "codTipo": 139,
+            "numero": 1000,
+            "ano": 2024,
+            "ementa": "Altera a Lei nº 9.503, de 23 de setembro de 1997 (Código de Trânsito Brasileiro).",
+            "dataApresentacao": "2024-03-26T15:43",
+            "uriOrgaoNumerador": f"{URI}/orgaos/180",
+            "statusProposicao": {
+                "dataHora": "2024-05-29T10:00", "sequencia": 12, "siglaOrgao": "PLEN", "uriOrgao": f"{URI}/orgaos/180",
+                "regime": "Urgência (Art. 155, RICD)", "descricaoTramitacao": "Remessa ao Senado Federal",
+                "codTipoTramitacao": "1020", "descricaoSituacao": "Aguardando Apreciação pelo Senado Federal",
+                "codSituacao": 1285, "despacho": "Remessa ao Senado Federal por meio do Of. nº 123/2024.",
+                "url": None, "ambito": "Regimental", "apreciacao": "Proposição Sujeita à Apreciação do Plenário",
+            },
+            "uriAutores": f"{URI}/proposicoes/2438467/autores",
+            "descricaoTipo": "Projeto de Lei",
+            "ementaDetalhada": None,
+            "keywords": "Alteração, Código de Trânsito Brasileiro, habilitação, condutor",
+            "urlInteiroTeor": "https://www.camara.leg.br/proposicoesWeb/prop_mostrarintegra?codteor=2411111",
+            "justificativa": None,
+        },
+        "links": _links("proposicoes/2438467"),
+    },
+}
+
+def _para_xml(tag: str, valor) -> str:
+    # Como a API serializa: listas repetem o nome do elemento pai em cada item
+    if isinstance(valor, dict):
+        return f"<{tag}>{''.join(_para_xml(k, v) for k, v in valor.items())}</{tag}>"
+    if isinstance(valor, list):
+        return f"<{tag}>{''.join(_para_xml(tag, item) for item in valor)}</{tag}>"
+    if valor is None:
+        return f"<{tag}/>"
+    return f"<{tag}>{escape(str(valor))}</{tag}>"
+
+JSON = {nome: json.dumps(payload, ensure_ascii=False).encode() for nome, payload in PAYLOADS.items()}
+XML = {nome: f'<?xml version="1.0" encoding="UTF-8"?>{_para_xml("xml", payload)}'.encode() for nome, payload in PAYLOADS.items()}
+DOCUMENTOS: Dict[str, Documento] = {"deputado": DEPUTADO, "partido": PARTIDO, "votacao": VOTACAO, "proposicao": PROPOSICAO}
+
+# Leitura como as cargas faziam antes (árvore inteira + findtext, proposição em JSON)
+def _anterior_deputado(conteudo: bytes) -> Dict:
+    root = ET.fromstring(conteudo)
+    campo = lambda caminho: root.findtext(caminho) or None
+    return {
+        "nome_civil": campo("dados/nomeCivil"),
+        "nome_eleitoral": campo("dados/ultimoStatus/nomeEleitoral"),
+        "sexo": campo("dados/sexo"),
+        "sigla_partido": campo("dados/ultimoStatus/siglaPartido"),
+        **{f"gabinete_{c}": campo(f"dados/ultimoStatus/gabinete/{c}") for c in ("nome", "predio", "sala", "andar", "telefone", "email")},
+    }
+
+def _anterior_partido(conteudo: bytes) -> Dict:
+    dados = ET.fromstring(conteudo).find("dados")
+    inteiro = lambda caminho: int(dados.findtext(caminho)) if dados.findtext(caminho) else None
+    return {
+        "uri_logo": dados.findtext("urlLogo") or None,
+        "id_legislativo": inteiro("status/idLegislatura"),
+        "situacao": dados.findtext("status/situacao") or None,
+        "total_membros": inteiro("status/totalMembros"),
+        "total_posse_legislatura": inteiro("status/totalPosse"),
+    }
+
+def _anterior_votacao(conteudo: bytes) -> Dict:
+    root = ET.fromstring(conteudo)
+    return {"proposicoes_afetadas_ids": [
+        prop.findtext("id") for prop in root.findall(".//proposicoesAfetadas/proposicoesAfetadas") if prop.findtext("id")
+    ]}
+
+def _anterior_proposicao(conteudo: bytes) -> Dict:
+    dados = json.loads(conteudo).get("dados", {})
+    return {
+        "id": dados.get("id"),
+        "sigla_tipo": dados.get("siglaTipo"),
+        "ano": dados.get("ano"),
+        "ementa": dados.get("ementa"),
+        "data_apresentacao": dados.get("dataApresentacao"),
+        "status": dados.get("statusProposicao", {}).get("descricaoSituacao"),
+        "url_inteiro_teor": dados.get("urlInteiroTeor"),
+    }
+
+ANTERIOR = {"deputado": (_anterior_deputado, XML), "partido": (_anterior_partido, XML),
+            "votacao": (_anterior_votacao, XML), "proposicao": (_anterior_proposicao, JSON)}
+
+def _iterparse(documento: Documento) -> Callable[[bytes], Dict]:
+    # Streaming: sem montar a árvore e parando quando os campos escalares foram lidos
+    campos = {caminho: campo for campo, caminho in documento.campos.items()}
+    campos.update({(lista, lista, item): campo for campo, (lista, item) in documento.listas.items()})
+
+    def ler(conteudo: bytes) -> Dict:
+        resultado = dict.fromkeys(documento.campos)
+        resultado.update({campo: [] for campo in documento.listas})
+        faltam = len(documento.campos)
+        # Caminho a partir de <dados>; a raiz (<xml>) fica de fora
+        caminho, pilha = None, []
+        for evento, elemento in ET.iterparse(io.BytesIO(conteudo), events=("start", "end")):
+            if evento == "start":
+                pilha.append(caminho)
+                caminho = () if caminho is None else (*caminho, elemento.tag)
+                continue
+            campo = campos.get(caminho[1:])
+            caminho = pilha.pop()
+            if campo in documento.listas:
+                if elemento.text:
+                    resultado[campo].append(elemento.text)
+            elif campo is not None:
+                resultado[campo] = elemento.text or None
+                faltam -= 1
+                if not faltam and not documento.listas:
+                    break
+            elemento.clear()
+        return documento._converter(resultado)
+    return ler
+
+def _json_padrao(documento: Documento) -> Callable[[bytes], Dict]:
+    def ler(conteudo: bytes) -> Dict:
+        orjson, detalhes.orjson = detalhes.orjson, None
+        try:
+            return documento.de_json(conteudo)
+        finally:
+            detalhes.orjson = orjson
+    return ler
+
+def caminhos(nome: str) -> Dict[str, tuple]:
+    documento = DOCUMENTOS[nome]
+    return {
+        "anterior": ANTERIOR[nome],
+        "xml": (documento.de_xml, XML),
+        "iterparse": (_iterparse(documento), XML),
+        "json": (_json_padrao(documento), JSON),
+        "orjson": (documento.de_json, JSON),
+    }
+
+def medir(funcao: Callable, conteudo: bytes, repeticoes: int) -> Dict:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(conteudo)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    resultado = funcao(conteudo)
+    pico = tracemalloc.get_traced_memory()[1] - base
+    depois = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocos = sum(max(diferenca.count_diff, 0) for diferenca in depois.compare_to(antes, "lineno"))
+    del resultado
+
+    return {"us_por_doc": round(duracao / repeticoes * 1e6, 2), "pico_kib": round(pico / 1024, 1), "blocos": blocos}
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark da leitura dos documentos de detalhe.")
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"orjson: {'sim' if detalhes.orjson else 'não (o caminho orjson usa o json da biblioteca padrão)'}")
+    print(f"{'documento':<12}{'caminho':<11}{'bytes':>8}{'µs/doc':>10}{'pico KiB':>10}{'blocos':>8}")
+    for nome in DOCUMENTOS:
+        resultados = {}
+        saidas = []
+        for caminho, (funcao, formato) in caminhos(nome).items():
+            saidas.append(funcao(formato[nome]))
+            resultados[caminho] = medir(funcao, formato[nome], args.repeticoes)
+            r = resultados[caminho]
+            print(f"{nome:<12}{caminho:<11}{len(formato[nome]):>8}{r['us_por_doc']:>10}{r['pico_kib']:>10}{r['blocos']:>8}")
+        # Todos os caminhos têm de extrair exatamente os mesmos campos
+        assert all(saida == saidas[0] for saida in saidas), f"{nome}: leituras divergentes {saidas}"
+        melhor = min(("xml", "iterparse", "orjson"), key=lambda c: resultados[c]["us_por_doc"])
+        ganho = resultados["anterior"]["us_por_doc"] / resultados[melhor]["us_por_doc"]
+        print(f"{'':<12}{'ganho':<11}{ganho:>17.2f}x ({melhor})")
+
+if __name__ == "__main__":
+    main()
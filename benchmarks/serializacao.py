@@ -0,0 +1,137 @@
+"""
+Microbenchmark do custo por item do caminho de serialização das rotas de listagem,
+antes (entidades do ORM + `jsonable_encoder` + `json.dumps`) e depois (consulta projetada
++ dicts + `RespostaJSON`/orjson), para páginas de 100 itens.
+
+Uso (a partir da raiz do projeto):
+
+    python -m benchmarks.serializacao
+    python -m benchmarks.serializacao --database-url postgresql://... --repeticoes 500
+
+Sem `--database-url` roda em um SQLite em memória populado com linhas sintéticas; com ele,
+usa os dados já existentes no banco (só leitura).
+"""
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine, select
+
+from benchmarks.dados_sinteticos import TIPOS_DESPESA
+from database import target_metadata
+from dtos.deputado_dtos import DeputadoResponseWithGabinete, GabineteResponse
+from dtos.despesa_dtos import DespesaResponse
+from models.deputado import Deputado
+from models.despesa import Despesa
+from models.gabinete import Gabinete
+from models.partido import Partido
+from utils.pagination import PaginatedResponse, PaginationParams, pagina
+from utils.projecao import colunas, extrair_aninhado, linhas_para_dicts
+from utils.respostas import RespostaJSON, orjson
+
+def popular_sqlite(engine, n_deputados: int, n_despesas: int, seed: int):
+    rnd = random.Random(seed)
+    target_metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Partido(id=1, id_dados_abertos=1, sigla="PX", nome_completo="Partido X"))
+        for i in range(1, n_deputados + 1):
+            session.add(Deputado(
+                id=i, id_dados_abertos=100000 + i, nome_civil=f"Deputado Civil {i}", nome_eleitoral=f"Deputado {i}",
+                sigla_partido="PX", sigla_uf="SP", id_partido=1, id_legislativo=57,
+                url_foto=f"https://www.camara.leg.br/internet/deputado/bandep/{100000 + i}.jpg", sexo=rnd.choice("MF"),
+            ))
+            session.add(Gabinete(
+                id_deputado=i, nome=str(i), predio="4", sala=str(rnd.randint(100, 999)), andar=str(rnd.randint(1, 9)),
+                telefone="3215-0000", email=f"dep.{i}@camara.leg.br",
+            ))
+        for i in range(1, n_despesas + 1):
+            # Chave primária composta (id, ano): sem autoincremento no SQLite
+            session.add(Despesa(
+                id=i, id_deputado=rnd.randint(1, n_deputados), ano=2024, mes=rnd.randint(1, 12),
+                tipo_despesa=rnd.choice(TIPOS_DESPESA)[0], valor_liquido=round(rnd.uniform(10, 5000), 2),
+                tipo_documento="Nota Fiscal", url_documento="https://www.camara.leg.br/cota-parlamentar/nota-fiscal-eletronica",
+                nome_fornecedor=f"Fornecedor {rnd.randint(1, 500)}",
+            ))
+        session.commit()
+
+def _antes_despesas(session: Session, pagination: PaginationParams) -> bytes:
+    despesas = session.exec(select(Despesa).limit(pagination.per_page)).all()
+    conteudo = PaginatedResponse(items=despesas, total=len(despesas), page=1, per_page=pagination.per_page, total_pages=1)
+    return JSONResponse(jsonable_encoder(conteudo)).body
+
+def _depois_despesas(session: Session, pagination: PaginationParams) -> bytes:
+    despesas = linhas_para_dicts(session.exec(select(*colunas(DespesaResponse, Despesa)).limit(pagination.per_page)).all())
+    return RespostaJSON(pagina(despesas, len(despesas), pagination)).body
+
+def _antes_deputados(session: Session, pagination: PaginationParams) -> bytes:
+    deputados = session.exec(select(Deputado).options(selectinload(Deputado.gabinete)).limit(pagination.per_page)).all()
+    items = [
+        DeputadoResponseWithGabinete.from_model(dep, GabineteResponse.from_model(dep.gabinete) if dep.gabinete else None)
+        for dep in deputados
+    ]
+    conteudo = PaginatedResponse(items=items, total=len(items), page=1, per_page=pagination.per_page, total_pages=1)
+    return JSONResponse(jsonable_encoder(conteudo)).body
+
+def _depois_deputados(session: Session, pagination: PaginationParams) -> bytes:
+    statement = (
+        select(*colunas(DeputadoResponseWithGabinete, Deputado), *colunas(GabineteResponse, Gabinete, prefixo="gabinete_"))
+        .join(Gabinete, Gabinete.id_deputado == Deputado.id, isouter=True)
+        .limit(pagination.per_page)
+    )
+    items = [extrair_aninhado(item, "gabinete_") for item in linhas_para_dicts(session.exec(statement).all())]
+    return RespostaJSON(pagina(items, len(items), pagination)).body
+
+CENARIOS: Dict[str, Dict[str, Callable]] = {
+    "despesa/get_all": {"antes": _antes_despesas, "depois": _depois_despesas},
+    "deputado/get_all": {"antes": _antes_deputados, "depois": _depois_deputados},
+}
+
+def medir(engine, funcao: Callable, pagination: PaginationParams, repeticoes: int) -> Dict:
+    # Uma sessão nova por repetição, como numa requisição real (identity map vazio)
+    with Session(engine) as session:
+        itens = len(json.loads(funcao(session, pagination))["items"])
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        with Session(engine) as session:
+            funcao(session, pagination)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "itens_por_pagina": itens,
+        "ms_por_pagina": round(duracao / repeticoes * 1000, 3),
+        "us_por_item": round(duracao / repeticoes / max(itens, 1) * 1e6, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark de serialização das rotas de listagem.")
+    parser.add_argument("--database-url", default=None, help="Banco com dados reais; sem ele usa SQLite em memória.")
+    parser.add_argument("--itens", type=int, default=100, help="Itens por página.")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        popular_sqlite(engine, n_deputados=max(args.itens, 100), n_despesas=max(args.itens, 100) * 5, seed=args.seed)
+
+    pagination = PaginationParams(page=1, per_page=args.itens)
+    print(f"orjson: {'sim' if orjson else 'não (usando json da biblioteca padrão)'}")
+    print(f"{'cenário':<20}{'caminho':<10}{'ms/página':>12}{'µs/item':>10}")
+    for nome, caminhos in CENARIOS.items():
+        resultados = {caminho: medir(engine, funcao, pagination, args.repeticoes) for caminho, funcao in caminhos.items()}
+        for caminho, r in resultados.items():
+            print(f"{nome:<20}{caminho:<10}{r['ms_por_pagina']:>12}{r['us_por_item']:>10}")
+        ganho = resultados["antes"]["us_por_item"] / resultados["depois"]["us_por_item"]
+        print(f"{'':<20}{'ganho':<10}{ganho:>21.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Relatório de tamanho e velocidade de varredura da tabela `votoindividual`, para medir o
+efeito da normalização das colunas de texto (tipo de voto, sigla e URIs).
+
+Uso (a partir da raiz do projeto, em um banco Postgres):
+
+    python -m benchmarks.tamanho_votoindividual --saida benchmarks/resultados/voto_antes.json
+    alembic upgrade head
+    python -m benchmarks.tamanho_votoindividual --vacuum-full --comparar benchmarks/resultados/voto_antes.json
+
+A varredura é medida com `EXPLAIN (ANALYZE, BUFFERS)` de uma agregação sobre a tabela
+inteira, com os índices desabilitados para forçar o seq scan. `--vacuum-full` reescreve a
+tabela antes de medir: sem ele o espaço das colunas removidas continua ocupado.
+"""
+import argparse
+import json
+import os
+import statistics
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.carga_api import commit_atual
+
+CONSULTA_VARREDURA = "SELECT id_deputado, count(*) FROM votoindividual GROUP BY id_deputado"
+
+def medir_tamanho(conexao) -> Dict[str, int]:
+    linha = conexao.execute(text(
+        "SELECT pg_relation_size('votoindividual') AS tabela, "
+        "pg_indexes_size('votoindividual') AS indices, "
+        "pg_total_relation_size('votoindividual') AS total, "
+        "(SELECT count(*) FROM votoindividual) AS linhas"
+    )).one()
+    return dict(linha._mapping)
+
+def medir_varredura(conexao, repeticoes: int) -> Dict:
+    for parametro in ("enable_indexscan", "enable_indexonlyscan", "enable_bitmapscan"):
+        conexao.execute(text(f"SET {parametro} = off"))
+    conexao.execute(text("SET max_parallel_workers_per_gather = 0"))
+
+    tempos, buffers = [], 0
+    for _ in range(repeticoes):
+        plano = conexao.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {CONSULTA_VARREDURA}")).scalar()
+        if isinstance(plano, str):
+            plano = json.loads(plano)
+        tempos.append(plano[0]["Execution Time"])
+        raiz = plano[0]["Plan"]
+        buffers = raiz.get("Shared Hit Blocks", 0) + raiz.get("Shared Read Blocks", 0)
+
+    conexao.execute(text("RESET ALL"))
+    return {"mediana_ms": round(statistics.median(tempos), 2), "min_ms": round(min(tempos), 2), "buffers": buffers}
+
+def _reducao(antes: float, depois: float) -> str:
+    return f"{(1 - depois / antes) * 100:.1f}%" if antes else "-"
+
+def comparar(antes: Dict, depois: Dict):
+    print(f"\n{'métrica':<22}{'antes':>16}{'depois':>16}{'redução':>10}")
+    for chave in ("tabela", "indices", "total"):
+        a, d = antes["tamanho"][chave], depois["tamanho"][chave]
+        print(f"{chave + ' (MB)':<22}{a / 2**20:>16.1f}{d / 2**20:>16.1f}{_reducao(a, d):>10}")
+    for chave in ("buffers", "mediana_ms"):
+        a, d = antes["varredura"][chave], depois["varredura"][chave]
+        print(f"{'varredura ' + chave:<22}{a:>16}{d:>16}{_reducao(a, d):>10}")
+    if depois["varredura"]["mediana_ms"]:
+        print(f"\nGanho de velocidade na varredura: {antes['varredura']['mediana_ms'] / depois['varredura']['mediana_ms']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Tamanho e velocidade de varredura da tabela votoindividual.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--vacuum-full", action="store_true", help="Roda VACUUM FULL ANALYZE na tabela antes de medir.")
+    parser.add_argument("--comparar", default=None, help="JSON de uma medição anterior para comparar.")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON de saída.")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        if args.vacuum_full:
+            print("Executando VACUUM FULL ANALYZE votoindividual...")
+            conexao.execute(text("VACUUM FULL ANALYZE votoindividual"))
+        # Uma leitura antes de medir para que as duas medições partam do cache quente
+        conexao.execute(text(CONSULTA_VARREDURA)).all()
+        resultado = {
+            "commit": commit_atual(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "tamanho": medir_tamanho(conexao),
+            "varredura": medir_varredura(conexao, args.repeticoes),
+        }
+
+    saida = args.saida or os.path.join(
+        "benchmarks", "resultados", f"votoindividual_{resultado['commit'] or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+    tamanho = resultado["tamanho"]
+    print(f"Linhas: {tamanho['linhas']}  tabela: {tamanho['tabela'] / 2**20:.1f} MB  "
+          f"índices: {tamanho['indices'] / 2**20:.1f} MB  total: {tamanho['total'] / 2**20:.1f} MB")
+    print(f"Varredura: {resultado['varredura']['mediana_ms']} ms (mediana), {resultado['varredura']['buffers']} buffers")
+    print(f"Resultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(json.load(f), resultado)
+
+if __name__ == "__main__":
+    main()
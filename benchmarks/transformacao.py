@@ -0,0 +1,112 @@
+"""
+Benchmark da etapa de transformação das despesas (arquivo JSON Lines -> tuplas) em processos.
+
+Gera, a partir do conjunto sintético (`benchmarks.dados_sinteticos`), os arquivos anuais no
+formato gravado pela carga das despesas (uma linha por deputado, despesas como na API) e
+mede a vazão da transformação com 1, 2, 4... processos, além do caminho anterior (o arquivo
+inteiro decodificado num processo só e cada despesa montada como objeto `Despesa`).
+
+Uso (a partir da raiz do projeto):
+
+    python -m benchmarks.transformacao --escala 100 --processos 1 2 4 8
+
+A escala 100 gera cerca de 18 milhões de despesas (alguns GB em disco, em --diretorio).
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+from functools import partial
+from typing import Dict, List
+
+from benchmarks.dados_sinteticos import anos_da_escala, gerar_deputados, gerar_despesas, gerar_partidos
+from tratamentoDados.transformacao import escrever_jsonl, transformar_arquivo
+from utils.legislaturas import legislatura_do_ano
+
+def gerar_arquivos(diretorio: str, escala: float, seed: int) -> Dict[int, str]:
+    """Grava um arquivo JSON Lines por ano e retorna o caminho de cada um."""
+    anos = anos_da_escala(escala)
+    partidos = gerar_partidos(seed)
+    _, _, por_legislatura = gerar_deputados(seed, partidos, sorted({legislatura_do_ano(ano) for ano, _ in anos}))
+    por_ano: Dict[int, Dict[int, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+    for _, id_deputado, ano, mes, tipo, valor, tipo_documento, url, fornecedor in gerar_despesas(seed, anos, por_legislatura):
+        por_ano[ano][id_deputado].append({
+            "ano": ano, "mes": mes, "tipoDespesa": tipo, "tipoDocumento": tipo_documento,
+            "dataDocumento": f"{ano}-{mes:02d}-01T00:00:00", "valorDocumento": valor, "urlDocumento": url,
+            "nomeFornecedor": fornecedor, "valorLiquido": valor, "valorGlosa": 0.0,
+        })
+
+    arquivos = {}
+    for ano, deputados in por_ano.items():
+        arquivos[ano] = os.path.join(diretorio, f"despesas_deputados_{ano}.jsonl")
+        escrever_jsonl(arquivos[ano], (
+            {"id_deputado": id_deputado, "nome_deputado": f"Deputado {id_deputado}", "despesas": despesas}
+            for id_deputado, despesas in sorted(deputados.items())
+        ))
+    return arquivos
+
+def _anterior(caminho: str, ano: int) -> int:
+    import json
+    from importlib import import_module
+
+    # Só pelo efeito: database importa todos os modelos (o mapeamento de Despesa depende de Deputado)
+    import_module("database")
+    from models.despesa import Despesa
+
+    with open(caminho, encoding="utf-8") as f:
+        registros = [json.loads(linha) for linha in f]
+    total = 0
+    for item in registros:
+        despesas = [
+            Despesa(
+                id_deputado=item["id_deputado"], ano=ano, mes=d.get("mes"), tipo_despesa=d.get("tipoDespesa"),
+                valor_liquido=d.get("valorLiquido"), tipo_documento=d.get("tipoDocumento"),
+                url_documento=d.get("urlDocumento"), nome_fornecedor=d.get("nomeFornecedor"),
+            )
+            for d in item["despesas"]
+        ]
+        total += len(despesas)
+    return total
+
+def _transformacao(caminho: str, ano: int, processos: int) -> int:
+    from tratamentoDados.mapeamentos import mapear_despesas_deputado
+
+    return sum(len(linhas) for _, _, linhas in transformar_arquivo(caminho, partial(mapear_despesas_deputado, ano), processos))
+
+def medir(funcao, arquivos: Dict[int, str]) -> Dict:
+    inicio = time.perf_counter()
+    registros = sum(funcao(caminho, ano) for ano, caminho in arquivos.items())
+    duracao = time.perf_counter() - inicio
+    return {"registros": registros, "duracao_s": round(duracao, 2), "registros_por_s": round(registros / duracao)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da transformação das despesas em processos.")
+    parser.add_argument("--escala", type=float, default=1, help="Múltiplo do volume real de um ano (ex: 1, 10, 100).")
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--diretorio", default=None, help="Onde gravar os arquivos gerados (padrão: temporário).")
+    parser.add_argument("--sem-anterior", action="store_true", help="Não mede o caminho anterior (lento em escala).")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.diretorio) as diretorio:
+        inicio = time.perf_counter()
+        arquivos = gerar_arquivos(diretorio, args.escala, args.seed)
+        tamanho = sum(os.path.getsize(caminho) for caminho in arquivos.values())
+        print(f"Escala {args.escala}x: {len(arquivos)} arquivo(s), {tamanho / 2**20:.0f} MiB, "
+              f"gerados em {time.perf_counter() - inicio:.1f}s ({os.cpu_count()} núcleos)")
+
+        print(f"{'caminho':<22}{'registros':>12}{'duração (s)':>13}{'registros/s':>14}{'ganho':>8}")
+        resultados = {}
+        if not args.sem_anterior:
+            resultados["anterior"] = medir(_anterior, arquivos)
+        for processos in sorted(set(args.processos)):
+            resultados[f"{processos} processo(s)"] = medir(partial(_transformacao, processos=processos), arquivos)
+
+        base = resultados.get("1 processo(s)") or next(iter(resultados.values()))
+        for caminho, r in resultados.items():
+            ganho = r["registros_por_s"] / base["registros_por_s"]
+            print(f"{caminho:<22}{r['registros']:>12}{r['duracao_s']:>13}{r['registros_por_s']:>14}{ganho:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
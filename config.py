@@ -0,0 +1,68 @@
+import os
+
+# Instrumentação de SQL por requisição
+SQL_LENTA_MS = float(os.getenv("SQL_LENTA_MS", "200"))
+SQL_EXPLAIN_LENTAS = os.getenv("SQL_EXPLAIN_LENTAS", "1") == "1"
+SQL_N_MAIS_1_REPETICOES = int(os.getenv("SQL_N_MAIS_1_REPETICOES", "5"))
+
+# Logging
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
+# Fração das mensagens DEBUG mantidas (1.0 = todas)
+LOG_AMOSTRAGEM_DEBUG = float(os.getenv("LOG_AMOSTRAGEM_DEBUG", "0.01"))
+# Intervalo mínimo, em segundos, entre duas mensagens de progresso dos loaders
+LOG_INTERVALO_PROGRESSO = float(os.getenv("LOG_INTERVALO_PROGRESSO", "5"))
+
+# Snapshot do dashboard
+# Por quanto tempo, em segundos, a API confia no snapshot em memória antes de consultar o banco
+DASHBOARD_SNAPSHOT_TTL = float(os.getenv("DASHBOARD_SNAPSHOT_TTL", "30"))
+DASHBOARD_SNAPSHOTS_MANTIDOS = int(os.getenv("DASHBOARD_SNAPSHOTS_MANTIDOS", "10"))
+
+# Cache HTTP (ETag/Cache-Control derivados da geração de ingestão)
+# Por quanto tempo, em segundos, a geração atual é reaproveitada da memória
+HTTP_CACHE_TTL_GERACAO = float(os.getenv("HTTP_CACHE_TTL_GERACAO", "5"))
+# Entra no ETag: mude ao publicar uma versão da API que altere o formato das respostas
+HTTP_CACHE_VERSAO_APP = os.getenv("HTTP_CACHE_VERSAO_APP", "1")
+# (max-age, stale-while-revalidate) em segundos, por classe de rota
+HTTP_CACHE_ANALITICO = (int(os.getenv("HTTP_CACHE_MAX_AGE_ANALITICO", "3600")), int(os.getenv("HTTP_CACHE_SWR_ANALITICO", "86400")))
+HTTP_CACHE_ENTIDADE = (int(os.getenv("HTTP_CACHE_MAX_AGE_ENTIDADE", "300")), int(os.getenv("HTTP_CACHE_SWR_ENTIDADE", "3600")))
+
+# Compressão de respostas
+COMPRESSAO_MIN_BYTES = int(os.getenv("COMPRESSAO_MIN_BYTES", "1024"))
+COMPRESSAO_NIVEL_GZIP = int(os.getenv("COMPRESSAO_NIVEL_GZIP", "6"))
+# Qualidade do Brotli (0-11); as respostas cacheáveis são comprimidas uma vez por geração
+COMPRESSAO_NIVEL_BROTLI = int(os.getenv("COMPRESSAO_NIVEL_BROTLI", "6"))
+# Limite de memória do cache de representações já comprimidas
+COMPRESSAO_CACHE_MAX_BYTES = int(os.getenv("COMPRESSAO_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Período padrão das rotas analíticas quando nem `ano` nem `legislatura` são informados
+ANO_REFERENCIA = int(os.getenv("ANO_REFERENCIA", "2024"))
+# Anos processados em paralelo pelas cargas (um worker por ano)
+INGEST_WORKERS_POR_ANO = int(os.getenv("INGEST_WORKERS_POR_ANO", "4"))
+# Requisições simultâneas de documentos de detalhe dentro de uma carga
+INGEST_WORKERS_DETALHES = int(os.getenv("INGEST_WORKERS_DETALHES", "8"))
+# Processos da etapa de transformação dos arquivos locais (ver tratamentoDados/transformacao.py)
+INGEST_PROCESSOS_TRANSFORMACAO = int(os.getenv("INGEST_PROCESSOS_TRANSFORMACAO", str(os.cpu_count() or 1)))
+
+# Orquestrador da carga (python -m tratamentoDados run)
+# Etapas independentes executadas ao mesmo tempo, cada uma no seu processo
+INGEST_PROCESSOS = int(os.getenv("INGEST_PROCESSOS", "2"))
+# Tentativas por unidade de trabalho (ano ou legislatura) antes de a etapa ser dada como falha
+INGEST_TENTATIVAS = int(os.getenv("INGEST_TENTATIVAS", "3"))
+
+# Formato pedido à API nos documentos de detalhe ("json" ou "xml"); ver tratamentoDados/detalhes.py
+DETALHES_FORMATO = os.getenv("DETALHES_FORMATO", "json")
+
+# Exportação em Parquet (python -m utils.exportacao; requer o pyarrow)
+EXPORTACAO_DIR = os.getenv("EXPORTACAO_DIR", "data/exportacao")
+# Linhas por lote lido do cursor e gravado como um record batch
+EXPORTACAO_LOTE = int(os.getenv("EXPORTACAO_LOTE", "50000"))
+EXPORTACAO_SNAPSHOTS_MANTIDOS = int(os.getenv("EXPORTACAO_SNAPSHOTS_MANTIDOS", "3"))
+# Exporta (incrementalmente) ao fim de cada carga, depois do snapshot do dashboard
+EXPORTACAO_APOS_INGEST = os.getenv("EXPORTACAO_APOS_INGEST", "0") == "1"
+
+# Backend das rotas de agregação de /analise: "sql" (PostgreSQL) ou
+# "duckdb" (arquivo DuckDB carregado do último snapshot em Parquet; ver utils/analitico.py)
+ANALISE_BACKEND = os.getenv("ANALISE_BACKEND", "sql")
+ANALISE_DUCKDB_DIR = os.getenv("ANALISE_DUCKDB_DIR", "data/analitico")
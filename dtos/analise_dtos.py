@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel
-from typing import Optional
+from typing import Dict, Optional
 
 class DeputadoRankingDespesa(SQLModel):
     id: int
@@ -21,4 +21,8 @@ class PartidoRankingDespesa(SQLModel):
 class ResumoDeputado(SQLModel):
     id: int
     sessoes_votadas: int
+    proposicoes_votadas: int
+    # Sessões votadas / sessões com votos nominais no período; nulo sem sessões
+    taxa_presenca: Optional[float]
+    votos_por_tipo: Dict[str, int]
     total_gasto_2024: float
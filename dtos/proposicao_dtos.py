@@ -26,6 +26,7 @@ class ProposicaoResponse(SQLModel):
         )
     
 class ProposicaoMaisVotadaDTO(SQLModel):
+    posicao: int
     id: int
     id_dados_abertos: str
     sigla_tipo: str
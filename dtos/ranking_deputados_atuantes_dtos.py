@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class DeputadoRankingDTO(BaseModel):
@@ -7,3 +8,4 @@ class DeputadoRankingDTO(BaseModel):
     sigla_uf: str
     total_votacoes: int
     total_proposicoes: int
+    taxa_presenca: Optional[float]
@@ -12,15 +12,6 @@ class VotoIndividualResponse(SQLModel):
     uri_deputado: Optional[str]
     uri_sessao_votacao: Optional[str]
 
-    @classmethod
-    def from_model(cls, voto):
-        return cls(
-            id=voto.id,
-            id_votacao=voto.id_votacao,
-            id_deputado=voto.id_deputado,
-            tipo_voto=voto.tipo_voto,
-            data_hora_registro=voto.data_hora_registro,
-            sigla_partido_deputado=voto.sigla_partido_deputado,
-            uri_deputado=voto.uri_deputado,
-            uri_sessao_votacao=voto.uri_sessao_votacao
-        )
+class TotalTipoVotoDTO(SQLModel):
+    tipo_voto: str
+    total: int
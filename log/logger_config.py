@@ -1,19 +1,166 @@
-import os
+import atexit
+import copy
+import itertools
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+from config import LOG_AMOSTRAGEM_DEBUG, LOG_BACKUPS, LOG_INTERVALO_PROGRESSO, LOG_MAX_BYTES, LOG_NIVEL
+
+# ID da requisição em andamento, preenchido pelo RequestIdMiddleware
+request_id_atual: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro; campos passados em `extra={"dados": {...}}` vão para o topo."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        registro = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            registro["request_id"] = request_id
+        dados = getattr(record, "dados", None)
+        if dados:
+            registro.update(dados)
+        if record.exc_text:
+            registro["excecao"] = record.exc_text
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+class _ContextoFilter(logging.Filter):
+    # Roda na thread de quem loga, antes de o registro entrar na fila
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_atual.get()
+        return True
+
+class _AmostragemFilter(logging.Filter):
+    """Mantém só uma a cada N mensagens DEBUG, para não inundar o log em cargas grandes."""
+
+    def __init__(self, taxa: float):
+        super().__init__()
+        self.passo = max(1, round(1 / taxa)) if taxa > 0 else 0
+        self._contador = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.passo:
+            return False
+        return next(self._contador) % self.passo == 0
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve a mensagem e a exceção aqui, mas mantém o registro estruturado para o FormatadorJSON
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+class _Roteador(logging.Handler):
+    """Handler único do QueueListener: entrega cada registro aos handlers do logger de origem."""
+
+    def __init__(self):
+        super().__init__()
+        self.destinos: Dict[str, List[logging.Handler]] = {}
 
-def get_logger(name: str, file_path: str) -> logging.Logger:
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    def emit(self, record: logging.LogRecord):
+        for handler in self.destinos.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
 
+_fila: "queue.SimpleQueue" = queue.SimpleQueue()
+_roteador = _Roteador()
+_arquivos: Dict[str, logging.Handler] = {}
+_console: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+def _iniciar_listener():
+    global _listener, _console
+    if _listener is None:
+        _console = logging.StreamHandler()
+        _console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y/%m/%d %H:%M:%S'))
+        _listener = QueueListener(_fila, _roteador)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+def get_logger(name: str, file_path: str, console: bool = False) -> logging.Logger:
+    """
+    Logger não bloqueante: o registro só é enfileirado na thread de quem loga e a escrita
+    (JSON, com rotação de arquivo) acontece na thread do QueueListener.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    if logger.handlers:
+        return logger
 
-    if not logger.handlers:
-        file_handler = logging.FileHandler(file_path, mode="a", encoding="utf-8")
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y/%m/%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    with _lock:
+        if logger.handlers:
+            return logger
+        _iniciar_listener()
+
+        arquivo = _arquivos.get(file_path)
+        if arquivo is None:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            arquivo = RotatingFileHandler(
+                file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True
+            )
+            arquivo.setFormatter(FormatadorJSON())
+            _arquivos[file_path] = arquivo
+
+        _roteador.destinos[name] = [arquivo] + ([_console] if console else [])
+
+        handler = _QueueHandler(_fila)
+        handler.addFilter(_ContextoFilter())
+        handler.addFilter(_AmostragemFilter(LOG_AMOSTRAGEM_DEBUG))
+        logger.addHandler(handler)
+        logger.setLevel(LOG_NIVEL)
+        logger.propagate = False
 
-    return logger
\ No newline at end of file
+    return logger
+
+class ProgressoLog:
+    """
+    Progresso de um loop longo (ex: registros de um loader), logado em nível INFO no
+    máximo uma vez a cada `intervalo` segundos, em vez de um print por registro.
+    """
+
+    def __init__(self, logger: logging.Logger, descricao: str, total: Optional[int] = None, intervalo: float = LOG_INTERVALO_PROGRESSO):
+        self.logger = logger
+        self.descricao = descricao
+        self.total = total
+        self.intervalo = intervalo
+        self.feitos = 0
+        self._inicio = time.perf_counter()
+        self._ultimo = self._inicio
+
+    def avancar(self, n: int = 1):
+        self.feitos += n
+        agora = time.perf_counter()
+        if agora - self._ultimo >= self.intervalo:
+            self._ultimo = agora
+            self._logar(agora)
+
+    def concluir(self):
+        self._logar(time.perf_counter(), concluido=True)
+
+    def _logar(self, agora: float, concluido: bool = False):
+        decorrido = agora - self._inicio
+        taxa = self.feitos / decorrido if decorrido else 0.0
+        progresso = f"{self.feitos}/{self.total}" if self.total else str(self.feitos)
+        self.logger.info(
+            f"{self.descricao}: {progresso} ({taxa:.1f}/s){' - concluído' if concluido else ''}",
+            extra={"dados": {"progresso": self.feitos, "total": self.total, "taxa_por_s": round(taxa, 1)}},
+        )
@@ -1,5 +1,11 @@
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from database import engine
+from middlewares.cache_http import CacheHTTPMiddleware
+from middlewares.compressao import CompressaoMiddleware
+from middlewares.instrumentacao_sql import InstrumentacaoSQLMiddleware, registrar_eventos_sql
+from middlewares.metricas import MetricasMiddleware
+from middlewares.request_id import RequestIdMiddleware
 from routers.deputado_router import deputado_router
 from routers.analise_router import analise_router
 from routers.despesa_router import despesa_router
@@ -8,16 +14,28 @@ from routers.voto_individual_router import voto_router
 from routers.gabinete_router import gabinete_router
 from routers.partido_router import partido_router
 from routers.proposicao_router import proposicao_router
+from routers.metricas_router import metricas_router
+from routers.dashboard_router import dashboard_router
+from routers.exportacao_router import exportacao_router
+from utils.respostas import RespostaJSON
 
-app = FastAPI()
+app = FastAPI(default_response_class=RespostaJSON)
 
+# Fica por dentro do CORS para que as respostas 304 também levem os cabeçalhos de CORS
+app.add_middleware(CacheHTTPMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Request-ID", "ETag", "Last-Modified"],
 )
+app.add_middleware(CompressaoMiddleware)
+app.add_middleware(InstrumentacaoSQLMiddleware)
+app.add_middleware(MetricasMiddleware)
+app.add_middleware(RequestIdMiddleware)
+registrar_eventos_sql(engine)
 
 # Incluindo as rotas
 app.include_router(deputado_router)
@@ -30,5 +48,9 @@ app.include_router(voto_router)
 app.include_router(proposicao_router)
 
 app.include_router(analise_router)
+app.include_router(dashboard_router)
+app.include_router(exportacao_router)
+
+app.include_router(metricas_router)
 
 
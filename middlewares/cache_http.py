@@ -0,0 +1,97 @@
+import re
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.concurrency import run_in_threadpool
+
+from config import HTTP_CACHE_ANALITICO, HTTP_CACHE_ENTIDADE, HTTP_CACHE_VERSAO_APP
+from log.logger_config import get_logger
+from utils.geracao import geracao_atual
+from utils.metricas import registrar_cache
+
+logger = get_logger("cache_http_logger", "log/cache_http.log")
+
+# Rotas com cache próprio (ou que não devem ser cacheadas)
+ROTAS_IGNORADAS = ("/dashboard", "/exportacao", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+# Agregações pesadas: podem ficar mais tempo em cache que as consultas por entidade
+ROTAS_ANALITICAS = re.compile(r"/analise/|/ranking/|/mais_votadas/|/coesao_voto/|/perfil_completo_por_andar|/resumo$")
+
+class CacheHTTPMiddleware:
+    """
+    Middleware ASGI de requisições condicionais para as rotas de leitura. Os dados só mudam
+    a cada carga, então a versão do conjunto de dados é a geração de ingestão (`GeracaoIngest`):
+    toda resposta 200 recebe um ETag forte e `Last-Modified` derivados dela, e um
+    `Cache-Control` com `max-age`/`stale-while-revalidate` conforme a classe da rota.
+    `If-None-Match`/`If-Modified-Since` válidos recebem 304 sem que a rota seja executada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or scope["path"].startswith(ROTAS_IGNORADAS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            geracao, concluida_em = await run_in_threadpool(geracao_atual)
+        except Exception as e:
+            logger.warning(f"Não foi possível obter a geração de ingestão: {repr(e)}")
+            geracao = None
+
+        if geracao is None:
+            await self.app(scope, receive, send)
+            return
+
+        if concluida_em.tzinfo is None:
+            concluida_em = concluida_em.replace(tzinfo=timezone.utc)
+        etag = f'"g{geracao}-{HTTP_CACHE_VERSAO_APP}"'
+        max_age, swr = HTTP_CACHE_ANALITICO if ROTAS_ANALITICAS.search(scope["path"]) else HTTP_CACHE_ENTIDADE
+        cabecalhos = [
+            (b"etag", etag.encode("latin-1")),
+            (b"last-modified", format_datetime(concluida_em.astimezone(timezone.utc), usegmt=True).encode("latin-1")),
+            (b"cache-control", f"public, max-age={max_age}, stale-while-revalidate={swr}".encode("latin-1")),
+        ]
+
+        requisicao = dict(scope["headers"])
+        if _nao_modificado(requisicao, etag, concluida_em):
+            registrar_cache("http", True)
+            await send({"type": "http.response.start", "status": 304, "headers": cabecalhos})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        registrar_cache("http", False)
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start" and mensagem["status"] == 200:
+                existentes = {nome.lower() for nome, _ in mensagem.get("headers", [])}
+                mensagem["headers"] = list(mensagem.get("headers", [])) + [
+                    (nome, valor) for nome, valor in cabecalhos if nome not in existentes
+                ]
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
+
+def _nao_modificado(requisicao: dict, etag: str, concluida_em) -> bool:
+    if_none_match = requisicao.get(b"if-none-match")
+    if if_none_match is not None:
+        # If-None-Match tem precedência sobre If-Modified-Since (RFC 9110, 13.2.2)
+        candidatos = [c.strip() for c in if_none_match.decode("latin-1").split(",")]
+        return "*" in candidatos or etag in candidatos or f"W/{etag}" in candidatos
+
+    if_modified_since = requisicao.get(b"if-modified-since")
+    if if_modified_since is not None:
+        try:
+            data = parsedate_to_datetime(if_modified_since.decode("latin-1"))
+        except (TypeError, ValueError):
+            return False
+        if data.tzinfo is None:
+            data = data.replace(tzinfo=timezone.utc)
+        # Last-Modified tem precisão de segundos
+        return concluida_em.replace(microsecond=0) <= data
+    return False
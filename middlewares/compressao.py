@@ -0,0 +1,191 @@
+import gzip
+import re
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+from config import COMPRESSAO_CACHE_MAX_BYTES, COMPRESSAO_MIN_BYTES, COMPRESSAO_NIVEL_BROTLI, COMPRESSAO_NIVEL_GZIP
+from utils.metricas import registrar_cache
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional; sem ele só gzip é oferecido
+    brotli = None
+
+TIPOS_COMPRESSIVEIS = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+class _CacheComprimidos:
+    """LRU das representações comprimidas, limitado pelo total de bytes armazenados."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.tamanho = 0
+        self._itens: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    def obter(self, chave: Tuple) -> Optional[bytes]:
+        valor = self._itens.get(chave)
+        if valor is not None:
+            self._itens.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave: Tuple, valor: bytes):
+        if len(valor) > self.max_bytes:
+            return
+        anterior = self._itens.pop(chave, None)
+        if anterior is not None:
+            self.tamanho -= len(anterior)
+        self._itens[chave] = valor
+        self.tamanho += len(valor)
+        while self.tamanho > self.max_bytes:
+            _, removido = self._itens.popitem(last=False)
+            self.tamanho -= len(removido)
+
+_cache = _CacheComprimidos(COMPRESSAO_CACHE_MAX_BYTES)
+
+def negociar(accept_encoding: str) -> Optional[str]:
+    """Escolhe `br` ou `gzip` conforme o Accept-Encoding (respeitando `q=0`), preferindo Brotli."""
+    aceitas = {}
+    for parte in accept_encoding.lower().split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        correspondencia = re.search(r"q=([0-9.]+)", parametros)
+        if correspondencia:
+            try:
+                q = float(correspondencia.group(1))
+            except ValueError:
+                q = 0.0
+        aceitas[nome.strip()] = q
+
+    for codificacao in (("br",) if brotli else ()) + ("gzip",):
+        if aceitas.get(codificacao, aceitas.get("*", 0.0)) > 0:
+            return codificacao
+    return None
+
+def comprimir(corpo: bytes, codificacao: str) -> bytes:
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=COMPRESSAO_NIVEL_BROTLI)
+    return gzip.compress(corpo, compresslevel=COMPRESSAO_NIVEL_GZIP, mtime=0)
+
+class _CompressorIncremental:
+    """Compressão de respostas em streaming: cada pedaço é comprimido e enviado com flush."""
+
+    def __init__(self, codificacao: str):
+        self.codificacao = codificacao
+        if codificacao == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSAO_NIVEL_BROTLI)
+        else:
+            self._compressor = zlib.compressobj(COMPRESSAO_NIVEL_GZIP, zlib.DEFLATED, 31)
+
+    def comprimir(self, pedaco: bytes, final: bool) -> bytes:
+        if self.codificacao == "br":
+            saida = self._compressor.process(pedaco)
+            return saida + (self._compressor.finish() if final else self._compressor.flush())
+        saida = self._compressor.compress(pedaco)
+        return saida + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+def _sufixar_etag(etag: str, codificacao: str) -> str:
+    # Cada codificação é uma representação diferente, então precisa de um ETag forte próprio
+    return etag[:-1] + f'-{codificacao}"' if etag.endswith('"') else etag
+
+class CompressaoMiddleware:
+    """
+    Middleware ASGI que comprime as respostas com Brotli ou gzip, conforme o Accept-Encoding,
+    a partir de COMPRESSAO_MIN_BYTES. Respostas com ETag (ver `CacheHTTPMiddleware`) têm a
+    representação comprimida guardada num LRU por (ETag, URL, codificação), então a compressão
+    é paga uma vez por geração dos dados; respostas em streaming são comprimidas pedaço a pedaço.
+    O ETag recebe o sufixo da codificação e o `If-None-Match` correspondente é desfeito antes
+    de chegar às camadas internas, para que a revalidação continue resultando em 304.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        cabecalhos_requisicao = dict(scope["headers"])
+        codificacao = negociar(cabecalhos_requisicao.get(b"accept-encoding", b"").decode("latin-1"))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        revalidacao_comprimida = False
+        if_none_match = cabecalhos_requisicao.get(b"if-none-match")
+        if if_none_match:
+            sufixo = f'-{codificacao}"'.encode("latin-1")
+            candidatos = [c.strip() for c in if_none_match.split(b",")]
+            revalidacao_comprimida = any(c.endswith(sufixo) for c in candidatos)
+            original = b",".join(c[: -len(sufixo)] + b'"' if c.endswith(sufixo) else c for c in candidatos)
+            scope = dict(scope)
+            scope["headers"] = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"] + [(b"if-none-match", original)]
+
+        chave_url = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        estado = {"inicio": None, "passar": False, "compressor": None}
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                estado["inicio"] = mensagem
+                return
+            if mensagem["type"] != "http.response.body" or estado["passar"]:
+                await send(mensagem)
+                return
+
+            if estado["compressor"] is not None:
+                final = not mensagem.get("more_body", False)
+                await send({
+                    "type": "http.response.body",
+                    "body": estado["compressor"].comprimir(mensagem.get("body", b""), final),
+                    "more_body": not final,
+                })
+                return
+
+            # Primeiro pedaço do corpo: decide se comprime
+            inicio = estado["inicio"]
+            cabecalhos = MutableHeaders(scope=inicio)
+            tipo = cabecalhos.get("content-type", "")
+            compressivel = tipo.startswith(TIPOS_COMPRESSIVEIS) and "content-encoding" not in cabecalhos
+
+            if compressivel:
+                cabecalhos.add_vary_header("Accept-Encoding")
+            if inicio["status"] == 304 and revalidacao_comprimida and "etag" in cabecalhos:
+                cabecalhos["etag"] = _sufixar_etag(cabecalhos["etag"], codificacao)
+            corpo = mensagem.get("body", b"")
+            mais = mensagem.get("more_body", False)
+
+            if not compressivel or inicio["status"] < 200 or inicio["status"] in (204, 304) or (not mais and len(corpo) < COMPRESSAO_MIN_BYTES):
+                estado["passar"] = True
+                await send(inicio)
+                await send(mensagem)
+                return
+
+            etag = cabecalhos.get("etag")
+            cabecalhos["content-encoding"] = codificacao
+            if etag:
+                cabecalhos["etag"] = _sufixar_etag(etag, codificacao)
+
+            if mais:
+                del cabecalhos["content-length"]
+                estado["compressor"] = _CompressorIncremental(codificacao)
+                await send(inicio)
+                await send({"type": "http.response.body", "body": estado["compressor"].comprimir(corpo, False), "more_body": True})
+                return
+
+            chave = (etag, chave_url, codificacao) if etag and inicio["status"] == 200 else None
+            comprimido = _cache.obter(chave) if chave else None
+            if chave:
+                registrar_cache("compressao", comprimido is not None)
+            if comprimido is None:
+                comprimido = comprimir(corpo, codificacao)
+                if chave:
+                    _cache.guardar(chave, comprimido)
+
+            cabecalhos["content-length"] = str(len(comprimido))
+            estado["passar"] = True
+            await send(inicio)
+            await send({"type": "http.response.body", "body": comprimido})
+
+        await self.app(scope, receive, enviar)
@@ -0,0 +1,135 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from config import SQL_EXPLAIN_LENTAS, SQL_LENTA_MS, SQL_N_MAIS_1_REPETICOES
+from log.logger_config import get_logger
+
+logger = get_logger("sql_logger", "log/sql.log")
+
+class EstatisticasSQL:
+    """Consultas executadas durante uma requisição."""
+
+    def __init__(self):
+        self.total_consultas = 0
+        self.tempo_db = 0.0
+        self.mais_lenta: Optional[str] = None
+        self.tempo_mais_lenta = 0.0
+        self.repeticoes: Counter = Counter()
+
+    def registrar(self, statement: str, duracao: float):
+        self.total_consultas += 1
+        self.tempo_db += duracao
+        self.repeticoes[statement] += 1
+        if duracao > self.tempo_mais_lenta:
+            self.tempo_mais_lenta = duracao
+            self.mais_lenta = statement
+
+    def suspeitas_n_mais_1(self) -> List[Dict]:
+        # O mesmo SQL (com parâmetros diferentes) repetido várias vezes na mesma requisição
+        return [
+            {"sql": sql, "repeticoes": n}
+            for sql, n in self.repeticoes.most_common()
+            if n >= SQL_N_MAIS_1_REPETICOES
+        ]
+
+_estatisticas: ContextVar[Optional[EstatisticasSQL]] = ContextVar("estatisticas_sql", default=None)
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    # Usa um cursor DBAPI direto para não disparar os próprios eventos de novo
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("EXPLAIN " + statement, parameters)
+        return "\n".join(str(linha[0]) for linha in cursor.fetchall())
+    except Exception as e:
+        return f"EXPLAIN indisponível: {e!r}"
+    finally:
+        cursor.close()
+
+def registrar_eventos_sql(engine):
+    """Liga os hooks de cursor do SQLAlchemy que alimentam as estatísticas e o log de SQL lento."""
+
+    # O início fica no contexto da execução, e não na conexão: uma consulta que levanta erro
+    # não chega ao after_cursor_execute e não pode deixar resto para as seguintes
+    @event.listens_for(engine, "before_cursor_execute")
+    def antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._inicio_consulta = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+        inicio = getattr(context, "_inicio_consulta", None)
+        if inicio is None:
+            return
+        duracao = time.perf_counter() - inicio
+
+        estatisticas = _estatisticas.get()
+        if estatisticas is not None:
+            estatisticas.registrar(statement, duracao)
+
+        if duracao * 1000 >= SQL_LENTA_MS:
+            registro = {
+                "duracao_ms": round(duracao * 1000, 2),
+                "sql": statement,
+                "parametros": repr(parameters)[:500],
+            }
+            if SQL_EXPLAIN_LENTAS and not executemany and statement.lstrip().upper().startswith("SELECT"):
+                registro["plano"] = _explain(conn, statement, parameters)
+            logger.warning("sql_lento", extra={"dados": registro})
+
+class InstrumentacaoSQLMiddleware:
+    """
+    Middleware ASGI que coleta, por requisição, a quantidade de consultas, o tempo total
+    no banco, a consulta mais lenta e padrões de N+1. Expõe o resultado no cabeçalho
+    `Server-Timing` e no log estruturado `log/sql.log`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estatisticas = EstatisticasSQL()
+        token = _estatisticas.set(estatisticas)
+        inicio = time.perf_counter()
+        status = {"codigo": 500}
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status["codigo"] = mensagem["status"]
+                duracao_app = (time.perf_counter() - inicio) * 1000
+                server_timing = (
+                    f'db;dur={estatisticas.tempo_db * 1000:.2f};desc="{estatisticas.total_consultas} consultas", '
+                    f"app;dur={duracao_app:.2f}"
+                )
+                mensagem["headers"] = list(mensagem.get("headers", [])) + [(b"server-timing", server_timing.encode())]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _estatisticas.reset(token)
+            rota = getattr(scope.get("route"), "path", scope["path"])
+            registro = {
+                "metodo": scope["method"],
+                "rota": rota,
+                "status": status["codigo"],
+                "duracao_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "consultas": estatisticas.total_consultas,
+                "tempo_db_ms": round(estatisticas.tempo_db * 1000, 2),
+                "mais_lenta": {
+                    "sql": estatisticas.mais_lenta,
+                    "duracao_ms": round(estatisticas.tempo_mais_lenta * 1000, 2),
+                } if estatisticas.mais_lenta else None,
+                "n_mais_1": estatisticas.suspeitas_n_mais_1(),
+            }
+            if registro["n_mais_1"]:
+                logger.warning("requisicao_sql", extra={"dados": registro})
+            else:
+                logger.info("requisicao_sql", extra={"dados": registro})
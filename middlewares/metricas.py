@@ -0,0 +1,36 @@
+import time
+
+from utils.metricas import HTTP_DURACAO, HTTP_EM_ANDAMENTO, HTTP_REQUISICOES
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI que alimenta as métricas HTTP (contagem e latência por template de
+    rota e status, requisições em andamento) expostas em `/metrics`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"codigo": 500}
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status["codigo"] = mensagem["status"]
+            await send(mensagem)
+
+        HTTP_EM_ANDAMENTO.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            HTTP_EM_ANDAMENTO.dec()
+            # Usa o template da rota (ex: /deputado/get_by_id/{deputado_id}) para não explodir a cardinalidade
+            rota = getattr(scope.get("route"), "path", "nao_encontrada")
+            rotulos = {"metodo": scope["method"], "rota": rota, "status": status["codigo"]}
+            HTTP_REQUISICOES.inc(**rotulos)
+            HTTP_DURACAO.observar(time.perf_counter() - inicio, **rotulos)
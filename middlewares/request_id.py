@@ -0,0 +1,32 @@
+import uuid
+
+from log.logger_config import request_id_atual
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que associa um ID a cada requisição (reaproveitando o `X-Request-ID`
+    recebido, se houver). O ID vai para todos os logs da requisição e volta no cabeçalho
+    da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recebido = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")[:64]
+        request_id = recebido or uuid.uuid4().hex
+        token = request_id_atual.set(request_id)
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                mensagem["headers"] = list(mensagem.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            request_id_atual.reset(token)
@@ -0,0 +1,22 @@
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+class AtividadeDeputado(SQLModel, table=True):
+    # Atividade de cada deputado nas votações de cada ano, recalculada ano a ano pela carga
+    # dos votos (ver utils/atividade.py)
+    __table_args__ = (
+        # Resumo de um deputado num período
+        Index("ix_atividadedeputado_id_deputado_ano", "id_deputado", "ano"),
+    )
+
+    # O ano vem primeiro: o recálculo troca as linhas de um ano inteiro
+    ano: int = Field(primary_key=True)
+    id_deputado: int = Field(foreign_key="deputado.id", primary_key=True)
+    sessoes_votadas: int = Field(description="Sessões de votação do ano com voto do deputado.")
+    sessoes_do_ano: int = Field(description="Sessões do ano com votos nominais, base da taxa de presença.")
+    proposicoes_votadas: int = Field(description="Proposições distintas das sessões votadas no ano.")
+    votos_sim: int = Field()
+    votos_nao: int = Field()
+    votos_abstencao: int = Field()
+    votos_obstrucao: int = Field()
+    votos_outros: int = Field(description="Votos de outros tipos (Artigo 17 etc.).")
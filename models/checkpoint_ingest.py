@@ -0,0 +1,20 @@
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Text, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+class CheckpointIngest(SQLModel, table=True):
+    # Um registro por etapa do orquestrador e unidade de trabalho (um ano ou uma legislatura)
+    __table_args__ = (UniqueConstraint("etapa", "unidade"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    etapa: str = Field(max_length=50, description="Nome da etapa (ex: despesa).")
+    unidade: str = Field(max_length=20, description="Ano (ex: 2024) ou legislatura (ex: L57) processado.")
+    status: str = Field(max_length=20, description="'concluida', 'falhou' ou 'em_andamento'.")
+    registros: Optional[int] = Field(default=None, description="Registros gravados pela unidade.")
+    # Último item concluído dentro da unidade (índice no arquivo ou id), para retomar dali
+    posicao: Optional[int] = Field(default=None)
+    tentativas: int = Field(default=1)
+    duracao_s: float = Field(default=0.0, description="Duração da unidade somando as tentativas, em segundos.")
+    erro: Optional[str] = Field(default=None, sa_column=Column(Text), description="Última exceção, se falhou.")
+    atualizado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_column=Column(DateTime(timezone=True), nullable=False))
@@ -0,0 +1,23 @@
+from typing import Optional
+from sqlalchemy import Column, ForeignKey, Index, SmallInteger
+from sqlmodel import Field, SQLModel
+
+class CoesaoPartido(SQLModel, table=True):
+    # Coesão de cada partido em cada sessão de votação, recalculada ano a ano pela carga
+    # dos votos (ver utils/coesao.py)
+    __table_args__ = (
+        # Série de um partido e ranking dos partidos num período
+        Index("ix_coesaopartido_id_partido_ano", "id_partido", "ano"),
+    )
+
+    # O ano vem primeiro: o recálculo troca as linhas de um ano inteiro
+    ano: int = Field(primary_key=True)
+    id_votacao: int = Field(foreign_key="sessaovotacao.id", primary_key=True)
+    id_partido: int = Field(foreign_key="partido.id", primary_key=True, description="Partido dos deputados na data do voto.")
+    total_votos: int = Field(description="Votos de deputados do partido na sessão, de qualquer tipo.")
+    votos_sim: int = Field()
+    votos_nao: int = Field()
+    id_tipo_voto_maioria: int = Field(sa_column=Column(SmallInteger, ForeignKey("tipovoto.id"), nullable=False), description="Tipo de voto mais frequente no partido.")
+    votos_maioria: int = Field()
+    indice_rice: Optional[float] = Field(default=None, description="|Sim - Não| / (Sim + Não); nulo sem votos Sim ou Não.")
+    concordancia_maioria: float = Field(description="Fração dos votos do partido iguais ao voto da maioria dele.")
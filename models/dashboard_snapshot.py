@@ -0,0 +1,11 @@
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Text
+from sqlmodel import Field, SQLModel
+
+class DashboardSnapshot(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True, description="Versão do snapshot (crescente).")
+    etag: str = Field(max_length=64, index=True, description="Hash do conteúdo, usado como ETag.")
+    conteudo: str = Field(sa_column=Column(Text, nullable=False), description="Payload JSON já serializado de todos os painéis.")
+    origem: Optional[str] = Field(default=None, max_length=50, description="Loader cuja carga gerou o snapshot.")
+    gerado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_column=Column(DateTime(timezone=True), nullable=False))
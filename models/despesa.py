@@ -1,11 +1,16 @@
 
 from typing import Optional
+from sqlalchemy import Column, Integer, Sequence
 from sqlmodel import Field, SQLModel, Relationship
 
 class Despesa(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    # Particionada por ano no Postgres (uma partição por ano, ver utils/particoes.py);
+    # por isso o ano faz parte da chave primária
+    __table_args__ = {"postgresql_partition_by": "RANGE (ano)"}
+
+    id: Optional[int] = Field(default=None, sa_column=Column(Integer, Sequence("despesa_id_seq"), primary_key=True))
     id_deputado: int = Field(foreign_key="deputado.id", index=True, description="ID do deputado a quem a despesa pertence.")
-    ano: int = Field(description="Ano da despesa.")
+    ano: int = Field(primary_key=True, description="Ano da despesa.")
     mes: int = Field(description="Mês da despesa.")
     tipo_despesa: str = Field(max_length=300, description="Tipo da despesa (ex: 'Passagens Aéreas', 'Combustíveis').")
     valor_liquido: float = Field(description="Valor líquido da despesa.")
@@ -0,0 +1,9 @@
+from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+class GeracaoIngest(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True, description="Número da geração; a maior é a versão atual dos dados.")
+    origem: str = Field(max_length=50, description="Loader cuja carga concluída gerou a nova geração.")
+    concluida_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_column=Column(DateTime(timezone=True), nullable=False))
@@ -0,0 +1,15 @@
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+class MandatoDeputado(SQLModel, table=True):
+    # Um registro por deputado e legislatura em que exerceu mandato
+    __table_args__ = (UniqueConstraint("id_deputado", "id_legislatura"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    id_deputado: int = Field(foreign_key="deputado.id", index=True)
+    id_legislatura: int = Field(index=True, description="Número da legislatura (ex: 57).")
+    # Partido e UF do deputado naquela legislatura
+    sigla_partido: Optional[str] = Field(default=None, max_length=50)
+    sigla_uf: Optional[str] = Field(default=None, max_length=2)
+    id_partido: Optional[int] = Field(default=None, foreign_key="partido.id")
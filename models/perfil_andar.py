@@ -0,0 +1,20 @@
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+class PerfilAndar(SQLModel, table=True):
+    # Cubo pré-calculado das análises de gabinete: um registro por ano, andar, prédio e
+    # partido, recalculado ao fim de cada carga (ver utils/perfil_andar.py)
+    __table_args__ = (UniqueConstraint("ano", "andar_chave", "predio_chave", "id_partido"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    ano: int = Field(description="Ano das despesas.")
+    andar_chave: str = Field(description="Andar normalizado (minúsculo, sem acentos nem espaços extras).")
+    predio_chave: str = Field(description="Prédio normalizado, como o andar.")
+    andar: Optional[str] = Field(default=None, description="Andar como veio da API.")
+    predio: Optional[str] = Field(default=None, description="Prédio como veio da API.")
+    id_partido: Optional[int] = Field(default=None, foreign_key="partido.id", description="Partido atual dos deputados (nulo para os sem partido).")
+    deputados_no_andar: int = Field(description="Deputados do partido com gabinete no andar.")
+    deputados_com_despesa: int = Field(description="Deputados do partido no andar com despesas no ano.")
+    quantidade_despesas: int = Field(default=0)
+    total_gasto: float = Field(default=0.0)
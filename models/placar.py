@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Text
+from sqlmodel import Field, SQLModel
+
+class Placar(SQLModel, table=True):
+    # Placar pré-calculado de cada proposição, mantido pela carga dos votos (ver utils/placar.py)
+    id_proposicao: int = Field(foreign_key="proposicao.id", primary_key=True)
+    sessoes: int = Field(description="Sessões de votação ligadas à proposição.")
+    total_votos: int = Field(description="Votos individuais somando todas as sessões.")
+    conteudo: str = Field(sa_column=Column(Text, nullable=False), description="Payload JSON já serializado do placar.")
+    atualizado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_column=Column(DateTime(timezone=True), nullable=False))
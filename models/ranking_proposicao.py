@@ -0,0 +1,20 @@
+from typing import Optional
+from sqlalchemy import TEXT, Column, Index
+from sqlmodel import Field, SQLModel
+
+class RankingProposicao(SQLModel, table=True):
+    # Proposições com votação ordenadas pelo número de sessões, recalculado ao fim de cada
+    # carga (ver utils/mais_votadas.py). A posição é a chave: o topo do ranking e as páginas
+    # seguintes são leituras de um intervalo do índice, também com os filtros abaixo
+    __table_args__ = (
+        Index("ix_rankingproposicao_ano_posicao", "ano", "posicao"),
+        Index("ix_rankingproposicao_sigla_tipo_posicao", "sigla_tipo", "posicao"),
+    )
+
+    posicao: int = Field(primary_key=True, description="Posição no ranking geral (1 = mais votada).")
+    id_proposicao: int = Field(foreign_key="proposicao.id", unique=True)
+    id_dados_abertos: str = Field()
+    sigla_tipo: str = Field(max_length=10)
+    ano: int = Field()
+    ementa: Optional[str] = Field(default=None, sa_column=Column(TEXT))
+    total_votacoes: int = Field(description="Sessões de votação ligadas à proposição.")
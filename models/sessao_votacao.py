@@ -7,6 +7,7 @@ class SessaoVotacao(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     id_dados_abertos: str = Field(index=True, unique=True, description="ID da votação nos Dados Abertos da Câmara.")
     data_hora_registro: Optional[str] = Field(default=None, description="Data e hora do registro da votação.")
+    ano: Optional[int] = Field(default=None, index=True, description="Ano da votação.")
     descricao: str = Field(description="Descrição da votação.", sa_column=Column(TEXT))
 
     sigla_orgao: Optional[str] = Field(default=None, max_length=500)
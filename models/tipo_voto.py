@@ -0,0 +1,7 @@
+from typing import Optional
+from sqlalchemy import Column, SmallInteger
+from sqlmodel import Field, SQLModel
+
+class TipoVoto(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, sa_column=Column(SmallInteger, primary_key=True, autoincrement=True))
+    nome: str = Field(max_length=50, unique=True, description="Sim, Não, Abstenção, Obstrução, Artigo 17...")
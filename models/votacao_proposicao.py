@@ -1,7 +1,10 @@
 from typing import Optional
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel, Relationship
 
 class VotacaoProposicao(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("id_votacao", "id_proposicao"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     id_proposicao: int = Field(foreign_key="proposicao.id", index=True, description="ID da proposição associada.")
     id_votacao: int = Field(foreign_key="sessaovotacao.id", index=True, description="ID da sessão de votação associada.")
@@ -1,16 +1,28 @@
 from typing import Optional, List
 from datetime import date, datetime
+from sqlalchemy import Column, ForeignKey, Index, Integer, Sequence, SmallInteger, UniqueConstraint
 from sqlmodel import Field, SQLModel, Relationship
 
 class VotoIndividual(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    # Índices das listagens paginadas por cursor (filtro + ORDER BY id)
+    __table_args__ = (
+        Index("ix_votoindividual_id_deputado_id", "id_deputado", "id"),
+        Index("ix_votoindividual_id_votacao_id", "id_votacao", "id"),
+        # Um voto por deputado e sessão; chave natural das cargas (inclui o ano, chave de partição)
+        UniqueConstraint("id_votacao", "id_deputado", "ano"),
+        # Particionada por ano no Postgres (ver utils/particoes.py)
+        {"postgresql_partition_by": "RANGE (ano)"},
+    )
+
+    id: Optional[int] = Field(default=None, sa_column=Column(Integer, Sequence("votoindividual_id_seq"), primary_key=True))
+    # Ano da sessão de votação: chave de partição, faz parte da chave primária
+    ano: int = Field(primary_key=True)
     id_votacao: int = Field(foreign_key="sessaovotacao.id", index=True)
     id_deputado: int = Field(foreign_key="deputado.id", index=True)
-    tipo_voto: str = Field(max_length=50, description="Sim, Não, Abstenção, Obstrução, Ausente")
+    id_tipo_voto: int = Field(sa_column=Column(SmallInteger, ForeignKey("tipovoto.id"), nullable=False), description="Sim, Não, Abstenção, Obstrução, Ausente")
     data_hora_registro: Optional[str] = Field(default=None)
-    sigla_partido_deputado: Optional[str] = Field(default=None, max_length=50)
-    uri_deputado: Optional[str] = Field(default=None, max_length=500)
-    uri_sessao_votacao:  Optional[str] = Field(default=None, max_length=500)
+    # Partido do deputado no momento do voto
+    id_partido: Optional[int] = Field(default=None, foreign_key="partido.id")
 
     votacao: "SessaoVotacao" = Relationship(back_populates="votos")
     deputado: "Deputado" = Relationship(back_populates="votos_individuais")
@@ -1,7 +1,7 @@
 import math
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, String, case, desc, func, select
+from sqlmodel import Session, case, desc, func, select
 from database import get_session
 from dtos.analise_dtos import PartidoRankingDespesa
 from dtos.ranking_deputados_atuantes_dtos import DeputadoRankingDTO
@@ -15,16 +15,19 @@ from models.sessao_votacao import SessaoVotacao
 from models.votacao_proposicao import VotacaoProposicao
 from models.voto_individual import VotoIndividual
 from utils.pagination import PaginatedResponse, PaginationParams
-from utils.querys import get_despesas_deputado_2024_subquery
+from config import ANO_REFERENCIA
+from utils.analitico import executar
+from utils.legislaturas import ANO_DESCRICAO, LEGISLATURA_DESCRICAO, filtro_periodo, periodo_padrao
+from utils.querys import id_tipo_voto
 
 logger = get_logger("analises_logger", "log/analises.log")
 
 analise_router = APIRouter(prefix="/analise", tags=["Analises complementares"])
 
 @analise_router.get("/comparativo_estados")
-async def comparativo_gastos_estados(
+def comparativo_gastos_estados(
     session: Session = Depends(get_session),
-    ano: int = Query(2024, description="Ano de referência para análise", ge=2000),
+    ano: int = Query(ANO_REFERENCIA, description="Ano de referência para análise", ge=1990),
     uf: Optional[str] = Query(
         None,
         description="Filtrar por sigla de UF específica (ex: 'SP')",
@@ -55,7 +58,7 @@ async def comparativo_gastos_estados(
             stmt = stmt.where(Deputado.sigla_uf == uf.upper())
 
         stmt = stmt.group_by(Deputado.sigla_uf).order_by(desc("total_gasto"))
-        results = session.exec(stmt).all()
+        results = executar(session, stmt)
 
         return [
             {
@@ -77,21 +80,25 @@ async def comparativo_gastos_estados(
 
 @analise_router.get("/ranking/alinhamento_resultado")
 def get_ranking_alinhamento_partidario(
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
 ):
     """
     Calcula e ranqueia os partidos pelo seu percentual de alinhamento com o resultado
-    final das votações de 2024 (votar 'Sim' em pautas aprovadas ou 'Não' em reprovadas).
+    final das votações do ano ou da legislatura (votar 'Sim' em pautas aprovadas ou
+    'Não' em reprovadas). O voto conta para o partido do deputado na data da votação.
 
-    Entidades: `Partido`, `Deputado`, `VotoIndividual` e `SessaoVotacao`.
+    Entidades: `Partido`, `VotoIndividual` e `SessaoVotacao`.
 
     """
+    ano, legislatura = periodo_padrao(ano, legislatura)
     voto_alinhado_expression = case(
         (
-            (VotoIndividual.tipo_voto == 'Sim') & (SessaoVotacao.aprovacao == '1'), 1
+            (VotoIndividual.id_tipo_voto == id_tipo_voto('Sim')) & (SessaoVotacao.aprovacao == '1'), 1
         ),
         (
-            (VotoIndividual.tipo_voto == 'Não') & (SessaoVotacao.aprovacao == '0'), 1
+            (VotoIndividual.id_tipo_voto == id_tipo_voto('Não')) & (SessaoVotacao.aprovacao == '0'), 1
         ),
         else_=0
     )
@@ -104,17 +111,16 @@ def get_ranking_alinhamento_partidario(
             func.count(VotoIndividual.id).label("votos_totais_decisivos")
         )
         .select_from(Partido)
-        .join(Deputado, Partido.id == Deputado.id_partido)
-        .join(VotoIndividual, Deputado.id == VotoIndividual.id_deputado)
+        .join(VotoIndividual, Partido.id == VotoIndividual.id_partido)
         .join(SessaoVotacao, VotoIndividual.id_votacao == SessaoVotacao.id)
-        .where(VotoIndividual.tipo_voto.in_(['Sim', 'Não']))
+        .where(VotoIndividual.id_tipo_voto.in_([id_tipo_voto('Sim'), id_tipo_voto('Não')]))
         .where(SessaoVotacao.aprovacao.in_(['1', '0']))
-        .where(func.cast(VotoIndividual.data_hora_registro, String).startswith('2024'))
+        .where(*filtro_periodo(VotoIndividual.ano, ano, legislatura))
     )
 
     stmt = stmt.group_by(Partido.sigla, Partido.nome_completo)
     
-    resultados = session.exec(stmt).all()
+    resultados = executar(session, stmt)
     
     items = []
     for r in resultados:
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from fastapi import APIRouter, Header, Response
+from sqlmodel import Session, select
+
+from config import DASHBOARD_SNAPSHOT_TTL
+from database import engine
+from log.logger_config import get_logger
+from models.dashboard_snapshot import DashboardSnapshot
+from utils.dashboard import publicar_snapshot
+from utils.metricas import registrar_cache
+
+logger = get_logger("dashboard_logger", "log/dashboard.log")
+
+dashboard_router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+class _Snapshot(NamedTuple):
+    versao: Optional[int]
+    etag: Optional[str]
+    conteudo: Optional[bytes]
+    verificado_em: float
+
+# Última versão lida do banco; revalidada no máximo a cada DASHBOARD_SNAPSHOT_TTL segundos.
+# Imutável e trocada numa única atribuição: quem leu a referência tem conteúdo e ETag da
+# mesma versão, mesmo durante uma atualização
+_snapshot = _Snapshot(None, None, None, 0.0)
+_lock = threading.Lock()
+
+def _snapshot_atual() -> _Snapshot:
+    global _snapshot
+    atual = _snapshot
+    if time.monotonic() - atual.verificado_em < DASHBOARD_SNAPSHOT_TTL:
+        registrar_cache("dashboard_snapshot", True)
+        return atual
+
+    with _lock:
+        atual = _snapshot
+        if time.monotonic() - atual.verificado_em < DASHBOARD_SNAPSHOT_TTL:
+            registrar_cache("dashboard_snapshot", True)
+            return atual
+        registrar_cache("dashboard_snapshot", False)
+
+        with Session(engine) as session:
+            ultima = session.exec(
+                select(DashboardSnapshot.id, DashboardSnapshot.etag).order_by(DashboardSnapshot.id.desc()).limit(1)
+            ).first()
+
+            if ultima is None:
+                logger.info("Nenhum snapshot do dashboard encontrado; gerando sob demanda.")
+                snapshot = publicar_snapshot(session, origem="sob_demanda")
+                ultima = (snapshot.id, snapshot.etag)
+
+            # Só relê o conteúdo quando a versão mudou
+            if ultima[0] != atual.versao:
+                conteudo = session.get(DashboardSnapshot, ultima[0]).conteudo.encode("utf-8")
+                atual = _Snapshot(ultima[0], ultima[1], conteudo, time.monotonic())
+            else:
+                atual = atual._replace(verificado_em=time.monotonic())
+
+        _snapshot = atual
+        return atual
+
+def _etag_confere(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = [c.strip().removeprefix("W/").strip('"') for c in if_none_match.split(",")]
+    return "*" in candidatos or etag in candidatos
+
+@dashboard_router.get("/snapshot")
+def get_snapshot_dashboard(if_none_match: Optional[str] = Header(None)):
+    """
+    Retorna, em um único payload, todos os painéis do dashboard (gastos por partido, top 15
+    deputados por gasto, proposições mais votadas, gastos por estado e alinhamento partidário).
+
+    O snapshot é pré-calculado após cada carga (`tratamentoDados/pos_ingest.py`) e servido
+    com `ETag`: clientes que enviam `If-None-Match` com a versão atual recebem `304`.
+    """
+    # Uma única leitura: conteúdo, ETag e versão vêm do mesmo snapshot
+    snapshot = _snapshot_atual()
+    cabecalhos = {
+        "ETag": f'"{snapshot.etag}"',
+        "Cache-Control": "no-cache",
+        "X-Snapshot-Versao": str(snapshot.versao),
+    }
+
+    if _etag_confere(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=cabecalhos)
+
+    return Response(content=snapshot.conteudo, media_type="application/json", headers=cabecalhos)
@@ -1,53 +1,63 @@
 import math
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy import Float, cast
 from sqlmodel import Session, desc, func, select
 from database import get_session
 from dtos.analise_dtos import DeputadoRankingDespesa, ResumoDeputado
 from dtos.deputado_dtos import DeputadoResponseWithGabinete, GabineteResponse
 from dtos.ranking_deputados_atuantes_dtos import DeputadoRankingDTO
 from log.logger_config import get_logger
+from models.atividade_deputado import AtividadeDeputado
 from models.deputado import Deputado
-from models.votacao_proposicao import VotacaoProposicao
-from models.voto_individual import VotoIndividual
-from utils.pagination import PaginatedResponse, PaginationParams
-from sqlalchemy.orm import selectinload
+from models.gabinete import Gabinete
+from utils.pagination import PaginatedResponse, PaginationParams, pagina
+from utils.projecao import colunas, extrair_aninhado, linhas_para_dicts
+from utils.respostas import RespostaJSON
 
-from utils.querys import get_despesas_deputado_2024_subquery
+from utils.atividade import TIPOS_ATIVIDADE
+from utils.legislaturas import ANO_DESCRICAO, LEGISLATURA_DESCRICAO, filtro_periodo, periodo_padrao
+from utils.querys import deputados_da_legislatura, get_despesas_deputado_subquery
 
 logger = get_logger("deputados_logger", "log/deputados.log")
 
 deputado_router = APIRouter(prefix="/deputado", tags=["Deputado"])
 
-@deputado_router.get("/get_by_id/{deputado_id}")
+def _select_deputado_com_gabinete():
+    # Uma única consulta com outer join no gabinete, projetada nos campos do DTO
+    return (
+        select(
+            *colunas(DeputadoResponseWithGabinete, Deputado),
+            *colunas(GabineteResponse, Gabinete, prefixo="gabinete_"),
+        )
+        .join(Gabinete, Gabinete.id_deputado == Deputado.id, isouter=True)
+    )
+
+@deputado_router.get("/get_by_id/{deputado_id}", response_model=DeputadoResponseWithGabinete)
 def get_by_id(deputado_id: int, session: Session = Depends(get_session)):
     
-    statement = select(Deputado).where(Deputado.id == deputado_id).options(
-        selectinload(Deputado.gabinete)
-    )
+    statement = _select_deputado_com_gabinete().where(Deputado.id == deputado_id)
     deputado = session.exec(statement).first()
 
     if not deputado:
         logger.warning(f"Deputado com ID {deputado_id} nao encontrado.")
         raise HTTPException(status_code=404, detail=f"Deputado com ID {deputado_id} nao encontrado.")
 
-    gabinete_response = None
-    if deputado.gabinete:
-        gabinete_response = GabineteResponse.from_model(deputado.gabinete)
-
-    deputado_response = DeputadoResponseWithGabinete.from_model(deputado, gabinete_response)
-
-    return deputado_response
+    return RespostaJSON(extrair_aninhado(deputado._asdict(), "gabinete_"))
 
-@deputado_router.get("/get_all")
+@deputado_router.get("/get_all", response_model=PaginatedResponse[DeputadoResponseWithGabinete])
 def get_all(
     pagination: PaginationParams = Depends(),
     session: Session = Depends(get_session),
     uf: Optional[str] = Query(None, description="Filtrar por sigla da UF (ex: PR, SP)"),
     sexo: Optional[str] = Query(None, description="Filtrar por sexo (M ou F)"),
-    partido: Optional[str] = Query(None, description="Filtrar por sigla do partido (ex: PT, PL)")
+    partido: Optional[str] = Query(None, description="Filtrar por sigla do partido (ex: PT, PL)"),
+    legislatura: Optional[int] = Query(None, description="Só deputados com mandato na legislatura (ex: 57).")
 ):
-    statement = select(Deputado).options(selectinload(Deputado.gabinete))
+    statement = _select_deputado_com_gabinete()
+
+    if legislatura:
+        statement = statement.where(Deputado.id.in_(deputados_da_legislatura(legislatura)))
 
     if uf:
         statement = statement.where(Deputado.sigla_uf == uf.upper())
@@ -62,52 +72,71 @@ def get_all(
     offset = (pagination.page - 1) * pagination.per_page
     deputados_statement = statement.offset(offset).limit(pagination.per_page)
     
-    deputados_db = session.exec(deputados_statement).all()
-
     items_response = [
-        DeputadoResponseWithGabinete.from_model(
-            deputado=dep,
-            gabinete=GabineteResponse.from_model(dep.gabinete) if dep.gabinete else None
-        )
-        for dep in deputados_db
+        extrair_aninhado(item, "gabinete_")
+        for item in linhas_para_dicts(session.exec(deputados_statement).all())
     ]
 
-    return PaginatedResponse(
-        items=items_response, 
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page) if total > 0 else 0
-    )
+    return RespostaJSON(pagina(items_response, total, pagination))
 
 @deputado_router.get("/deputados/{id_deputado}/resumo")
-def get_resumo_deputado(id_deputado: int, session: Session = Depends(get_session)):
+def get_resumo_deputado(
+    id_deputado: int,
+    session: Session = Depends(get_session),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
+):
     """
-    Retorna um resumo de um deputado específico, com seu gasto total em 2024 e o número de sessões que votou. 
+    Retorna um resumo de um deputado específico, com seu gasto total no ano (ou na
+    legislatura) e a atividade nas votações do mesmo período: sessões votadas, proposições
+    votadas, taxa de presença e votos por tipo. O campo `total_gasto_2024` mantém o nome
+    por compatibilidade e segue o período pedido.
 
-    Entidades: Deputado e VotoIndividual.
+    Entidades: Deputado, Despesa e AtividadeDeputado.
     """
-    
-    despesas_subq = get_despesas_deputado_2024_subquery()
+    ano, legislatura = periodo_padrao(ano, legislatura)
+    despesas_subq = get_despesas_deputado_subquery(ano, legislatura)
     gasto_statement = select(despesas_subq.c.total_despesas).where(despesas_subq.c.id_deputado == id_deputado)
     total_gasto = session.exec(gasto_statement).first() or 0.0
 
-    sessoes_votadas_statement = select(func.count(VotoIndividual.id_votacao.distinct())).where(VotoIndividual.id_deputado == id_deputado)
-    sessoes_votadas = session.exec(sessoes_votadas_statement).one()
-    
+    # Atividade pré-calculada por ano na carga dos votos (utils/atividade.py)
+    colunas_tipo = list(TIPOS_ATIVIDADE.values()) + ["votos_outros"]
+    atividade_statement = (
+        select(
+            func.sum(AtividadeDeputado.sessoes_votadas),
+            func.sum(AtividadeDeputado.sessoes_do_ano),
+            func.sum(AtividadeDeputado.proposicoes_votadas),
+            *(func.sum(getattr(AtividadeDeputado, coluna)) for coluna in colunas_tipo)
+        )
+        .where(AtividadeDeputado.id_deputado == id_deputado)
+        .where(*filtro_periodo(AtividadeDeputado.ano, ano, legislatura))
+    )
+    sessoes_votadas, sessoes_periodo, proposicoes_votadas, *votos = (v or 0 for v in session.exec(atividade_statement).one())
+
     return ResumoDeputado(
         id=id_deputado,
         sessoes_votadas=sessoes_votadas,
+        proposicoes_votadas=proposicoes_votadas,
+        taxa_presenca=round(sessoes_votadas / sessoes_periodo, 4) if sessoes_periodo else None,
+        votos_por_tipo=dict(zip(list(TIPOS_ATIVIDADE) + ["Outros"], votos)),
         total_gasto_2024=total_gasto
     )
 
 @deputado_router.get("/ranking/deputados_despesa")
-def get_ranking_deputados_despesa(pagination: PaginationParams = Depends(), session: Session = Depends(get_session)):
+def get_ranking_deputados_despesa(
+    pagination: PaginationParams = Depends(),
+    session: Session = Depends(get_session),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
+):
     """
-    Retorna um ranking paginado de deputados com base no total de suas despesas em 2024, do maior para o menor. 
+    Retorna um ranking paginado de deputados com base no total de suas despesas no ano
+    (ou na legislatura), do maior para o menor. Com `legislatura`, só entram os deputados
+    com mandato nela.
     Entidades: Deputado e Despesa
     """
-    despesas_subq = get_despesas_deputado_2024_subquery()
+    ano, legislatura = periodo_padrao(ano, legislatura)
+    despesas_subq = get_despesas_deputado_subquery(ano, legislatura)
 
     statement = (
         select(
@@ -117,6 +146,8 @@ def get_ranking_deputados_despesa(pagination: PaginationParams = Depends(), sess
         .join(despesas_subq, Deputado.id == despesas_subq.c.id_deputado, isouter=True)
         .order_by(desc(func.coalesce(despesas_subq.c.total_despesas, 0.0)))
     )
+    if legislatura:
+        statement = statement.where(Deputado.id.in_(deputados_da_legislatura(legislatura)))
     
     count_statement = select(func.count()).select_from(statement.subquery())
     total = session.exec(count_statement).one()
@@ -151,30 +182,34 @@ def get_ranking_deputados_despesa(pagination: PaginationParams = Depends(), sess
 @deputado_router.get("/ranking/atuantes", response_model=PaginatedResponse[DeputadoRankingDTO])
 def get_ranking_deputados__mais_atuantes(
     pagination: PaginationParams = Depends(),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: todos os anos."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
     session: Session = Depends(get_session)
 ):
     """
     Obtém um ranking paginado dos deputados mais atuantes com base em sua participação em votações.
 
     A "atuação" é medida pelo número total de sessões de votação distintas em que o 
-    deputado participou. O endpoint também retorna o número de proposições únicas votadas como 
-    uma métrica secundária.
+    deputado participou. O endpoint também retorna o número de proposições votadas (contadas
+    uma vez por ano) e a taxa de presença nas sessões com votos nominais do período.
 
-    Entidades: Deputado, VotoIndividual e VotacaoProposicao
+    Entidades: Deputado e AtividadeDeputado
     """
+    sessoes_votadas = func.sum(AtividadeDeputado.sessoes_votadas)
     stmt = (
         select(
             Deputado.id,
             Deputado.nome_eleitoral,
             Deputado.sigla_partido,
             Deputado.sigla_uf,
-            func.count(func.distinct(VotoIndividual.id_votacao)).label("total_votacoes"),
-            func.count(func.distinct(VotacaoProposicao.id_proposicao)).label("total_proposicoes")
+            sessoes_votadas.label("total_votacoes"),
+            func.sum(AtividadeDeputado.proposicoes_votadas).label("total_proposicoes"),
+            (cast(sessoes_votadas, Float) / func.nullif(func.sum(AtividadeDeputado.sessoes_do_ano), 0)).label("taxa_presenca")
         )
-        .join(VotoIndividual, VotoIndividual.id_deputado == Deputado.id)
-        .join(VotacaoProposicao, VotacaoProposicao.id_votacao == VotoIndividual.id_votacao)
+        .join(AtividadeDeputado, AtividadeDeputado.id_deputado == Deputado.id)
+        .where(*filtro_periodo(AtividadeDeputado.ano, ano, legislatura))
         .group_by(Deputado.id)
-        .order_by(func.count(func.distinct(VotoIndividual.id_votacao)).desc())
+        .order_by(sessoes_votadas.desc(), Deputado.id)
         .offset((pagination.page - 1) * pagination.per_page)
         .limit(pagination.per_page)
     )
@@ -182,21 +217,21 @@ def get_ranking_deputados__mais_atuantes(
     results = session.exec(stmt).all()
 
     count_stmt = (
-        select(func.count(func.distinct(Deputado.id)))
-        .join(VotoIndividual, VotoIndividual.id_deputado == Deputado.id)
-        .join(VotacaoProposicao, VotacaoProposicao.id_votacao == VotoIndividual.id_votacao)
+        select(func.count(func.distinct(AtividadeDeputado.id_deputado)))
+        .where(*filtro_periodo(AtividadeDeputado.ano, ano, legislatura))
     )
 
     total = session.exec(count_stmt).one()
 
     items = [
         DeputadoRankingDTO(
-            id=r[0],
-            nome_eleitoral=r[1],
-            sigla_partido=r[2],
-            sigla_uf=r[3],
-            total_votacoes=r[4],
-            total_proposicoes=r[5]
+            id=r.id,
+            nome_eleitoral=r.nome_eleitoral,
+            sigla_partido=r.sigla_partido,
+            sigla_uf=r.sigla_uf,
+            total_votacoes=r.total_votacoes,
+            total_proposicoes=r.total_proposicoes,
+            taxa_presenca=round(r.taxa_presenca, 4) if r.taxa_presenca is not None else None
         ) for r in results
     ]
 
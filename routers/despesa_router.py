@@ -1,40 +1,44 @@
 from http import HTTPStatus
-import math
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlmodel import Session, func, select
 from database import get_session
+from dtos.despesa_dtos import DespesaResponse
 from log.logger_config import get_logger
 from models.despesa import Despesa
-from utils.pagination import PaginatedResponse, PaginationParams
+from utils.legislaturas import LEGISLATURA_DESCRICAO, filtro_periodo
+from utils.pagination import PaginatedResponse, PaginationParams, pagina
+from utils.projecao import colunas, linhas_para_dicts
+from utils.respostas import RespostaJSON
 
 logger = get_logger("despesas_logger", "log/despesas.log")
 
 despesa_router = APIRouter(prefix="/despesa", tags=["Despesa"])
 
-@despesa_router.get("/get_by_id/{despesa_id}")
+@despesa_router.get("/get_by_id/{despesa_id}", response_model=DespesaResponse)
 def get_despesa_by_id(despesa_id: int, session: Session = Depends(get_session)):
 
-    despesa = session.get(Despesa, despesa_id)
+    despesa = session.exec(select(*colunas(DespesaResponse, Despesa)).where(Despesa.id == despesa_id)).first()
     if not despesa:
         logger.warning(f"Despesa com ID {despesa_id} não encontrada.")
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=f"Despesa com ID {despesa_id} não encontrada.")
-    return despesa
+    return RespostaJSON(despesa._asdict())
 
-@despesa_router.get("/get_all")
+@despesa_router.get("/get_all", response_model=PaginatedResponse[DespesaResponse])
 def get_all_despesas(
     pagination: PaginationParams = Depends(),
     session: Session = Depends(get_session),
     id_deputado: Optional[int] = Query(None, description="Filtrar despesas por ID do deputado."),
     ano: Optional[int] = Query(None, description="Filtrar despesas por ano."),
-    mes: Optional[int] = Query(None, description="Filtrar despesas por mês.")
+    mes: Optional[int] = Query(None, description="Filtrar despesas por mês."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
 ):
 
-    statement = select(Despesa)
+    statement = select(*colunas(DespesaResponse, Despesa))
     if id_deputado:
         statement = statement.where(Despesa.id_deputado == id_deputado)
-    if ano:
-        statement = statement.where(Despesa.ano == ano)
+    if ano or legislatura:
+        statement = statement.where(*filtro_periodo(Despesa.ano, ano, legislatura))
     if mes:
         statement = statement.where(Despesa.mes == mes)
 
@@ -43,12 +47,6 @@ def get_all_despesas(
 
     offset = (pagination.page - 1) * pagination.per_page
     despesas_statement = statement.offset(offset).limit(pagination.per_page)
-    despesas = session.exec(despesas_statement).all()
-
-    return PaginatedResponse(
-        items=despesas,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page) if total > 0 else 0
-    )
+    despesas = linhas_para_dicts(session.exec(despesas_statement).all())
+
+    return RespostaJSON(pagina(despesas, total, pagination))
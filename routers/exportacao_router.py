@@ -0,0 +1,52 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from utils.exportacao import diretorio_snapshot, manifesto_atual
+from utils.respostas import RespostaJSON
+
+exportacao_router = APIRouter(prefix="/exportacao", tags=["Exportação"])
+
+def _manifesto() -> dict:
+    manifesto = manifesto_atual()
+    if manifesto is None:
+        raise HTTPException(status_code=404, detail="Nenhum snapshot exportado. Rode `python -m utils.exportacao`.")
+    return manifesto
+
+@exportacao_router.get("/manifesto")
+def get_manifesto_exportacao():
+    """
+    Manifesto do último snapshot em Parquet: a geração de ingestão exportada, e, por
+    tabela, os arquivos (um por ano nas tabelas particionadas), as linhas e os bytes.
+    Os arquivos são baixados em `/exportacao/{tabela}`.
+    """
+    manifesto = _manifesto()
+    return RespostaJSON(manifesto, headers={"ETag": f'"exportacao-g{manifesto["geracao"]}"', "Cache-Control": "no-cache"})
+
+@exportacao_router.get("/{tabela}")
+def get_arquivo_exportacao(
+    tabela: str,
+    ano: Optional[int] = Query(None, description="Ano da partição, obrigatório nas tabelas particionadas por ano."),
+):
+    """
+    Baixa o arquivo Parquet de uma tabela do último snapshot (ex: `/exportacao/despesa?ano=2024`).
+    """
+    manifesto = _manifesto()
+    if tabela not in manifesto["tabelas"]:
+        raise HTTPException(status_code=404, detail=f"Tabela '{tabela}' não exportada. Disponíveis: {', '.join(manifesto['tabelas'])}.")
+
+    dados = manifesto["tabelas"][tabela]
+    if dados["particionada_por"] and ano is None:
+        raise HTTPException(status_code=400, detail=f"A tabela '{tabela}' é particionada por ano; informe `ano`.")
+    arquivo = next((a for a in dados["arquivos"] if not dados["particionada_por"] or a["ano"] == ano), None)
+    if arquivo is None:
+        raise HTTPException(status_code=404, detail=f"Sem dados de {ano} na tabela '{tabela}'.")
+
+    return FileResponse(
+        os.path.join(diretorio_snapshot(manifesto["geracao"]), arquivo["caminho"]),
+        media_type="application/vnd.apache.parquet",
+        filename=f"{tabela}_{ano}.parquet" if ano is not None else f"{tabela}.parquet",
+        headers={"X-Exportacao-Geracao": str(manifesto["geracao"])},
+    )
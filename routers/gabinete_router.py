@@ -1,15 +1,17 @@
 from typing import Optional
-import math
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlmodel import Session, select, func
 from sqlalchemy.orm import selectinload
 
+from config import ANO_REFERENCIA
 from database import get_session
 from models.gabinete import Gabinete
-from utils.pagination import PaginationParams, PaginatedResponse
-from models.despesa import Despesa
-from models.deputado import Deputado
+from utils.pagination import PaginationParams, PaginatedResponse, pagina
+from utils.projecao import colunas, linhas_para_dicts
+from utils.respostas import RespostaJSON
+from utils.perfil_andar import chave_local
 from models.partido import Partido
+from models.perfil_andar import PerfilAndar
 from sqlalchemy import desc
 
 gabinete_router = APIRouter(prefix="/gabinete", tags=["Gabinete"])
@@ -42,7 +44,7 @@ def get_all_gabinetes(
     """
     Lista todos os gabinetes com paginação e filtros opcionais por prédio e andar.
     """
-    statement = select(Gabinete).options(selectinload(Gabinete.deputado))
+    statement = select(*colunas(Gabinete, Gabinete))
 
     if predio:
         statement = statement.where(Gabinete.predio.ilike(f"%{predio}%"))
@@ -54,44 +56,39 @@ def get_all_gabinetes(
     total = session.exec(count_statement).one()
 
     offset = (pagination.page - 1) * pagination.per_page
-    results = session.exec(statement.offset(offset).limit(pagination.per_page)).all()
-
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page) if total > 0 else 0
-    )
+    results = linhas_para_dicts(session.exec(statement.offset(offset).limit(pagination.per_page)).all())
+
+    return RespostaJSON(pagina(results, total, pagination))
 @gabinete_router.get("/analise/gastos_por_andar")
 def get_analise_gastos_por_andar(
-    ano: int = Query(2024, description="Ano de referência para a análise das despesas."),
-    predio: Optional[str] = Query(None, description="Filtrar por um prédio específico (ex: 'Anexo IV')."),
+    ano: int = Query(ANO_REFERENCIA, description="Ano de referência para a análise das despesas."),
+    predio: Optional[str] = Query(None, description="Filtrar por um prédio específico (ex: 'Anexo IV'), sem diferenciar maiúsculas, acentos ou espaços."),
     session: Session = Depends(get_session)
 ):
     """
     Retorna uma análise dos gastos totais e médios dos deputados,
     agrupados por andar e prédio de seus gabinetes.
+    A média é por deputado com despesas no ano.
     """
-    # Consulta que junta Gabinete, Deputado e Despesa
+    # Consulta ao cubo por andar (ver utils/perfil_andar.py)
     stmt = (
         select(
-            Gabinete.predio,
-            Gabinete.andar,
-            func.sum(Despesa.valor_liquido).label("total_gasto"),
-            func.avg(Despesa.valor_liquido).label("media_gasto"),
-            func.count(func.distinct(Gabinete.id_deputado)).label("num_deputados")
+            PerfilAndar.predio,
+            PerfilAndar.andar,
+            func.sum(PerfilAndar.total_gasto).label("total_gasto"),
+            func.sum(PerfilAndar.deputados_com_despesa).label("num_deputados")
         )
-        .join(Deputado, Gabinete.id_deputado == Deputado.id)
-        .join(Despesa, Deputado.id == Despesa.id_deputado)
-        .where(Despesa.ano == ano)
+        .where(PerfilAndar.ano == ano)
+        .where(PerfilAndar.quantidade_despesas > 0)
     )
 
     if predio:
-        stmt = stmt.where(Gabinete.predio.ilike(f"%{predio}%"))
+        stmt = stmt.where(PerfilAndar.predio_chave == chave_local(predio))
 
     # Agrupando e ordenando pelo maior gasto total
-    stmt = stmt.group_by(Gabinete.predio, Gabinete.andar).order_by(desc("total_gasto"))
+    stmt = stmt.group_by(
+        PerfilAndar.predio_chave, PerfilAndar.andar_chave, PerfilAndar.predio, PerfilAndar.andar
+    ).order_by(desc("total_gasto"))
 
     resultados = session.exec(stmt).all()
 
@@ -101,7 +98,7 @@ def get_analise_gastos_por_andar(
             "predio": r.predio,
             "andar": r.andar,
             "total_gasto": round(r.total_gasto, 2) if r.total_gasto else 0,
-            "media_gasto_por_deputado": round(r.media_gasto, 2) if r.media_gasto else 0,
+            "media_gasto_por_deputado": round(r.total_gasto / r.num_deputados, 2) if r.total_gasto else 0,
             "numero_deputados_no_andar": r.num_deputados
         } for r in resultados
     ]
@@ -118,20 +115,20 @@ def get_analise_partidos_por_andar(
     """
     Retorna a contagem de deputados por partido para um andar e/ou prédio específico.
     """
+    # A ocupação se repete em todos os anos do cubo; basta um deles
     stmt = (
         select(
             Partido.sigla,
             Partido.nome_completo,
-            func.count(Deputado.id).label("quantidade_deputados")
+            func.sum(PerfilAndar.deputados_no_andar).label("quantidade_deputados")
         )
-        .select_from(Gabinete)  
-        .join(Deputado)         
-        .join(Partido)          
-        .where(Gabinete.andar.ilike(andar))
+        .join(Partido, PerfilAndar.id_partido == Partido.id)
+        .where(PerfilAndar.andar_chave == chave_local(andar))
+        .where(PerfilAndar.ano == select(func.max(PerfilAndar.ano)).scalar_subquery())
     )
 
     if predio:
-        stmt = stmt.where(Gabinete.predio.ilike(f"%{predio}%"))
+        stmt = stmt.where(PerfilAndar.predio_chave == chave_local(predio))
 
     # Agrupando por partido e ordenando pela maior quantidade
     stmt = stmt.group_by(Partido.sigla, Partido.nome_completo).order_by(desc("quantidade_deputados"))
@@ -159,7 +156,7 @@ def get_analise_partidos_por_andar(
 @gabinete_router.get("/perfil_completo_por_andar")
 def get_perfil_completo_por_andar(
     andar: str = Query(..., description="Andar a ser analisado."),
-    ano: int = Query(2024, description="Ano de referência para a análise das despesas."),
+    ano: int = Query(ANO_REFERENCIA, description="Ano de referência para a análise das despesas."),
     predio: Optional[str] = Query(None, description="Filtrar por um prédio específico."),
     session: Session = Depends(get_session)
 ):
@@ -167,25 +164,22 @@ def get_perfil_completo_por_andar(
     Retorna um perfil completo de um andar, mostrando para cada partido presente:
     a quantidade de deputados, o gasto total e a média de gasto por deputado.
     """
-    # Consulta que junta Gabinete, Deputado, Partido e Despesa
+    # Consulta ao cubo por andar: deputados do partido com despesas no ano e o total deles
     stmt = (
         select(
             Partido.sigla,
             Partido.nome_completo,
-            func.count(func.distinct(Deputado.id)).label("quantidade_deputados"),
-            func.sum(Despesa.valor_liquido).label("total_gasto_partido_no_andar"),
-            func.avg(Despesa.valor_liquido).label("media_gasto_por_deputado_no_andar")
+            func.sum(PerfilAndar.deputados_com_despesa).label("quantidade_deputados"),
+            func.sum(PerfilAndar.total_gasto).label("total_gasto_partido_no_andar")
         )
-        .select_from(Gabinete)
-        .join(Deputado, Gabinete.id_deputado == Deputado.id)
-        .join(Partido, Deputado.id_partido == Partido.id)
-        .join(Despesa, Deputado.id == Despesa.id_deputado)
-        .where(Gabinete.andar.ilike(andar))
-        .where(Despesa.ano == ano)
+        .join(Partido, PerfilAndar.id_partido == Partido.id)
+        .where(PerfilAndar.andar_chave == chave_local(andar))
+        .where(PerfilAndar.ano == ano)
+        .where(PerfilAndar.quantidade_despesas > 0)
     )
 
     if predio:
-        stmt = stmt.where(Gabinete.predio.ilike(f"%{predio}%"))
+        stmt = stmt.where(PerfilAndar.predio_chave == chave_local(predio))
 
     # Agrupamento e Ordenação
     stmt = stmt.group_by(Partido.sigla, Partido.nome_completo).order_by(desc("total_gasto_partido_no_andar"))
@@ -205,7 +199,7 @@ def get_perfil_completo_por_andar(
             "nome_partido": r.nome_completo,
             "quantidade_deputados_no_andar": r.quantidade_deputados,
             "gasto_total_do_partido_no_andar": round(r.total_gasto_partido_no_andar, 2) if r.total_gasto_partido_no_andar else 0,
-            "media_gasto_por_deputado_do_partido_no_andar": round(r.media_gasto_por_deputado_no_andar, 2) if r.media_gasto_por_deputado_no_andar else 0
+            "media_gasto_por_deputado_do_partido_no_andar": round(r.total_gasto_partido_no_andar / r.quantidade_deputados, 2) if r.total_gasto_partido_no_andar else 0
         } for r in resultados
     ]
 
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from utils.metricas import registro
+
+metricas_router = APIRouter(tags=["Métricas"])
+
+@metricas_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metricas():
+    """
+    Métricas da API no formato de exposição do Prometheus.
+    """
+    return PlainTextResponse(registro.renderizar(), media_type="text/plain; version=0.0.4")
@@ -6,13 +6,19 @@ from typing import Optional
 from database import get_session
 from dtos.analise_dtos import PartidoRankingDespesa
 from models.partido import Partido
-from utils.pagination import PaginationParams, PaginatedResponse
+from utils.pagination import PaginationParams, PaginatedResponse, pagina
+from utils.projecao import colunas, linhas_para_dicts
+from utils.respostas import RespostaJSON
 import math
 from models.deputado import Deputado
 from sqlalchemy.orm import selectinload
 from models.sessao_votacao import SessaoVotacao
 from models.voto_individual import VotoIndividual
-from utils.querys import get_despesas_deputado_2024_subquery
+from models.tipo_voto import TipoVoto
+from models.mandato_deputado import MandatoDeputado
+from models.coesao_partido import CoesaoPartido
+from utils.legislaturas import ANO_DESCRICAO, LEGISLATURA_DESCRICAO, filtro_periodo, periodo_padrao
+from utils.querys import get_despesas_deputado_subquery, id_tipo_voto, legislatura_do_periodo
 
 partido_router = APIRouter(prefix="/partido", tags=["Partido"])
 
@@ -43,7 +49,7 @@ def get_all_partidos(
     min_membros: Optional[int] = Query(None, alias="min_membros"),
     max_membros: Optional[int] = Query(None, alias="max_membros")
 ):
-    statement = select(Partido)
+    statement = select(*colunas(Partido, Partido))
 
     if sigla:
         statement = statement.where(Partido.sigla.ilike(f"%{sigla}%"))
@@ -60,15 +66,9 @@ def get_all_partidos(
     total = session.exec(count_statement).one()
 
     offset = (pagination.page - 1) * pagination.per_page
-    results = session.exec(statement.offset(offset).limit(pagination.per_page)).all()
+    results = linhas_para_dicts(session.exec(statement.offset(offset).limit(pagination.per_page)).all())
 
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page) if total > 0 else 0
-    )
+    return RespostaJSON(pagina(results, total, pagination))
 
 #router filtro deputado por sigla
 @partido_router.get("/deputados_por_partido/{sigla_partido}", response_model=PaginatedResponse[Deputado])
@@ -138,11 +138,13 @@ def get_coesao_partido_em_votacao(
 
     # Contrução de query para votação
     stmt = (
-        select(VotoIndividual.tipo_voto, func.count(VotoIndividual.id).label("total"))
+        select(TipoVoto.nome.label("tipo_voto"), func.count(VotoIndividual.id).label("total"))
+        .select_from(VotoIndividual)
+        .join(TipoVoto, TipoVoto.id == VotoIndividual.id_tipo_voto)
         .join(Deputado, Deputado.id == VotoIndividual.id_deputado)
         .where(Deputado.id_partido == partido.id)
         .where(VotoIndividual.id_votacao == id_votacao)
-        .group_by(VotoIndividual.tipo_voto)
+        .group_by(TipoVoto.nome)
     )
 
     resultados_votos = session.exec(stmt).all()
@@ -167,23 +169,129 @@ def get_coesao_partido_em_votacao(
         "distribuicao_votos": distribuicao
     }
 
+@partido_router.get("/coesao_voto/{sigla_partido}")
+def get_serie_coesao_partido(
+    sigla_partido: str,
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
+    session: Session = Depends(get_session)
+):
+    """
+    Série da coesão de um partido nas sessões de votação do período, em ordem cronológica:
+    índice de Rice (|Sim - Não| / (Sim + Não)) e fração dos votos do partido iguais ao voto
+    da maioria dele, com as médias do período. Lê os valores pré-calculados na carga dos votos.
+
+    Entidades: CoesaoPartido, SessaoVotacao, TipoVoto
+    """
+    ano, legislatura = periodo_padrao(ano, legislatura)
+    partido = session.exec(select(Partido.id, Partido.sigla).where(Partido.sigla == sigla_partido.upper())).first()
+    if not partido:
+        raise HTTPException(status_code=404, detail=f"Partido com sigla '{sigla_partido}' não encontrado.")
+
+    stmt = (
+        select(
+            CoesaoPartido.id_votacao,
+            SessaoVotacao.data_hora_registro,
+            SessaoVotacao.sigla_orgao,
+            CoesaoPartido.total_votos,
+            CoesaoPartido.votos_sim,
+            CoesaoPartido.votos_nao,
+            TipoVoto.nome.label("voto_maioria"),
+            CoesaoPartido.indice_rice,
+            CoesaoPartido.concordancia_maioria,
+        )
+        .join(SessaoVotacao, SessaoVotacao.id == CoesaoPartido.id_votacao)
+        .join(TipoVoto, TipoVoto.id == CoesaoPartido.id_tipo_voto_maioria)
+        .where(CoesaoPartido.id_partido == partido.id)
+        .where(*filtro_periodo(CoesaoPartido.ano, ano, legislatura))
+        .order_by(SessaoVotacao.data_hora_registro, CoesaoPartido.id_votacao)
+    )
+    serie = linhas_para_dicts(session.exec(stmt).all())
+
+    rices = [s["indice_rice"] for s in serie if s["indice_rice"] is not None]
+    for s in serie:
+        if s["indice_rice"] is not None:
+            s["indice_rice"] = round(s["indice_rice"], 4)
+        s["concordancia_maioria"] = round(s["concordancia_maioria"], 4)
+
+    return RespostaJSON({
+        "sigla_partido": partido.sigla,
+        "ano": ano,
+        "legislatura": legislatura,
+        "total_sessoes": len(serie),
+        "media_indice_rice": round(sum(rices) / len(rices), 4) if rices else None,
+        "media_concordancia_maioria": round(sum(s["concordancia_maioria"] for s in serie) / len(serie), 4) if serie else None,
+        "serie": serie
+    })
+
+@partido_router.get("/ranking/coesao")
+def get_ranking_coesao_partidos(
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
+    min_sessoes: int = Query(1, ge=1, description="Número mínimo de sessões com votos do partido no período."),
+    session: Session = Depends(get_session)
+):
+    """
+    Ranking dos partidos pela coesão média nas sessões de votação do período: média do
+    índice de Rice (ordem do ranking) e da concordância com o voto da maioria do partido.
+    Lê os valores pré-calculados na carga dos votos.
+
+    Entidades: CoesaoPartido, Partido
+    """
+    ano, legislatura = periodo_padrao(ano, legislatura)
+    stmt = (
+        select(
+            Partido.sigla,
+            Partido.nome_completo,
+            func.count().label("total_sessoes"),
+            func.avg(CoesaoPartido.indice_rice).label("media_indice_rice"),
+            func.avg(CoesaoPartido.concordancia_maioria).label("media_concordancia_maioria"),
+            func.avg(CoesaoPartido.total_votos).label("media_votos_por_sessao"),
+        )
+        .join(Partido, Partido.id == CoesaoPartido.id_partido)
+        .where(*filtro_periodo(CoesaoPartido.ano, ano, legislatura))
+        .group_by(Partido.sigla, Partido.nome_completo)
+        .having(func.count() >= min_sessoes)
+        .order_by(desc("media_indice_rice").nulls_last(), desc("media_concordancia_maioria"), Partido.sigla)
+    )
+
+    ranking = [
+        {
+            "sigla": r.sigla,
+            "nome_completo": r.nome_completo,
+            "total_sessoes": r.total_sessoes,
+            "media_indice_rice": round(r.media_indice_rice, 4) if r.media_indice_rice is not None else None,
+            "media_concordancia_maioria": round(r.media_concordancia_maioria, 4),
+            "media_votos_por_sessao": round(float(r.media_votos_por_sessao), 2),
+        }
+        for r in session.exec(stmt).all()
+    ]
+    return RespostaJSON(ranking)
+
 @partido_router.get("/ranking/partidos_despesa")
-def get_ranking_partidos_despesa(session: Session = Depends(get_session)):
+def get_ranking_partidos_despesa(
+    session: Session = Depends(get_session),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO + " Padrão: ano de referência."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
+):
     """
-    Retorna um ranking de partidos ordenado pela soma total das despesas de seus deputados em 2024. 
+    Retorna um ranking de partidos ordenado pela soma total das despesas de seus deputados
+    no ano (ou na legislatura) informado. Cada deputado conta para o partido pelo qual
+    exerceu o mandato naquela legislatura.
     
-    Entidades: Partido, Deputado e Despesa.
+    Entidades: Partido, MandatoDeputado e Despesa.
     """
-    
-    despesas_subq = get_despesas_deputado_2024_subquery()
+    ano, legislatura = periodo_padrao(ano, legislatura)
+    despesas_subq = get_despesas_deputado_subquery(ano, legislatura)
     
     statement = (
         select(
             Partido,
             func.sum(despesas_subq.c.total_despesas).label("total_geral_partido")
         )
-        .join(Deputado, Partido.id == Deputado.id_partido)
-        .join(despesas_subq, Deputado.id == despesas_subq.c.id_deputado)
+        .join(MandatoDeputado, Partido.id == MandatoDeputado.id_partido)
+        .join(despesas_subq, MandatoDeputado.id_deputado == despesas_subq.c.id_deputado)
+        .where(MandatoDeputado.id_legislatura == legislatura_do_periodo(ano, legislatura))
         .group_by(Partido.id)
         .order_by(desc("total_geral_partido"))
     )
@@ -207,12 +315,14 @@ def get_ranking_partidos_despesa(session: Session = Depends(get_session)):
 def get_ranking_partidos_por_voto(
     tipo_voto: str = Query(..., description="Tipo de voto a ser contado (ex: 'Sim', 'Não', 'Abstenção', 'Obstrução')."),
     ano: Optional[int] = Query(None, description="Filtrar por ano específico."),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
     pagination: PaginationParams = Depends(),
     session: Session = Depends(get_session)
 ):
     """
     Cria um ranking de partidos com base na contagem total de um tipo de voto específico.
-    Permite filtrar por ano.
+    Permite filtrar por ano ou legislatura. O voto conta para o partido do deputado na
+    data da votação.
     """
     stmt = (
         select(
@@ -220,14 +330,11 @@ def get_ranking_partidos_por_voto(
             Partido.nome_completo,
             func.count(VotoIndividual.id).label("total_votos")
         )
-        .join(Deputado, Partido.id == Deputado.id_partido)
-        .join(VotoIndividual, Deputado.id == VotoIndividual.id_deputado)
-        .where(VotoIndividual.tipo_voto == tipo_voto)
+        .join(VotoIndividual, Partido.id == VotoIndividual.id_partido)
+        .where(VotoIndividual.id_tipo_voto == id_tipo_voto(tipo_voto))
+        .where(*filtro_periodo(VotoIndividual.ano, ano, legislatura))
     )
 
-    if ano:
-        stmt = stmt.where(func.cast(VotoIndividual.data_hora_registro, str).startswith(str(ano)))
-
     stmt = stmt.group_by(Partido.sigla, Partido.nome_completo).order_by(desc("total_votos"))
     
     count_subquery = select(func.count(func.distinct(Partido.id))).select_from(stmt.subquery())
@@ -1,35 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlmodel import Session, select, func
 from database import get_session
 from log.logger_config import get_logger
+from models.placar import Placar
 from models.proposicao import Proposicao
+from models.ranking_proposicao import RankingProposicao
 from models.sessao_votacao import SessaoVotacao
-from utils.pagination import PaginatedResponse, PaginationParams
-import math
+from utils.mais_votadas import consultar_mais_votadas, select_mais_votadas
+from utils.pagination import (
+    CursorPaginatedResponse, CursorParams, PaginatedResponse, PaginationParams, pagina, pagina_cursor, paginar_por_cursor,
+)
 from typing import Optional
-from dtos.proposicao_dtos import  ProposicaoMaisVotadaDTO
+from dtos.proposicao_dtos import  ProposicaoMaisVotadaDTO, ProposicaoResponse
+from utils.projecao import colunas, linhas_para_dicts
+from utils.placar import placar_vazio
+from utils.respostas import RespostaJSON
 from models.votacao_proposicao import VotacaoProposicao
 
 logger = get_logger("proposicoes_logger", "log/proposicoes.log")
 proposicao_router = APIRouter(prefix="/proposicao", tags=["Proposicao"])
 
+# Maior `limite` aceito em /mais_votadas/{limite}
+LIMITE_MAIS_VOTADAS = 100
+
 # Obtém uma proposição pelo ID
-@proposicao_router.get("/get_by_id/{id}")
+@proposicao_router.get("/get_by_id/{id}", response_model=ProposicaoResponse)
 def get_by_id(id: int, session: Session = Depends(get_session)):
-    proposicao = session.get(Proposicao, id)
+    proposicao = session.exec(select(*colunas(ProposicaoResponse, Proposicao)).where(Proposicao.id == id)).first()
     if not proposicao:
         raise HTTPException(status_code=404, detail="Proposição não encontrada.")
-    return proposicao
+    return RespostaJSON(proposicao._asdict())
 
 # Obtém todas as proposições com paginação e filtros opcionais
-@proposicao_router.get("/get_all")
+@proposicao_router.get("/get_all", response_model=PaginatedResponse[ProposicaoResponse])
 def get_all_proposicoes(
     pagination: PaginationParams = Depends(),
     session: Session = Depends(get_session),
     ano: Optional[int] = Query(None),
     sigla_tipo: Optional[str] = Query(None)
 ):
-    statement = select(Proposicao)
+    statement = select(*colunas(ProposicaoResponse, Proposicao))
 
     if ano:
         statement = statement.where(Proposicao.ano == ano)
@@ -40,15 +50,9 @@ def get_all_proposicoes(
     total = session.exec(count_statement).one()
 
     offset = (pagination.page - 1) * pagination.per_page
-    results = session.exec(statement.offset(offset).limit(pagination.per_page)).all()
-
-    return PaginatedResponse(
-        items=results,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page) if total > 0 else 0
-    )
+    results = linhas_para_dicts(session.exec(statement.offset(offset).limit(pagination.per_page)).all())
+
+    return RespostaJSON(pagina(results, total, pagination))
 
 
 @proposicao_router.get("/{proposicao_id}/sessoes")
@@ -80,27 +84,56 @@ def get_sessoes_por_proposicao(
     
     return sessoes
 
-# Obtém as 10 proposições mais votadas
-@proposicao_router.get("/mais_votadas/{limite}", response_model=list[ProposicaoMaisVotadaDTO])
-def get_proposicoes_mais_votadas(limite: int, session: Session = Depends(get_session)):
+@proposicao_router.get("/{proposicao_id}/placar")
+def get_placar_proposicao(
+    proposicao_id: int,
+    session: Session = Depends(get_session)
+):
     """
-    Retorna as 10 proposições mais votadas, com base no número de sessões de votação associadas. 
-    Entidades: Proposicao, VotacaoProposicao.
+    Placar das votações de uma proposição: votos Sim, Não, Abstenção e Obstrução (e
+    outros tipos, se houver) no total e em cada sessão de votação ligada a ela, e em cada
+    sessão também por partido (o do deputado na data do voto) e por UF.
+
+    O placar é pré-calculado pela carga dos votos (`utils/placar.py`).
+    Entidades: Placar.
     """
-    stmt = (
-        select(
-            Proposicao.id,
-            Proposicao.id_dados_abertos,
-            Proposicao.sigla_tipo,
-            Proposicao.ano,
-            Proposicao.ementa,
-            func.count(VotacaoProposicao.id_votacao).label("total_votacoes")
+    conteudo = session.exec(select(Placar.conteudo).where(Placar.id_proposicao == proposicao_id)).first()
+    if conteudo is not None:
+        return Response(content=conteudo, media_type="application/json")
+
+    # Sem placar: a proposição não existe ou não tem sessões de votação
+    if not session.get(Proposicao, proposicao_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Proposição com ID {proposicao_id} não encontrada."
         )
-        .join(VotacaoProposicao, VotacaoProposicao.id_proposicao == Proposicao.id)
-        .group_by(Proposicao.id)
-        .order_by(func.count(VotacaoProposicao.id_votacao).desc())
-        .limit(limite)
-    )
+    return RespostaJSON(placar_vazio(proposicao_id))
 
-    results = session.exec(stmt).all()
-    return results
\ No newline at end of file
+# Obtém as proposições mais votadas
+@proposicao_router.get("/mais_votadas/{limite}", response_model=list[ProposicaoMaisVotadaDTO])
+def get_proposicoes_mais_votadas(
+    limite: int = Path(..., ge=1, le=LIMITE_MAIS_VOTADAS, description=f"Quantidade de proposições (até {LIMITE_MAIS_VOTADAS})."),
+    ano: Optional[int] = Query(None, description="Filtrar pelo ano da proposição."),
+    sigla_tipo: Optional[str] = Query(None, description="Filtrar pela sigla do tipo (ex: PL, PEC)."),
+    session: Session = Depends(get_session)
+):
+    """
+    Retorna as proposições mais votadas, com base no número de sessões de votação associadas.
+    Para percorrer o ranking inteiro, use `/proposicao/mais_votadas` (paginado por cursor).
+    Entidades: RankingProposicao (recalculado ao fim de cada carga).
+    """
+    return RespostaJSON(consultar_mais_votadas(session, limite, ano, sigla_tipo))
+
+@proposicao_router.get("/mais_votadas", response_model=CursorPaginatedResponse[ProposicaoMaisVotadaDTO])
+def get_ranking_mais_votadas(
+    cursor: CursorParams = Depends(),
+    ano: Optional[int] = Query(None, description="Filtrar pelo ano da proposição."),
+    sigla_tipo: Optional[str] = Query(None, description="Filtrar pela sigla do tipo (ex: PL, PEC)."),
+    session: Session = Depends(get_session)
+):
+    """
+    Ranking completo das proposições mais votadas, paginado por cursor (`next_cursor`).
+    Entidades: RankingProposicao (recalculado ao fim de cada carga).
+    """
+    linhas, proximo = paginar_por_cursor(session, select_mais_votadas(ano, sigla_tipo), RankingProposicao.posicao, cursor)
+    return RespostaJSON(pagina_cursor(linhas_para_dicts(linhas), proximo, cursor))
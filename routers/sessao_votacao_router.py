@@ -2,11 +2,14 @@ from fastapi import HTTPException, APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from typing import Optional
-import math
 
 from models.sessao_votacao import SessaoVotacao
 from database import get_session
-from utils.pagination import PaginatedResponse, PaginationParams
+from dtos.sessao_votacao_dtos import SessaoVotacaoResponse
+from utils.legislaturas import ANO_DESCRICAO, LEGISLATURA_DESCRICAO, filtro_periodo
+from utils.pagination import PaginatedResponse, PaginationParams, pagina
+from utils.projecao import colunas, linhas_para_dicts
+from utils.respostas import RespostaJSON
 
 sessaovotacao_router = APIRouter(  
     prefix="/sessaovotacao",
@@ -14,33 +17,31 @@ sessaovotacao_router = APIRouter(
 )
 
 # Obtém uma sessão de votação pelo ID
-@sessaovotacao_router.get("/get_by_id/{id}")
+@sessaovotacao_router.get("/get_by_id/{id}", response_model=SessaoVotacaoResponse)
 def get_by_id(id: int, session: Session = Depends(get_session)):
-    sessao = session.get(SessaoVotacao, id)
+    sessao = session.execute(select(*colunas(SessaoVotacaoResponse, SessaoVotacao)).where(SessaoVotacao.id == id)).first()
     if not sessao:
         raise HTTPException(status_code=404, detail="Sessão de votação não encontrada.")
-    return sessao
+    return RespostaJSON(sessao._asdict())
 
 # Obtém todas as sessões de votação com paginação e filtros opcionais
-@sessaovotacao_router.get("/get_all")
+@sessaovotacao_router.get("/get_all", response_model=PaginatedResponse[SessaoVotacaoResponse])
 def get_all_sessoes(
     pagination: PaginationParams = Depends(),
     session: Session = Depends(get_session),
-    sigla_orgao: Optional[str] = Query(None)
+    sigla_orgao: Optional[str] = Query(None),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO)
 ):
-    statement = select(SessaoVotacao)
+    statement = select(*colunas(SessaoVotacaoResponse, SessaoVotacao))
     if sigla_orgao:
         statement = statement.where(SessaoVotacao.sigla_orgao == sigla_orgao.upper())
+    if ano or legislatura:
+        statement = statement.where(*filtro_periodo(SessaoVotacao.ano, ano, legislatura))
 
     count = session.exec(select(func.count()).select_from(statement.subquery())).one()[0]
     offset = (pagination.page - 1) * pagination.per_page
 
-    results = session.exec(statement.offset(offset).limit(pagination.per_page)).scalars().all()
+    results = linhas_para_dicts(session.execute(statement.offset(offset).limit(pagination.per_page)).all())
 
-    return PaginatedResponse(
-        items=results,
-        total=count,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(count / pagination.per_page) if count > 0 else 0
-    )
\ No newline at end of file
+    return RespostaJSON(pagina(results, count, pagination))
\ No newline at end of file
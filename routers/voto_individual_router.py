@@ -1,36 +1,94 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_
 from sqlmodel import Session, select, func
-from typing import List
+from typing import List, Optional, Union
 from database import get_session
+from dtos.voto_individual_dtos import TotalTipoVotoDTO, VotoIndividualResponse
 from log.logger_config import get_logger
+from models.tipo_voto import TipoVoto
 from models.voto_individual import VotoIndividual
 from models.votacao_proposicao import VotacaoProposicao
+from utils.legislaturas import ANO_DESCRICAO, LEGISLATURA_DESCRICAO, filtro_periodo
+from utils.pagination import CursorParams, CursorPaginatedResponse, pagina_cursor, paginar_por_cursor
+from utils.projecao import campos_selecionados, linhas_para_dicts
+from utils.querys import select_votos
+from utils.respostas import RespostaJSON
 
 logger = get_logger("votos_individuais_logger", "log/votos_individuais.log")
 voto_router = APIRouter(prefix="/voto_individual", tags=["Voto Individual"])
 
-# Obtém um voto individual pelo ID
-@voto_router.get("/by_deputado/{id_deputado}")
-def get_votos_by_deputado(id_deputado: int, session: Session = Depends(get_session)):
-    votos = session.exec(
-        select(VotoIndividual).where(VotoIndividual.id_deputado == id_deputado)
-    ).all()
-    return votos
+FIELDS_DESCRICAO = "Campos a retornar, separados por vírgula (ex: `tipo_voto,id_votacao`). Padrão: todos."
+AGREGADO_DESCRICAO = "Se verdadeiro, retorna só a contagem de votos por `tipo_voto` em vez das linhas."
+# As listagens retornam uma página por cursor ou, com `agregado=true`, a lista de totais
+RESPOSTA_VOTOS = Union[CursorPaginatedResponse[VotoIndividualResponse], List[TotalTipoVotoDTO]]
 
-# Obtém todos os votos individuais de uma proposição específica
-@voto_router.get("/by_proposicao/{id_proposicao}", response_model=List[VotoIndividual])
-def get_votos_by_proposicao(id_proposicao: int, session: Session = Depends(get_session)):
-    # 1. Subquery: votações ligadas à proposição
+def _listar_votos(
+    session: Session, filtro, cursor: CursorParams, fields: Optional[str], agregado: bool,
+    ano: Optional[int], legislatura: Optional[int]
+):
+    """
+    Corpo comum das listagens de votos: contagem por `tipo_voto` (modo agregado) ou página
+    por cursor com as colunas pedidas em `fields`. `ano`/`legislatura` restringem as
+    partições lidas.
+    """
+    filtro = and_(filtro, *filtro_periodo(VotoIndividual.ano, ano, legislatura))
+    if agregado:
+        totais = session.exec(
+            select(TipoVoto.nome.label("tipo_voto"), func.count(VotoIndividual.id).label("total"))
+            .select_from(VotoIndividual)
+            .join(TipoVoto, TipoVoto.id == VotoIndividual.id_tipo_voto)
+            .where(filtro)
+            .group_by(TipoVoto.nome)
+            .order_by(func.count(VotoIndividual.id).desc())
+        ).all()
+        return RespostaJSON(linhas_para_dicts(totais))
+
+    campos = campos_selecionados(VotoIndividualResponse, fields)
+    # O id entra sempre no SELECT porque é a chave do cursor
+    statement = select_votos(["id"] + [c for c in campos if c != "id"]).where(filtro)
+    linhas, proximo = paginar_por_cursor(session, statement, VotoIndividual.id, cursor)
+
+    items = linhas_para_dicts(linhas)
+    if "id" not in campos:
+        for item in items:
+            del item["id"]
+    return RespostaJSON(pagina_cursor(items, proximo, cursor))
+
+# Obtém os votos individuais de um deputado
+@voto_router.get("/by_deputado/{id_deputado}", response_model=RESPOSTA_VOTOS)
+def get_votos_by_deputado(
+    id_deputado: int,
+    cursor: CursorParams = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRICAO),
+    agregado: bool = Query(False, description=AGREGADO_DESCRICAO),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
+    session: Session = Depends(get_session)
+):
+    """
+    Votos de um deputado, paginados por cursor (`next_cursor`). Com `agregado=true`
+    retorna uma lista de `TotalTipoVotoDTO`.
+    """
+    return _listar_votos(session, VotoIndividual.id_deputado == id_deputado, cursor, fields, agregado, ano, legislatura)
+
+# Obtém os votos individuais de uma proposição específica
+@voto_router.get("/by_proposicao/{id_proposicao}", response_model=RESPOSTA_VOTOS)
+def get_votos_by_proposicao(
+    id_proposicao: int,
+    cursor: CursorParams = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRICAO),
+    agregado: bool = Query(False, description=AGREGADO_DESCRICAO),
+    ano: Optional[int] = Query(None, description=ANO_DESCRICAO),
+    legislatura: Optional[int] = Query(None, description=LEGISLATURA_DESCRICAO),
+    session: Session = Depends(get_session)
+):
+    """
+    Votos das sessões de votação ligadas a uma proposição, paginados por cursor
+    (`next_cursor`). Com `agregado=true` retorna uma lista de `TotalTipoVotoDTO`.
+    """
+    # Subquery: votações ligadas à proposição
     subquery = (
         select(VotacaoProposicao.id_votacao)
         .where(VotacaoProposicao.id_proposicao == id_proposicao)
     )
-
-    # 2. Buscar votos nas votações da proposição
-    stmt = (
-        select(VotoIndividual)
-        .where(VotoIndividual.id_votacao.in_(subquery))
-    )
-
-    votos = session.exec(stmt).all()
-    return votos
+    return _listar_votos(session, VotoIndividual.id_votacao.in_(subquery), cursor, fields, agregado, ano, legislatura)
@@ -0,0 +1,43 @@
+"""
+Base de testes: um SQLite temporário com um pequeno conjunto sintético (ver
+`benchmarks/dados_sinteticos.py`). As variáveis de ambiente são definidas antes de
+qualquer import da aplicação, que lê a configuração no import.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_DIRETORIO = tempfile.mkdtemp(prefix="camara-testes-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRETORIO, 'camara.db')}"
+os.environ["EXPORTACAO_DIR"] = os.path.join(_DIRETORIO, "exportacao")
+os.environ["ANALISE_DUCKDB_DIR"] = os.path.join(_DIRETORIO, "analitico")
+
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+from benchmarks.dados_sinteticos import COLUNAS, etapas_sinteticas  # noqa: E402
+from database import engine  # noqa: E402
+from utils.geracao import nova_geracao  # noqa: E402
+
+# Dois anos de uma legislatura, em escala reduzida
+ANOS = [(2024, 1.0), (2023, 1.0)]
+
+@pytest.fixture(scope="session")
+def base():
+    """Engine do SQLite já carregado, com uma geração de ingestão registrada."""
+    SQLModel.metadata.create_all(engine)
+    etapas = etapas_sinteticas(ANOS, seed=7, n_deputados=60, n_partidos=8, sessoes_por_ano=25, proposicoes_por_ano=30, despesas_por_deputado_mes=2)
+    with engine.begin() as conexao:
+        for tabela, linhas in etapas:
+            conexao.execute(SQLModel.metadata.tables[tabela].insert(), [dict(zip(COLUNAS[tabela], linha)) for linha in linhas()])
+    with Session(engine) as session:
+        nova_geracao(session, "testes")
+    yield engine
+    engine.dispose()
+    shutil.rmtree(_DIRETORIO, ignore_errors=True)
+
+@pytest.fixture
+def session(base):
+    with Session(base) as session:
+        yield session
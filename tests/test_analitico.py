@@ -0,0 +1,142 @@
+"""
+Paridade do backend analítico em DuckDB (utils/analitico.py) com o SQL: as consultas das
+rotas de `/analise` que passam por `executar` devolvem as mesmas linhas nos dois backends.
+"""
+import os
+import shutil
+
+import pytest
+from sqlmodel import select
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+import routers.analise_router as analise_router  # noqa: E402
+import utils.analitico as analitico  # noqa: E402
+from config import ANALISE_DUCKDB_DIR, EXPORTACAO_DIR  # noqa: E402
+from models.deputado import Deputado  # noqa: E402
+from utils.exportacao import diretorio_snapshot, exportar  # noqa: E402
+from utils.geracao import geracao_atual  # noqa: E402
+
+@pytest.fixture(scope="module")
+def geracao(base):
+    """Geração atual exportada em Parquet e montada no arquivo DuckDB."""
+    exportar()
+    return analitico.sincronizar()
+
+@pytest.fixture
+def usar_backend(monkeypatch):
+    def usar(backend: str):
+        monkeypatch.setattr(analitico, "ANALISE_BACKEND", backend)
+    return usar
+
+@pytest.fixture
+def consultas_duckdb(monkeypatch):
+    """Consultas executadas no DuckDB, com o erro de cada uma (a rota cairia no SQL em silêncio)."""
+    registro = []
+    consultar = analitico.consultar_duckdb
+
+    def registrar(cursor, statement):
+        try:
+            linhas = consultar(cursor, statement)
+        except Exception as e:
+            registro.append(e)
+            raise
+        registro.append(None)
+        return linhas
+
+    monkeypatch.setattr(analitico, "consultar_duckdb", registrar)
+    return registro
+
+def _normalizar(linhas):
+    # Somas em ponto flutuante podem diferir na última casa entre os bancos; a ordem dos
+    # grupos sem ORDER BY também
+    normalizadas = [tuple(round(v, 6) if isinstance(v, float) else v for v in linha) for linha in linhas]
+    return sorted(normalizadas, key=repr)
+
+def _casos(session):
+    uf = session.exec(select(Deputado.sigla_uf).order_by(Deputado.sigla_uf)).first()
+    return [
+        (analise_router.comparativo_gastos_estados, {"ano": 2023, "uf": None}),
+        (analise_router.comparativo_gastos_estados, {"ano": 2024, "uf": None}),
+        (analise_router.comparativo_gastos_estados, {"ano": 2024, "uf": uf}),
+        (analise_router.get_ranking_alinhamento_partidario, {"ano": 2023, "legislatura": None}),
+        (analise_router.get_ranking_alinhamento_partidario, {"ano": 2024, "legislatura": None}),
+        (analise_router.get_ranking_alinhamento_partidario, {"ano": None, "legislatura": 57}),
+    ]
+
+def _consultas_das_rotas(session):
+    """Statements que as rotas de `/analise` passam para `executar`."""
+    statements = []
+
+    def capturar(session, statement):
+        statements.append(statement)
+        return session.exec(statement).all()
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(analise_router, "executar", capturar)
+        for rota, parametros in _casos(session):
+            rota(session=session, **parametros)
+    return statements
+
+def test_consultas_iguais_nos_dois_backends(geracao, session, usar_backend, consultas_duckdb):
+    statements = _consultas_das_rotas(session)
+    assert len(statements) == len(_casos(session))
+
+    for statement in statements:
+        usar_backend("sql")
+        sql = analitico.executar(session, statement)
+        usar_backend("duckdb")
+        duck = analitico.executar(session, statement)
+        assert sql, "caso sem linhas não testa a paridade"
+        assert _normalizar(duck) == _normalizar(sql)
+    assert consultas_duckdb == [None] * len(statements), "alguma consulta não passou pelo DuckDB"
+
+def test_rotas_iguais_nos_dois_backends(geracao, session, usar_backend, consultas_duckdb):
+    for rota, parametros in _casos(session):
+        usar_backend("sql")
+        sql = rota(session=session, **parametros)
+        usar_backend("duckdb")
+        duck = rota(session=session, **parametros)
+        assert consultas_duckdb and consultas_duckdb[-1] is None, f"{rota.__name__} caiu no SQL: {consultas_duckdb[-1:]}"
+        assert sorted(map(repr, duck)) == sorted(map(repr, sql))
+
+def test_geracao_sem_snapshot_usa_sql(geracao, session, monkeypatch, usar_backend, consultas_duckdb):
+    statement = _consultas_das_rotas(session)[0]
+    # Nova carga sem exportação: o arquivo DuckDB é da geração anterior e não pode ser usado
+    monkeypatch.setattr(analitico, "geracao_atual", lambda: (geracao + 1, None))
+    usar_backend("duckdb")
+
+    assert analitico.executar(session, statement) == session.exec(statement).all()
+    assert consultas_duckdb == []
+
+def test_troca_de_geracao_fecha_a_conexao_antiga(geracao, monkeypatch):
+    monkeypatch.setattr(analitico, "_atual", None)
+    monkeypatch.setattr(analitico, "geracao_atual", lambda: (geracao, None))
+    arquivo, cursor = analitico._abrir_cursor()
+
+    # Uma nova geração exportada e montada enquanto a consulta na anterior está em andamento
+    nova = geracao + 1
+    shutil.copytree(diretorio_snapshot(geracao, EXPORTACAO_DIR), diretorio_snapshot(nova, EXPORTACAO_DIR))
+    shutil.copy(analitico.arquivo_analitico(geracao, ANALISE_DUCKDB_DIR), analitico.arquivo_analitico(nova, ANALISE_DUCKDB_DIR))
+    try:
+        monkeypatch.setattr(analitico, "geracao_atual", lambda: (nova, None))
+        arquivo_novo, cursor_novo = analitico._abrir_cursor()
+        assert arquivo_novo is not arquivo and arquivo_novo.geracao == nova
+
+        # A antiga continua aberta enquanto o cursor dela está em uso, e é fechada na devolução
+        assert cursor.execute("SELECT 1").fetchone() == (1,)
+        analitico._devolver_cursor(arquivo, cursor)
+        with pytest.raises(duckdb.Error):
+            arquivo.conexao.execute("SELECT 1")
+
+        analitico._devolver_cursor(arquivo_novo, cursor_novo)
+        assert arquivo_novo.conexao.execute("SELECT 1").fetchone() == (1,)
+        arquivo_novo.substituido = True
+        arquivo_novo.fechar_se_livre()
+    finally:
+        shutil.rmtree(diretorio_snapshot(nova, EXPORTACAO_DIR), ignore_errors=True)
+        os.remove(analitico.arquivo_analitico(nova, ANALISE_DUCKDB_DIR))
+
+def test_geracao_atual_exportada(geracao):
+    assert geracao == geracao_atual()[0]
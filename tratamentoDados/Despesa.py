@@ -1,84 +1,146 @@
+from functools import partial
+from sqlalchemy import delete, insert
 from sqlmodel import SQLModel, Session, select
 from database import engine
 import json
+import os
 import requests
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 
 from models.deputado import Deputado
 from models.despesa import Despesa
+from models.mandato_deputado import MandatoDeputado
+from log.logger_config import ProgressoLog, get_logger
+from tratamentoDados.checkpoints import PontoRetomada, unidade_ano
+from tratamentoDados.mapeamentos import COLUNAS_DESPESA, linhas_despesas, mapear_despesas_deputado
+from tratamentoDados.parametros import argumentos_ingest, executar_por_ano
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from tratamentoDados.transformacao import escrever_jsonl, transformar_arquivo
+from utils.legislaturas import legislatura_do_ano
+from utils.particoes import garantir_particao
+from utils.metricas import INGEST_REGISTROS, cronometrar_http, publicar_metricas_ingest
 
 app = SQLModel()
 
-def salvando_despesas_localmente_json():
-    # Primeiro é preciso carregar os deputados na memoria
-    with Session(engine) as session:
-        statement = select(Deputado)
-        deputados = session.exec(statement).all()
-    
-    despesas_completos = []
-
-    for i, deputado in enumerate(deputados):
-
-        print("Processando deputado:", deputado.nome_eleitoral, "I:", i)
-        # É preciso acessar a api das despesas do deputado
-        url = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{deputado.id_dados_abertos}/despesas?ano=2024&itens=1500"
-        response = requests.get(url, headers={"accept": "application/json"})
-        if response.status_code == 200:
-            dados = response.json().get("dados", [])
-        else:
-            print(f"Erro ao buscar despesas para deputado {deputado.nome}: {response.status_code}")
-            dados = []
-        despesas_completos.append({
-            "id_deputado": deputado.id,
-            "nome_deputado": deputado.nome_eleitoral,
-            "despesas": dados
-        })
-
-    # Salvar todas as despesas em um arquivo JSON
-    with open("data/despesas_deputados_2024.json", "w", encoding="utf-8") as f:
-        json.dump(despesas_completos, f, ensure_ascii=False, indent=2)
+logger = get_logger("ingest_despesa", "log/ingest.log", console=True)
+
+def arquivo_despesas(ano: int) -> str:
+    # JSON Lines: uma linha por deputado, para a transformação poder fatiar o arquivo
+    return f"data/despesas_deputados_{ano}.jsonl"
+
+def buscar_despesas_deputado(id_dados_abertos: int, ano: int) -> List[Dict]:
+    url = f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id_dados_abertos}/despesas?ano={ano}&itens=1500"
+    with cronometrar_http("despesa") as medicao:
+        response = requests.get(url, headers={"accept": "application/json"}, timeout=30)
+        medicao["status"] = response.status_code
+    response.raise_for_status()
+    dados = response.json().get("dados", [])
+    INGEST_REGISTROS.inc(len(dados), loader="despesa", resultado="buscado")
+    return dados
 
 def carregar_despesas_json(caminho_arquivo: str) -> List[Dict]:
     with open(caminho_arquivo, 'r', encoding='utf-8') as f:
         dados = json.load(f)
     return dados
 
-def main():
-    arquivo_json = 'data/despesas_deputados_2024.json'
-    despesas_base = carregar_despesas_json(arquivo_json)
-    
-    despesas_completas = []
-
-    for despesas_json in despesas_base:        
-        print("Processando despesa do deputado:", despesas_json.get('nome_deputado'))
-        
-        despesas = despesas_json.get('despesas')
-
-        for despesa in despesas:
-
-            print(despesa,  "\n\n")
-            # Cria uma instância de Despesa para cada item
-            despesa_combinado = Despesa(
-                id_deputado=despesas_json.get('id_deputado'),
-                ano=despesa.get('ano'),
-                mes=despesa.get('mes'),
-                tipo_despesa=despesa.get('tipoDespesa'),
-                valor_liquido=despesa.get('valorLiquido'),
-                tipo_documento=despesa.get('tipoDocumento'),
-                url_documento=despesa.get('urlDocumento'),
-                nome_fornecedor=despesa.get('nomeFornecedor')
-            )
-    
-            despesas_completas.append(despesa_combinado)
+def _converter_json_legado(ano: int):
+    """Converte o JSON do ano gravado por versões anteriores (uma lista só) para JSON Lines."""
+    legado = f"data/despesas_deputados_{ano}.json"
+    if os.path.exists(legado) and not os.path.exists(arquivo_despesas(ano)):
+        logger.info(f"Convertendo {legado} para {arquivo_despesas(ano)}.")
+        escrever_jsonl(arquivo_despesas(ano), sorted(carregar_despesas_json(legado), key=lambda item: item['id_deputado']))
+
+def _da_api(ano: int, deputados: List[Tuple], baixadas: List[Dict]) -> Iterator[Tuple[int, Optional[str], Optional[List[Tuple]]]]:
+    """Despesas de cada deputado buscadas na API; as de quem falhou saem como None."""
+    for id_deputado, id_dados_abertos, nome_deputado in deputados:
+        try:
+            despesas = buscar_despesas_deputado(id_dados_abertos, ano)
+        except Exception as e:
+            logger.error(f"Falha ao buscar as despesas de {ano} do deputado {nome_deputado or id_deputado}: {repr(e)}", exc_info=True)
+            yield id_deputado, nome_deputado, None
+            continue
+        baixadas.append({"id_deputado": id_deputado, "nome_deputado": nome_deputado, "despesas": despesas})
+        yield id_deputado, nome_deputado, linhas_despesas(id_deputado, ano, despesas)
+
+def processar_ano(ano: int) -> int:
+    """
+    Grava as despesas de um ano, deputado a deputado, a partir do arquivo local (se houver)
+    ou da API. O arquivo local é transformado em tuplas por vários processos
+    (`transformar_arquivo`); as da API, no próprio loader. Cada deputado tem as suas
+    despesas do ano substituídas numa transação que também grava a posição no checkpoint:
+    repetir a carga não duplica despesas e uma execução interrompida retoma do deputado
+    seguinte. Retorna o total gravado.
+    """
+    _converter_json_legado(ano)
+    local = os.path.exists(arquivo_despesas(ano))
 
     with Session(engine) as session:
-        for despesa in despesas_completas:
-            session.add(despesa)
-        
+        # A criação da partição trava a tabela-mãe: é confirmada antes da carga para não
+        # bloquear os outros anos até o fim deste
+        garantir_particao(session, "despesa", ano)
         session.commit()
+        deputados = []
+        if not local:
+            # Deputados com mandato no ano
+            deputados = session.exec(
+                select(Deputado.id, Deputado.id_dados_abertos, Deputado.nome_eleitoral)
+                .join(MandatoDeputado, MandatoDeputado.id_deputado == Deputado.id)
+                .where(MandatoDeputado.id_legislatura == legislatura_do_ano(ano))
+                .order_by(Deputado.id)
+            ).all()
+
+    total = 0
+    baixadas = []
+    retomada = PontoRetomada("despesa", unidade_ano(ano))
+    progresso = ProgressoLog(logger, f"Deputados processados ({ano})", len(deputados) or None)
+    if local:
+        # A posição é a linha do deputado no arquivo
+        registros = transformar_arquivo(arquivo_despesas(ano), partial(mapear_despesas_deputado, ano))
+    else:
+        # A posição é o id do deputado, percorridos sempre na mesma ordem
+        pendentes = [dep for dep in deputados if not retomada.ja_concluido(dep[0])]
+        progresso.avancar(len(deputados) - len(pendentes))
+        registros = _da_api(ano, pendentes, baixadas)
+    with Session(engine) as session:
+        for linha_arquivo, (id_deputado, nome_deputado, linhas) in enumerate(registros, start=1):
+            progresso.avancar()
+            posicao = linha_arquivo if local else id_deputado
+            if local and retomada.ja_concluido(posicao):
+                continue
+            if linhas is None:
+                retomada.falhar()
+                continue
+
+            try:
+                session.execute(delete(Despesa).where(Despesa.ano == ano, Despesa.id_deputado == id_deputado))
+                if linhas:
+                    session.execute(insert(Despesa), [dict(zip(COLUNAS_DESPESA, linha)) for linha in linhas])
+                retomada.concluir(session, posicao)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                retomada.falhar()
+                logger.error(f"Falha ao gravar as despesas de {ano} do deputado {nome_deputado or id_deputado}: {repr(e)}", exc_info=True)
+                continue
+
+            total += len(linhas)
+
+    progresso.concluir()
+    # Uma carga completa pela API deixa o arquivo do ano para as próximas execuções
+    if not local and not retomada.inicio and not retomada.falhas:
+        escrever_jsonl(arquivo_despesas(ano), baixadas)
+    retomada.finalizar()
+    INGEST_REGISTROS.inc(total, loader="despesa", resultado="inserido")
+    return total
+
+def main(anos: List[int], workers: int, legislatura: Optional[int] = None):
+    # Cada ano vai para a sua própria partição: os anos não disputam as mesmas páginas
+    executar_por_ano(processar_ano, anos, workers, logger)
+    publicar_metricas_ingest("despesa")
+    executar_pos_ingest("despesa")
 
-main()
+if __name__ == "__main__":
+    main(**vars(argumentos_ingest("Carga das despesas (CEAP) por ano.", legislatura=True, anos=True)))
 # [
 #   {
 #     "id_deputado": 220593,
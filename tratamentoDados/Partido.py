@@ -1,96 +1,98 @@
-from sqlmodel import SQLModel, Session
+from sqlmodel import SQLModel, Session, select
 from database import engine
 import json
-import requests
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
+from typing import List, Dict
 
 from models.partido import Partido
+from log.logger_config import get_logger
+from tratamentoDados.checkpoints import PontoRetomada, unidade_legislatura
+from tratamentoDados.detalhes import PARTIDO, buscar_detalhes
+from tratamentoDados.parametros import argumentos_ingest, baixar_se_ausente
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from utils.carga_bulk import upsert
+from utils.metricas import INGEST_REGISTROS, publicar_metricas_ingest
 
 app = SQLModel()
 
+logger = get_logger("ingest_partido", "log/ingest.log", console=True)
+
 def carregar_partidos_json(caminho_arquivo: str) -> List[Dict]:
     try:
         with open(caminho_arquivo, 'r', encoding='utf-8') as f:
             dados = json.load(f)
             return dados.get("dados", [])
     except FileNotFoundError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não foi encontrado.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não foi encontrado.")
         return []
     except json.JSONDecodeError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não é um JSON válido.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não é um JSON válido.")
         return []
 
-def buscar_detalhes_partido_xml(uri: str) -> Optional[Dict]:
-    try:
-        headers = {'accept': 'application/xml'}
-        response = requests.get(uri, headers=headers)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content) # root armazena todo o xml            
-       
-            dados = root.find('.//dados')
-            uri_logo = dados.findtext('urlLogo')
-            id_legislativo = dados.findtext('status/idLegislatura')
-            situacao = dados.findtext('status/situacao')
-            total_membros = dados.findtext('status/totalMembros')
-            total_posse_legislatura = dados.findtext('status/totalPosse')
-
-            detalhes = {
-                "uri_logo": uri_logo,
-                "id_legislativo": id_legislativo,
-                "situacao": situacao,
-                "total_membros": total_membros,
-                "total_posse_legislatura": total_posse_legislatura
-            }
-
-            return detalhes
-        else:
-            print(f"  - Falha ao buscar dados da URI {uri}. Status: {response.status_code}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"  - Erro de conexão ao acessar {uri}: {e}")
-        return None
-    except ET.ParseError:
-        print(f"  - Falha ao analisar o XML da URI {uri}.")
-        return None
-
-def main():
-    arquivo_json = 'data/partidos_57.json'
+def processar_legislatura(legislatura: int) -> int:
+    """
+    Grava os partidos da legislatura que ainda não estão na base. Retorna o total inserido.
+    Cada partido é confirmado com a posição no checkpoint: uma execução interrompida
+    retoma do seguinte, e os já gravados não são buscados de novo.
+    """
+    arquivo_json = f'data/partidos_{legislatura}.json'
+    baixar_se_ausente(arquivo_json, "/partidos", {"idLegislatura": legislatura, "itens": 100}, "partido", logger)
     partidos_base = carregar_partidos_json(arquivo_json)
     
     if not partidos_base:
-        return 
+        return 0
     
-    partidos_completos = []
+    inseridos = 0
+    retomada = PontoRetomada("partido", unidade_legislatura(legislatura))
+    with Session(engine) as session:
+        # Partidos já carregados por outra legislatura ou por uma execução anterior
+        existentes = set(session.exec(select(Partido.id_dados_abertos)).all())
 
-    for partido in partidos_base:        
-        uri_detalhes = partido.get('uri')
-        if not uri_detalhes:
-            print(f"{partido.get('id')} - URI não encontrada para este partido. Pulando.")
-            continue
-        
-        detalhes_json = buscar_detalhes_partido_xml(uri_detalhes)
-        
-        if detalhes_json:
-            partido_combinado = Partido(
-                id_dados_abertos=partido.get('id'),
-                sigla=partido.get("sigla"),
-                nome_completo=partido.get("nome"),
-                uri_logo=detalhes_json.get('uri_logo'),
-                id_legislativo=detalhes_json.get('id_legislativo'),
-                situacao=detalhes_json.get('situacao'),
-                total_membros=detalhes_json.get('total_membros'),
-                total_posse_legislatura=detalhes_json.get('total_posse_legislatura'),
-            )
-            partidos_completos.append(partido_combinado)
+        for posicao, partido in enumerate(partidos_base, start=1):
+            if retomada.ja_concluido(posicao) or partido.get('id') in existentes:
+                logger.debug(f"Partido {partido.get('sigla')} já existe no banco. Pulando inserção.")
+                INGEST_REGISTROS.inc(loader="partido", resultado="pulado")
+                continue
 
-    with Session(engine) as session:
-        for partido in partidos_completos:
-            session.add(partido)
-        
-        session.commit()
-        
-main()
+            uri_detalhes = partido.get('uri')
+            if not uri_detalhes:
+                # Falha do próprio arquivo da legislatura: uma nova tentativa leria a mesma lista
+                logger.warning(f"{partido.get('id')} - URI não encontrada para este partido. Pulando.")
+                INGEST_REGISTROS.inc(loader="partido", resultado="pulado")
+                continue
+            
+            detalhes_json = buscar_detalhes(uri_detalhes, PARTIDO, "partido", logger)
+            if not detalhes_json:
+                # A posição para de avançar e a unidade termina com erro, para ser refeita
+                INGEST_REGISTROS.inc(loader="partido", resultado="pulado")
+                retomada.falhar()
+                continue
+
+            INGEST_REGISTROS.inc(loader="partido", resultado="buscado")
+            # Conflito em qualquer chave única (id ou sigla) mantém o registro existente
+            gravados = upsert(session, Partido, {
+                "id_dados_abertos": partido.get('id'),
+                "sigla": partido.get("sigla"),
+                "nome_completo": partido.get("nome"),
+                "uri_logo": detalhes_json.get('uri_logo'),
+                "id_legislativo": detalhes_json.get('id_legislativo'),
+                "situacao": detalhes_json.get('situacao'),
+                "total_membros": detalhes_json.get('total_membros'),
+                "total_posse_legislatura": detalhes_json.get('total_posse_legislatura'),
+            }, chave=[], atualizar=[]).all()
+            inseridos += len(gravados)
+            retomada.concluir(session, posicao)
+            session.commit()
+
+    retomada.finalizar()
+    logger.info(f"{inseridos} partidos inseridos.")
+    INGEST_REGISTROS.inc(inseridos, loader="partido", resultado="inserido")
+    return inseridos
+
+def main(legislatura: int):
+    processar_legislatura(legislatura)
+    publicar_metricas_ingest("partido")
+    executar_pos_ingest("partido")
+
+if __name__ == "__main__":
+    main(**vars(argumentos_ingest("Carga dos partidos de uma legislatura.", legislatura=True)))
             
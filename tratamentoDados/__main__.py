@@ -0,0 +1,62 @@
+"""
+Carga completa, com as etapas executadas na ordem das dependências.
+
+Uso (a partir da raiz do projeto):
+
+    python -m tratamentoDados run [--legislatura 57] [--anos 2023-2024] [--etapas despesa voto_individual]
+    python -m tratamentoDados run --refazer        # ignora os checkpoints da execução anterior
+    python -m tratamentoDados status
+"""
+import argparse
+import sys
+import time
+
+from sqlmodel import Session, select
+
+from config import INGEST_PROCESSOS, INGEST_TENTATIVAS, INGEST_WORKERS_POR_ANO
+from database import engine
+from models.checkpoint_ingest import CheckpointIngest
+from tratamentoDados.orquestrador import ETAPAS, executar, imprimir_relatorio
+from tratamentoDados.parametros import intervalo_anos
+from utils.legislaturas import ULTIMA_LEGISLATURA, anos_da_legislatura, legislatura_do_ano
+
+def main():
+    parser = argparse.ArgumentParser(description="Orquestrador da carga dos Dados Abertos da Câmara.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    run = comandos.add_parser("run")
+    run.add_argument("--legislatura", type=int, default=None, help="Padrão: a última; define os anos se --anos não for dado.")
+    run.add_argument("--anos", type=intervalo_anos, default=None, help="Ex: 2024, 2019-2024 ou 2015,2019.")
+    run.add_argument("--etapas", nargs="+", choices=list(ETAPAS), default=list(ETAPAS))
+    run.add_argument("--processos", type=int, default=INGEST_PROCESSOS, help="Etapas executadas ao mesmo tempo.")
+    run.add_argument("--workers", type=int, default=INGEST_WORKERS_POR_ANO, help="Anos processados em paralelo por etapa.")
+    run.add_argument("--tentativas", type=int, default=INGEST_TENTATIVAS)
+    run.add_argument("--refazer", action="store_true", help="Reprocessa também as unidades já concluídas.")
+    comandos.add_parser("status")
+    args = parser.parse_args()
+
+    if args.comando == "status":
+        with Session(engine) as session:
+            checkpoints = session.exec(
+                select(CheckpointIngest).order_by(CheckpointIngest.etapa, CheckpointIngest.unidade)
+            ).all()
+        for c in checkpoints:
+            print(f"{c.etapa:<22}{c.unidade:<8}{c.status:<12}{c.registros or 0:>10}{c.tentativas:>4}"
+                  f"{c.duracao_s:>10.1f}s  {c.atualizado_em:%Y-%m-%d %H:%M}")
+        return
+
+    if args.anos is None:
+        args.anos = anos_da_legislatura(args.legislatura or ULTIMA_LEGISLATURA)
+    # Sem --legislatura, as etapas por legislatura cobrem todas as dos anos pedidos
+    legislaturas = [args.legislatura] if args.legislatura else sorted({legislatura_do_ano(ano) for ano in args.anos})
+
+    inicio = time.perf_counter()
+    relatorio = executar(
+        args.etapas, {"ano": args.anos, "legislatura": legislaturas},
+        args.processos, args.workers, args.tentativas, refazer=args.refazer,
+    )
+    imprimir_relatorio(relatorio, time.perf_counter() - inicio)
+    if any(resumo["status"] in ("falhou", "pulada") for resumo in relatorio.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
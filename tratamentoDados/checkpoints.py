@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from database import engine
+from models.checkpoint_ingest import CheckpointIngest
+from utils.carga_bulk import upsert
+
+def unidade_ano(ano: int) -> str:
+    return str(ano)
+
+def unidade_legislatura(legislatura: int) -> str:
+    return f"L{legislatura}"
+
+class PontoRetomada:
+    """
+    Progresso de um loader dentro de uma unidade (um ano ou uma legislatura), gravado em
+    `CheckpointIngest.posicao` na mesma transação dos dados de cada item: se a carga cair,
+    a próxima execução continua depois do último item confirmado em vez de buscar tudo de
+    novo. Depois da primeira falha a posição para de avançar, para que a próxima tentativa
+    refaça os itens que falharam (as gravações são upserts, repetir um item é inofensivo).
+    """
+
+    def __init__(self, etapa: str, unidade: str):
+        self.etapa, self.unidade = etapa, unidade
+        with Session(engine) as session:
+            self.inicio = session.exec(
+                select(CheckpointIngest.posicao).where(CheckpointIngest.etapa == etapa, CheckpointIngest.unidade == unidade)
+            ).first() or 0
+        self.posicao = self.inicio
+        self.falhas = 0
+
+    def ja_concluido(self, posicao: int) -> bool:
+        return posicao <= self.inicio
+
+    def concluir(self, session: Session, posicao: int):
+        """Marca o item `posicao` como concluído; deve ser chamada antes do commit dos dados dele."""
+        if not self.falhas:
+            self.posicao = posicao
+            self._gravar(session, posicao, "em_andamento")
+
+    def falhar(self):
+        self.falhas += 1
+
+    def finalizar(self):
+        """
+        Fecha a unidade: sem falhas, marca-a como concluída e zera a posição (uma nova carga
+        da unidade começa do início); com falhas, levanta um erro para que a unidade seja
+        tentada de novo.
+        """
+        if self.falhas:
+            raise RuntimeError(
+                f"{self.etapa} {self.unidade}: {self.falhas} item(ns) com falha; a próxima execução retoma após a posição {self.posicao}."
+            )
+        with Session(engine) as session:
+            self._gravar(session, None, "concluida")
+            session.commit()
+
+    def _gravar(self, session: Session, posicao: Optional[int], status: str):
+        upsert(session, CheckpointIngest, {
+            "etapa": self.etapa,
+            "unidade": self.unidade,
+            "status": status,
+            "posicao": posicao,
+            "tentativas": 0,
+            "duracao_s": 0.0,
+            "atualizado_em": datetime.now(timezone.utc),
+        }, chave=["etapa", "unidade"], atualizar=["status", "posicao", "atualizado_em"])
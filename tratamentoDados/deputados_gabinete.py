@@ -1,137 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import or_, update
 from sqlmodel import SQLModel, Session, select
+from config import INGEST_WORKERS_DETALHES
 from database import engine
 import json
-import requests
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
+from typing import List, Dict, Tuple
 
 from models.deputado import Deputado
 from models.gabinete import Gabinete
+from models.mandato_deputado import MandatoDeputado
 from models.partido import Partido
+from log.logger_config import ProgressoLog, get_logger
+from tratamentoDados.checkpoints import PontoRetomada, unidade_legislatura
+from tratamentoDados.detalhes import DEPUTADO, buscar_detalhes
+from tratamentoDados.parametros import argumentos_ingest, baixar_se_ausente
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from utils.carga_bulk import upsert
+from utils.metricas import INGEST_REGISTROS, publicar_metricas_ingest
+from utils.projecao import extrair_aninhado
 
 app = SQLModel()
 
+logger = get_logger("ingest_deputados_gabinete", "log/ingest.log", console=True)
+
 def carregar_deputados_json(caminho_arquivo: str) -> List[Dict]:
     try:
         with open(caminho_arquivo, 'r', encoding='utf-8') as f:
             dados = json.load(f)
             return dados.get("dados", [])
     except FileNotFoundError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não foi encontrado.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não foi encontrado.")
         return []
     except json.JSONDecodeError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não é um JSON válido.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não é um JSON válido.")
         return []
 
-def buscar_detalhes_deputado_xml(uri: str) -> Optional[Dict]:
-    try:
-        headers = {'accept': 'application/xml'}
-        response = requests.get(uri, headers=headers)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)        
-       
-            # Dados do xml do deputado
-            dados = root.find('.//dados')
-            nome_civil = dados.findtext('nomeCivil')
-            nome_eleitoral = dados.findtext('ultimoStatus/nomeEleitoral')
-            sexo = dados.findtext('sexo')
-            sigla_partido = dados.findtext('ultimoStatus/siglaPartido')
-
-            # Dados do gabinete do deputado
-            gab_nome = dados.findtext('ultimoStatus/gabinete/nome')
-            gab_predio = dados.findtext('ultimoStatus/gabinete/predio')
-            gab_sala = dados.findtext('ultimoStatus/gabinete/sala')
-            gab_andar = dados.findtext('ultimoStatus/gabinete/andar')
-            gab_telefone = dados.findtext('ultimoStatus/gabinete/telefone')
-            gab_email = dados.findtext('ultimoStatus/gabinete/email')
-            
-            detalhes = {
-                "nome_civil": nome_civil,
-                "nome_eleitoral": nome_eleitoral,
-                "sexo": sexo,
-                "sigla_partido": sigla_partido,
-                "gabinete": {
-                    "nome": gab_nome,
-                    "predio": gab_predio,
-                    "sala": gab_sala,
-                    "andar": gab_andar,
-                    "telefone": gab_telefone,
-                    "email": gab_email
-                }
-            }
-
-            return detalhes
+TAMANHO_BLOCO = 100
+
+def _linha_mandato(id_deputado: int, deputado: Dict, legislatura: int, partidos: Dict[str, int]) -> Dict:
+    """Mandato do deputado na legislatura, com o partido e a UF daquela legislatura."""
+    return {
+        "id_deputado": id_deputado,
+        "id_legislatura": legislatura,
+        "sigla_partido": deputado.get('siglaPartido'),
+        "sigla_uf": deputado.get('siglaUf'),
+        "id_partido": partidos.get(deputado.get('siglaPartido')),
+    }
+
+def _linha_deputado(deputado: Dict, detalhes: Dict, partidos: Dict[str, int]) -> Dict:
+    return {
+        "id_dados_abertos": deputado.get('id'),
+        "nome_civil": detalhes.get('nome_civil'),
+        "nome_eleitoral": detalhes.get('nome_eleitoral'),
+        "sigla_partido": detalhes.get("sigla_partido"),
+        # Partidos extintos podem não estar na base
+        "id_partido": partidos.get(detalhes.get("sigla_partido")),
+        "sigla_uf": deputado.get('siglaUf'),
+        "sexo": detalhes.get('sexo'),
+        "id_legislativo": deputado.get('idLegislatura'),
+        "url_foto": deputado.get('urlFoto'),
+    }
+
+def _buscar_detalhes_bloco(executor: ThreadPoolExecutor, deputados: List[Dict]) -> Tuple[Dict[int, Dict], int]:
+    """
+    Busca em paralelo os detalhes dos deputados. Retorna os detalhes por id e quantas
+    buscas falharam; os deputados sem URI só são pulados (uma nova tentativa leria a
+    mesma lista).
+    """
+    com_uri = []
+    for deputado in deputados:
+        if deputado.get('uri'):
+            com_uri.append(deputado)
         else:
-            print(f"  - Falha ao buscar dados da URI {uri}. Status: {response.status_code}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"  - Erro de conexão ao acessar {uri}: {e}")
-        return None
-    except ET.ParseError:
-        print(f"  - Falha ao analisar o XML da URI {uri}.")
-        return None
-
-def main():
-    arquivo_json = 'data/deputados_57.json'
-    deputados_base = carregar_deputados_json(arquivo_json)
-    
+            logger.warning(f"{deputado.get('id')} - URI não encontrada para este deputado. Pulando.")
+    resultados = executor.map(lambda dep: buscar_detalhes(dep['uri'], DEPUTADO, "deputados_gabinete", logger), com_uri)
+    detalhes = {dep['id']: resultado for dep, resultado in zip(com_uri, resultados) if resultado}
+    INGEST_REGISTROS.inc(len(detalhes), loader="deputados_gabinete", resultado="buscado")
+    INGEST_REGISTROS.inc(len(deputados) - len(detalhes), loader="deputados_gabinete", resultado="pulado")
+    return detalhes, len(com_uri) - len(detalhes)
+
+def _gravar_bloco(
+    session: Session, bloco: List[Dict], detalhes: Dict[int, Dict], legislatura: int,
+    partidos: Dict[str, int], existentes: Dict[int, int],
+) -> int:
+    """
+    Grava os deputados novos do bloco e os seus gabinetes (um upsert para cada tabela) e
+    os mandatos de todos. Atualiza `existentes` com os ids gerados e retorna quantos
+    deputados foram inseridos.
+    """
+    ja_existentes = [existentes[dep['id']] for dep in bloco if dep['id'] in existentes]
+    if ja_existentes:
+        session.execute(
+            update(Deputado)
+            .where(Deputado.id.in_(ja_existentes), or_(Deputado.id_legislativo.is_(None), Deputado.id_legislativo < legislatura))
+            .values(id_legislativo=legislatura)
+        )
+        INGEST_REGISTROS.inc(len(ja_existentes), loader="deputados_gabinete", resultado="pulado")
+
+    novos = [dep for dep in bloco if dep['id'] in detalhes and dep['id'] not in existentes]
+    if novos:
+        ids = upsert(
+            session, Deputado, [_linha_deputado(dep, detalhes[dep['id']], partidos) for dep in novos],
+            chave=["id_dados_abertos"], retornar=("id_dados_abertos", "id"),
+        ).all()
+        existentes.update(dict(ids))
+
+        gabinetes = []
+        for dep in novos:
+            gabinete = extrair_aninhado(detalhes[dep['id']], "gabinete_")["gabinete"] or {}
+            # Deputados sem exercício (vacância, licença) vêm sem gabinete
+            if not gabinete.get('sala'):
+                logger.debug(f"Deputado {dep['id']} sem gabinete informado.")
+                continue
+            gabinetes.append({"id_deputado": existentes[dep['id']], **gabinete})
+        if gabinetes:
+            upsert(session, Gabinete, gabinetes, chave=["id_deputado"])
+
+    mandatos = {
+        dep['id']: _linha_mandato(existentes[dep['id']], dep, legislatura, partidos)
+        for dep in bloco if dep['id'] in existentes
+    }
+    if mandatos:
+        upsert(session, MandatoDeputado, list(mandatos.values()), chave=["id_deputado", "id_legislatura"])
+    return len(novos)
+
+def processar_legislatura(legislatura: int, workers: int = INGEST_WORKERS_DETALHES) -> int:
+    """
+    Grava os deputados da legislatura e os seus mandatos. Retorna o total de deputados novos.
+
+    Os ids já gravados e o mapa sigla -> partido são lidos uma vez; os detalhes dos
+    deputados novos são buscados em paralelo (`workers` requisições simultâneas) e
+    gravados em blocos de `TAMANHO_BLOCO`, cada um confirmado com a posição no checkpoint;
+    se a busca de algum deputado falhar, a posição para de avançar e a unidade termina com
+    erro, para ser refeita. A gravação é por upsert na chave dos Dados Abertos: repetir a carga não duplica nada
+    e uma execução interrompida retoma do bloco seguinte.
+    """
+    arquivo_json = f'data/deputados_{legislatura}.json'
+    baixar_se_ausente(arquivo_json, "/deputados", {"idLegislatura": legislatura, "itens": 100}, "deputados_gabinete", logger)
+    deputados_base = [dep for dep in carregar_deputados_json(arquivo_json) if dep.get('id') is not None]
+
     if not deputados_base:
-        return 
+        return 0
 
+    inseridos = 0
+    retomada = PontoRetomada("deputados_gabinete", unidade_legislatura(legislatura))
+    progresso = ProgressoLog(logger, "Deputados processados", len(deputados_base))
     with Session(engine) as session:
-        for deputado in deputados_base:
-            #Print para indicar o progresso
-            print("Deputado: ", deputado.get('nome'), " id: ", deputado.get("id"))   
-
-            dep_existente_stmt = select(Deputado).where(Deputado.id_dados_abertos == deputado.get('id'))
-            dep_existente = session.exec(dep_existente_stmt).first()
-            if dep_existente:
-                print(f"Deputado {deputado.get('id')} já existe no banco. Pulando inserção.")
-                continue
-  
-            uri_detalhes = deputado.get('uri')
-            if not uri_detalhes:
-                print(f"{deputado.get(id)} - URI não encontrada para este deputado. Pulando.")
-                continue
-            
-            detalhes_json = buscar_detalhes_deputado_xml(uri_detalhes)
-            
-            if detalhes_json:
-               
-                partido_stmt = select(Partido).where(Partido.sigla == detalhes_json.get("sigla_partido"))
-                partido_no_db = session.exec(partido_stmt).first()
-
-                deputado_combinado = Deputado(
-                    id_dados_abertos=deputado.get('id'),
-                    nome_civil=detalhes_json.get('nome_civil'),
-                    nome_eleitoral=detalhes_json.get('nome_eleitoral'),
-                    sigla_partido=detalhes_json.get("sigla_partido"),
-                    id_partido= partido_no_db.id,
-                    sigla_uf=deputado.get('siglaUf'),
-                    sexo=detalhes_json.get('sexo'),
-                    id_legislativo=deputado.get('idLegislatura'),
-                    url_foto=deputado.get('urlFoto')
-                )
-
-                session.add(deputado_combinado)
-
-                gabinete = Gabinete(
-                    nome = detalhes_json.get('gabinete', {}).get('nome'),
-                    predio = detalhes_json.get('gabinete', {}).get('predio'),
-                    sala = detalhes_json.get('gabinete', {}).get('sala'),
-                    andar = detalhes_json.get('gabinete', {}).get('andar'),
-                    telefone = detalhes_json.get('gabinete', {}).get('telefone'),
-                    email = detalhes_json.get('gabinete', {}).get('email'),
-                    deputado=deputado_combinado
-                )
-                
-                session.add(gabinete)
-
-        session.commit()
-        print("Commit realizado com sucesso!")
+        partidos = {sigla: id_partido for sigla, id_partido in session.exec(select(Partido.sigla, Partido.id)).all()}
+        existentes = {id_dados_abertos: id_deputado for id_dados_abertos, id_deputado in session.exec(
+            select(Deputado.id_dados_abertos, Deputado.id)
+        ).all()}
+
+    sem_partido = {dep.get('siglaPartido') for dep in deputados_base} - set(partidos) - {None}
+    if sem_partido:
+        logger.warning(f"Partidos ausentes da base (deputados gravados sem id_partido): {', '.join(sorted(sem_partido))}.")
+
+    progresso.avancar(min(retomada.inicio, len(deputados_base)))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor, Session(engine) as session:
+        for inicio in range(retomada.inicio, len(deputados_base), TAMANHO_BLOCO):
+            # Um deputado pode aparecer mais de uma vez na lista (troca de partido)
+            bloco = list({dep['id']: dep for dep in deputados_base[inicio:inicio + TAMANHO_BLOCO]}.values())
+            detalhes, falhas = _buscar_detalhes_bloco(executor, [dep for dep in bloco if dep['id'] not in existentes])
+            inseridos += _gravar_bloco(session, bloco, detalhes, legislatura, partidos, existentes)
+            if falhas:
+                # O bloco é gravado sem eles, mas a posição para aqui e a unidade termina com
+                # erro: a próxima execução busca de novo os que falharam
+                logger.error(f"{falhas} deputado(s) do bloco iniciado na posição {inicio} sem detalhes; a legislatura será refeita a partir dele.")
+                retomada.falhar()
+            posicao = min(inicio + TAMANHO_BLOCO, len(deputados_base))
+            retomada.concluir(session, posicao)
+            session.commit()
+            progresso.avancar(posicao - inicio)
+
+        progresso.concluir()
+
+    retomada.finalizar()
+    INGEST_REGISTROS.inc(inseridos, loader="deputados_gabinete", resultado="inserido")
+    return inseridos
 
+def main(legislatura: int):
+    processar_legislatura(legislatura)
+    publicar_metricas_ingest("deputados_gabinete")
+    executar_pos_ingest("deputados_gabinete")
         
 
 
@@ -212,4 +262,5 @@ def main():
 # </xml>
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main(**vars(argumentos_ingest("Carga dos deputados de uma legislatura.", legislatura=True)))
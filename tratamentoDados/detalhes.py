@@ -0,0 +1,118 @@
+"""
+Leitura dos documentos de detalhe da API dos Dados Abertos (deputado, partido, votação e
+proposição): extrai só os campos que as cargas usam, de JSON (com orjson, se instalado)
+ou de XML. O padrão é JSON (`DETALHES_FORMATO`): nos documentos da API, de 1 a 4 KB, ele
+sai de 5 a 20 vezes mais rápido que o XML (ver `benchmarks/parse_detalhes.py`). No XML, o
+`ET.fromstring` + `findtext` (em C) ganhou do `iterparse`, cujo laço de eventos em Python
+custa mais do que montar a árvore de documentos tão pequenos.
+
+Cada documento é descrito por um `Documento`: os caminhos de cada campo dentro de `dados`,
+as listas a coletar e os campos numéricos (que no XML chegam como texto).
+"""
+import json
+import xml.etree.ElementTree as ET
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from config import DETALHES_FORMATO
+from utils.metricas import cronometrar_http
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele cai no json da biblioteca padrão
+    orjson = None
+
+FORMATOS = {"json": "application/json", "xml": "application/xml"}
+
+class Documento:
+    def __init__(self, campos: Dict[str, Tuple[str, ...]], listas: Optional[Dict[str, Tuple[str, str]]] = None, inteiros=()):
+        # campo -> caminho dentro de `dados`
+        self.campos = campos
+        # campo -> (lista dentro de `dados`, campo de cada item)
+        self.listas = listas or {}
+        self.inteiros = frozenset(inteiros)
+        # No XML os itens de uma lista repetem o nome dela: <lista><lista><id/></lista></lista>
+        self._caminhos_xml = {campo: "/".join(caminho) for campo, caminho in self.campos.items()}
+        self._listas_xml = {campo: (f"{lista}/{lista}", item) for campo, (lista, item) in self.listas.items()}
+
+    def de_json(self, conteudo: bytes) -> Dict:
+        dados = (orjson.loads(conteudo) if orjson else json.loads(conteudo)).get("dados") or {}
+        resultado = {}
+        for campo, caminho in self.campos.items():
+            valor = dados
+            for parte in caminho:
+                valor = valor.get(parte) if isinstance(valor, dict) else None
+            resultado[campo] = valor
+        for campo, (lista, item) in self.listas.items():
+            resultado[campo] = [str(elemento[item]) for elemento in dados.get(lista) or [] if elemento.get(item) is not None]
+        return self._converter(resultado)
+
+    def de_xml(self, conteudo: bytes) -> Dict:
+        dados = ET.fromstring(conteudo).find("dados")
+        if dados is None:
+            raise ValueError("documento sem o elemento <dados>")
+        resultado = {campo: dados.findtext(caminho) or None for campo, caminho in self._caminhos_xml.items()}
+        for campo, (caminho, item) in self._listas_xml.items():
+            resultado[campo] = [texto for texto in (elemento.findtext(item) for elemento in dados.iterfind(caminho)) if texto]
+        return self._converter(resultado)
+
+    def ler(self, conteudo: bytes, formato: str) -> Dict:
+        return self.de_xml(conteudo) if formato == "xml" else self.de_json(conteudo)
+
+    def _converter(self, resultado: Dict) -> Dict:
+        for campo in self.inteiros:
+            if resultado[campo] is not None:
+                resultado[campo] = int(resultado[campo])
+        return resultado
+
+DEPUTADO = Documento({
+    "nome_civil": ("nomeCivil",),
+    "nome_eleitoral": ("ultimoStatus", "nomeEleitoral"),
+    "sexo": ("sexo",),
+    "sigla_partido": ("ultimoStatus", "siglaPartido"),
+    "gabinete_nome": ("ultimoStatus", "gabinete", "nome"),
+    "gabinete_predio": ("ultimoStatus", "gabinete", "predio"),
+    "gabinete_sala": ("ultimoStatus", "gabinete", "sala"),
+    "gabinete_andar": ("ultimoStatus", "gabinete", "andar"),
+    "gabinete_telefone": ("ultimoStatus", "gabinete", "telefone"),
+    "gabinete_email": ("ultimoStatus", "gabinete", "email"),
+})
+
+PARTIDO = Documento({
+    "uri_logo": ("urlLogo",),
+    "id_legislativo": ("status", "idLegislatura"),
+    "situacao": ("status", "situacao"),
+    "total_membros": ("status", "totalMembros"),
+    "total_posse_legislatura": ("status", "totalPosse"),
+}, inteiros=("id_legislativo", "total_membros", "total_posse_legislatura"))
+
+VOTACAO = Documento({}, listas={"proposicoes_afetadas_ids": ("proposicoesAfetadas", "id")})
+
+PROPOSICAO = Documento({
+    "id": ("id",),
+    "sigla_tipo": ("siglaTipo",),
+    "ano": ("ano",),
+    "ementa": ("ementa",),
+    "data_apresentacao": ("dataApresentacao",),
+    "status": ("statusProposicao", "descricaoSituacao"),
+    "url_inteiro_teor": ("urlInteiroTeor",),
+}, inteiros=("id", "ano"))
+
+def buscar_detalhes(uri: str, documento: Documento, loader: str, logger, formato: str = DETALHES_FORMATO) -> Optional[Dict]:
+    """
+    Busca o detalhe em `uri` no formato configurado e extrai os campos do `documento`.
+    Retorna None (com o erro no log) se a requisição ou a leitura falharem.
+    """
+    try:
+        with cronometrar_http(loader) as medicao:
+            response = requests.get(uri, headers={"accept": FORMATOS[formato]}, timeout=15)
+            medicao["status"] = response.status_code
+        response.raise_for_status()
+        return documento.ler(response.content, formato)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Erro de conexão ao acessar {uri}: {e}")
+    except (ET.ParseError, ValueError) as e:
+        # orjson.JSONDecodeError e json.JSONDecodeError são subclasses de ValueError
+        logger.error(f"Falha ao ler o {formato.upper()} da URI {uri}: {e}")
+    return None
@@ -0,0 +1,30 @@
+"""
+Conversão dos registros dos arquivos locais em tuplas prontas para o INSERT. Fica fora
+dos loaders, sem dependências do banco nem da aplicação, porque roda nos processos da
+etapa de transformação (`tratamentoDados.transformacao`), que importam só este módulo.
+"""
+from typing import Dict, List, Optional, Tuple
+
+# Colunas das tuplas de despesa, na ordem do INSERT
+COLUNAS_DESPESA = (
+    "id_deputado", "ano", "mes", "tipo_despesa", "valor_liquido", "tipo_documento", "url_documento", "nome_fornecedor",
+)
+
+def linhas_despesas(id_deputado: int, ano: int, despesas: List[Dict]) -> List[Tuple]:
+    return [
+        (
+            id_deputado,
+            ano,
+            despesa.get('mes'),
+            despesa.get('tipoDespesa'),
+            despesa.get('valorLiquido'),
+            despesa.get('tipoDocumento'),
+            despesa.get('urlDocumento'),
+            despesa.get('nomeFornecedor'),
+        )
+        for despesa in despesas
+    ]
+
+def mapear_despesas_deputado(ano: int, registro: Dict) -> Tuple[int, Optional[str], List[Tuple]]:
+    """Registro do arquivo do ano (um deputado) -> (id do deputado, nome, tuplas das despesas)."""
+    return registro['id_deputado'], registro.get('nome_deputado'), linhas_despesas(registro['id_deputado'], ano, registro.get('despesas') or [])
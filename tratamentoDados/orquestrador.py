@@ -0,0 +1,166 @@
+import importlib
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Dict, List, Set
+
+from sqlmodel import Session, select
+
+from database import engine
+from log.logger_config import get_logger
+from models.checkpoint_ingest import CheckpointIngest
+from tratamentoDados.checkpoints import unidade_ano, unidade_legislatura
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from utils.metricas import publicar_metricas_ingest
+
+logger = get_logger("ingest_orquestrador", "log/ingest.log", console=True)
+
+# Grafo da carga: etapa -> (módulo do loader, unidade de trabalho, etapas das quais depende).
+# Os loaders por legislatura expõem `processar_legislatura` e os anuais `processar_ano`.
+# Despesas e sessões não dependem uma da outra e rodam ao mesmo tempo.
+ETAPAS = {
+    "partido": ("tratamentoDados.Partido", "legislatura", ()),
+    "deputados_gabinete": ("tratamentoDados.deputados_gabinete", "legislatura", ("partido",)),
+    "sessao_proposicao": ("tratamentoDados.sessao_proposicao", "ano", ()),
+    "despesa": ("tratamentoDados.Despesa", "ano", ("deputados_gabinete",)),
+    "voto_individual": ("tratamentoDados.voto_individual", "ano", ("deputados_gabinete", "sessao_proposicao")),
+}
+
+def rotulo_unidade(etapa: str, valor: int) -> str:
+    return unidade_legislatura(valor) if ETAPAS[etapa][1] == "legislatura" else unidade_ano(valor)
+
+def _salvar_checkpoint(etapa: str, unidade: str, resultado: Dict):
+    with Session(engine) as session:
+        checkpoint = session.exec(
+            select(CheckpointIngest).where(CheckpointIngest.etapa == etapa, CheckpointIngest.unidade == unidade)
+        ).first() or CheckpointIngest(etapa=etapa, unidade=unidade)
+        for campo, valor in resultado.items():
+            setattr(checkpoint, campo, valor)
+        checkpoint.atualizado_em = datetime.now(timezone.utc)
+        session.add(checkpoint)
+        session.commit()
+
+def _executar_unidade(etapa: str, funcao, valor: int, tentativas: int) -> Dict:
+    """Processa uma unidade com novas tentativas (espera exponencial) e grava o checkpoint dela."""
+    unidade = rotulo_unidade(etapa, valor)
+    inicio = time.perf_counter()
+    resultado = {"status": "falhou", "registros": None, "erro": None}
+    for tentativa in range(1, tentativas + 1):
+        resultado["tentativas"] = tentativa
+        try:
+            resultado.update(status="concluida", registros=funcao(valor), erro=None)
+            break
+        except Exception as e:
+            resultado["erro"] = repr(e)
+            logger.warning(f"{etapa} {unidade}: tentativa {tentativa}/{tentativas} falhou: {repr(e)}", exc_info=True)
+            if tentativa < tentativas:
+                time.sleep(2 ** tentativa)
+    resultado["duracao_s"] = round(time.perf_counter() - inicio, 3)
+    _salvar_checkpoint(etapa, unidade, resultado)
+    return resultado
+
+def executar_etapa(etapa: str, valores: List[int], workers: int, tentativas: int) -> Dict[str, Dict]:
+    """
+    Roda no processo da etapa: processa as unidades pendentes (anos em paralelo, até
+    `workers` threads) e devolve o resultado de cada uma.
+    """
+    modulo, tipo, _ = ETAPAS[etapa]
+    loader = importlib.import_module(modulo)
+    funcao = loader.processar_ano if tipo == "ano" else loader.processar_legislatura
+    # As legislaturas vão em sequência: duas delas podem trazer o mesmo deputado ou partido
+    threads = max(1, min(workers, len(valores))) if tipo == "ano" else 1
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        resultados = executor.map(lambda valor: _executar_unidade(etapa, funcao, valor, tentativas), valores)
+        por_unidade = {rotulo_unidade(etapa, valor): resultado for valor, resultado in zip(valores, resultados)}
+    publicar_metricas_ingest(etapa)
+    return por_unidade
+
+def _ja_concluidas(etapa: str, unidades: List[str]) -> Set[str]:
+    with Session(engine) as session:
+        return set(session.exec(
+            select(CheckpointIngest.unidade).where(
+                CheckpointIngest.etapa == etapa,
+                CheckpointIngest.unidade.in_(unidades),
+                CheckpointIngest.status == "concluida",
+            )
+        ).all())
+
+def _resumo(status: str, unidades: Dict[str, Dict], puladas: int, duracao_s: float) -> Dict:
+    return {
+        "status": status,
+        "unidades": f"{sum(u['status'] == 'concluida' for u in unidades.values()) + puladas}/{len(unidades) + puladas}",
+        "registros": sum(u.get("registros") or 0 for u in unidades.values()),
+        "tentativas": sum(u.get("tentativas", 0) for u in unidades.values()),
+        "duracao_s": round(duracao_s, 1),
+    }
+
+def executar(
+    etapas: List[str], valores: Dict[str, List[int]], processos: int, workers: int, tentativas: int, refazer: bool = False
+) -> Dict[str, Dict]:
+    """
+    Executa as `etapas` pedidas respeitando as dependências entre elas: cada etapa vai para
+    um processo assim que as suas dependências terminam, até `processos` ao mesmo tempo.
+    Unidades já concluídas numa execução anterior são puladas (a menos que `refazer`), e a
+    falha de uma etapa só impede as que dependem dela. `valores` traz, por tipo de
+    unidade ('ano' ou 'legislatura'), o que processar. Retorna o resumo por etapa.
+    """
+    pendentes = [etapa for etapa in ETAPAS if etapa in etapas]
+    concluidas: Set[str] = set()
+    falhas: Set[str] = set()
+    relatorio: Dict[str, Dict] = {}
+
+    # spawn: cada processo abre o seu próprio pool de conexões em vez de herdar o do pai
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, processos), mp_context=contexto) as executor:
+        em_andamento = {}
+        while pendentes or em_andamento:
+            for etapa in list(pendentes):
+                dependencias = [d for d in ETAPAS[etapa][2] if d in etapas]
+                if any(d in falhas for d in dependencias):
+                    pendentes.remove(etapa)
+                    falhas.add(etapa)
+                    relatorio[etapa] = _resumo("pulada", {}, 0, 0.0)
+                    logger.warning(f"Etapa {etapa} não executada: uma dependência falhou.")
+                elif all(d in concluidas for d in dependencias):
+                    pendentes.remove(etapa)
+                    todos = valores[ETAPAS[etapa][1]]
+                    feitas = set() if refazer else _ja_concluidas(etapa, [rotulo_unidade(etapa, v) for v in todos])
+                    a_fazer = [v for v in todos if rotulo_unidade(etapa, v) not in feitas]
+                    if not a_fazer:
+                        concluidas.add(etapa)
+                        relatorio[etapa] = _resumo("checkpoint", {}, len(feitas), 0.0)
+                        logger.info(f"Etapa {etapa} já concluída em execução anterior; pulando.")
+                        continue
+                    logger.info(f"Etapa {etapa} iniciada: {', '.join(rotulo_unidade(etapa, v) for v in a_fazer)}.")
+                    futuro = executor.submit(executar_etapa, etapa, a_fazer, workers, tentativas)
+                    em_andamento[futuro] = (etapa, len(feitas), time.perf_counter())
+
+            if not em_andamento:
+                continue
+            terminados, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                etapa, puladas, inicio = em_andamento.pop(futuro)
+                try:
+                    unidades = futuro.result()
+                except Exception as e:
+                    # O processo da etapa morreu: nenhuma unidade tem resultado confiável
+                    logger.error(f"Processo da etapa {etapa} falhou: {repr(e)}", exc_info=True)
+                    unidades = {}
+                sucesso = bool(unidades) and all(u["status"] == "concluida" for u in unidades.values())
+                (concluidas if sucesso else falhas).add(etapa)
+                relatorio[etapa] = _resumo("concluida" if sucesso else "falhou", unidades, puladas, time.perf_counter() - inicio)
+                logger.info(f"Etapa {etapa}: {relatorio[etapa]['status']} em {relatorio[etapa]['duracao_s']}s.")
+
+    if any(resumo["status"] == "concluida" for resumo in relatorio.values()):
+        executar_pos_ingest("orquestrador")
+    return relatorio
+
+def imprimir_relatorio(relatorio: Dict[str, Dict], duracao_total_s: float):
+    print(f"\n{'etapa':<22}{'status':<12}{'unidades':>10}{'registros':>12}{'tentativas':>12}{'duração (s)':>13}")
+    for etapa in ETAPAS:
+        if etapa in relatorio:
+            r = relatorio[etapa]
+            print(f"{etapa:<22}{r['status']:<12}{r['unidades']:>10}{r['registros']:>12}{r['tentativas']:>12}{r['duracao_s']:>13}")
+    soma = sum(r["duracao_s"] for r in relatorio.values())
+    print(f"\nTempo total: {duracao_total_s:.1f}s (soma das etapas: {soma:.1f}s)")
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from config import ANO_REFERENCIA, INGEST_WORKERS_POR_ANO
+from utils.legislaturas import ULTIMA_LEGISLATURA, anos_da_legislatura
+from utils.metricas import cronometrar_http
+
+URL_API = "https://dadosabertos.camara.leg.br/api/v2"
+
+def intervalo_anos(texto: str) -> List[int]:
+    """Converte '2019-2024', '2019,2021' ou '2024' na lista de anos."""
+    anos = set()
+    for parte in texto.split(","):
+        inicio, _, fim = parte.strip().partition("-")
+        anos.update(range(int(inicio), int(fim or inicio) + 1))
+    return sorted(anos)
+
+def argumentos_ingest(descricao: str, legislatura: bool = False, anos: bool = False) -> argparse.Namespace:
+    """
+    Argumentos comuns das cargas. `--anos` aceita intervalos (ex: 1995-2024); `--legislatura`
+    sozinha também define os anos (os 4 da legislatura).
+    """
+    parser = argparse.ArgumentParser(description=descricao)
+    if legislatura:
+        parser.add_argument("--legislatura", type=int, default=None if anos else ULTIMA_LEGISLATURA)
+    if anos:
+        parser.add_argument("--anos", type=intervalo_anos, default=None, help="Ex: 2024, 2019-2024 ou 2015,2019.")
+        parser.add_argument("--workers", type=int, default=INGEST_WORKERS_POR_ANO, help="Anos processados em paralelo.")
+    args = parser.parse_args()
+
+    if anos and args.anos is None:
+        args.anos = anos_da_legislatura(args.legislatura) if getattr(args, "legislatura", None) else [ANO_REFERENCIA]
+    return args
+
+def executar_por_ano(funcao: Callable[[int], int], anos: List[int], workers: int, logger) -> Dict[int, Optional[int]]:
+    """
+    Executa `funcao(ano)` para cada ano em paralelo (uma thread por ano, até `workers`).
+    Cada ano é independente: a falha de um é registrada e não interrompe os demais.
+    Retorna o resultado por ano (None nos que falharam).
+    """
+    resultados: Dict[int, Optional[int]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(anos)))) as executor:
+        futuros = {executor.submit(funcao, ano): ano for ano in anos}
+        for futuro in as_completed(futuros):
+            ano = futuros[futuro]
+            try:
+                resultados[ano] = futuro.result()
+                logger.info(f"Ano {ano} concluído: {resultados[ano]} registros.")
+            except Exception as e:
+                resultados[ano] = None
+                logger.error(f"Falha ao processar o ano {ano}: {repr(e)}", exc_info=True)
+    return resultados
+
+def listar_api(caminho: str, params: Dict, loader: str) -> List[Dict]:
+    """Busca todas as páginas de uma listagem da API dos Dados Abertos (segue os links `next`)."""
+    url, itens = f"{URL_API}{caminho}", []
+    while url:
+        with cronometrar_http(loader) as medicao:
+            response = requests.get(url, params=params, headers={"accept": "application/json"}, timeout=30)
+            medicao["status"] = response.status_code
+        response.raise_for_status()
+        corpo = response.json()
+        itens.extend(corpo.get("dados", []))
+        # O link `next` já traz os parâmetros da próxima página
+        url = next((link["href"] for link in corpo.get("links", []) if link.get("rel") == "next"), None)
+        params = None
+    return itens
+
+def baixar_se_ausente(arquivo: str, caminho: str, params: Dict, loader: str, logger):
+    """
+    Garante o JSON local de uma listagem da API (formato `{"dados": [...]}`, o mesmo dos
+    arquivos em data/): se ele não existir, baixa todas as páginas e salva.
+    """
+    if os.path.exists(arquivo):
+        return
+    logger.info(f"'{arquivo}' não encontrado; baixando {caminho} da API.")
+    dados = listar_api(caminho, params, loader)
+    os.makedirs(os.path.dirname(arquivo) or ".", exist_ok=True)
+    with open(arquivo, "w", encoding="utf-8") as f:
+        json.dump({"dados": dados}, f, ensure_ascii=False)
@@ -0,0 +1,97 @@
+"""
+Manutenção das partições anuais de `despesa` e `votoindividual`.
+
+Uso (a partir da raiz do projeto):
+
+    python -m tratamentoDados.particoes listar
+    python -m tratamentoDados.particoes criar 2026 2027
+    python -m tratamentoDados.particoes arquivar --legislatura 55 [--remover]
+    python -m tratamentoDados.particoes verificar --ano 2024
+"""
+import argparse
+import sys
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from config import ANO_REFERENCIA
+from database import engine
+from log.logger_config import get_logger
+from models.deputado import Deputado
+from models.despesa import Despesa
+from models.partido import Partido
+from models.voto_individual import VotoIndividual
+from utils.legislaturas import anos_da_legislatura
+from utils.particoes import (
+    TABELAS_PARTICIONADAS, arquivar_particao, garantir_particoes, listar_particoes, particoes_lidas,
+)
+
+logger = get_logger("ingest_particoes", "log/ingest.log", console=True)
+
+def consultas_por_ano(ano: int):
+    """Formas das consultas analíticas filtradas por ano: cada uma deve ler uma partição por tabela."""
+    return {
+        "despesas por UF": (
+            select(Deputado.sigla_uf, func.sum(Despesa.valor_liquido))
+            .join(Despesa, Despesa.id_deputado == Deputado.id)
+            .where(Despesa.ano == ano)
+            .group_by(Deputado.sigla_uf)
+        ),
+        "despesas de um deputado": select(Despesa.id).where(Despesa.ano == ano, Despesa.id_deputado == 1),
+        "votos por partido": (
+            select(Partido.sigla, func.count(VotoIndividual.id))
+            .join(Partido, Partido.id == VotoIndividual.id_partido)
+            .where(VotoIndividual.ano == ano)
+            .group_by(Partido.sigla)
+        ),
+    }
+
+def verificar(session: Session, ano: int) -> bool:
+    ok = True
+    for nome, statement in consultas_por_ano(ano).items():
+        sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+        lidas = particoes_lidas(session, sql)
+        podada = all(particao.endswith(f"_{ano}") for particao in lidas)
+        ok = ok and podada
+        logger.info(f"{nome}: {'OK' if podada else 'SEM PODA'} — partições lidas: {', '.join(sorted(lidas)) or 'nenhuma'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Partições anuais de despesa e votoindividual.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("listar")
+    criar = comandos.add_parser("criar")
+    criar.add_argument("anos", type=int, nargs="+")
+    arquivar = comandos.add_parser("arquivar")
+    alvo = arquivar.add_mutually_exclusive_group(required=True)
+    alvo.add_argument("--legislatura", type=int)
+    alvo.add_argument("--ano", type=int, nargs="+")
+    arquivar.add_argument("--remover", action="store_true", help="Descarta as partições em vez de movê-las para o schema de arquivo.")
+    verificacao = comandos.add_parser("verificar")
+    verificacao.add_argument("--ano", type=int, default=ANO_REFERENCIA)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.comando == "listar":
+            for tabela in TABELAS_PARTICIONADAS:
+                for nome, linhas in listar_particoes(session, tabela):
+                    print(f"{nome:<24}{linhas:>14}")
+        elif args.comando == "criar":
+            garantir_particoes(session, args.anos)
+            session.commit()
+            logger.info(f"Partições garantidas para {args.anos}.")
+        elif args.comando == "arquivar":
+            anos = anos_da_legislatura(args.legislatura) if args.legislatura else args.ano
+            existentes = {nome for tabela in TABELAS_PARTICIONADAS for nome, _ in listar_particoes(session, tabela)}
+            for ano in anos:
+                for tabela in TABELAS_PARTICIONADAS:
+                    if f"{tabela}_{ano}" in existentes:
+                        arquivar_particao(session, tabela, ano, remover=args.remover)
+                        logger.info(f"{tabela}_{ano} {'removida' if args.remover else 'arquivada'}.")
+            session.commit()
+        elif args.comando == "verificar":
+            if not verificar(session, args.ano):
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from sqlmodel import Session
+
+from config import ANALISE_BACKEND, EXPORTACAO_APOS_INGEST
+from database import engine
+from log.logger_config import get_logger
+from utils.analitico import sincronizar
+from utils.dashboard import publicar_snapshot
+from utils.exportacao import exportar
+from utils.geracao import nova_geracao
+from utils.mais_votadas import atualizar_mais_votadas
+from utils.particoes import preparar_proximo_ano
+from utils.perfil_andar import atualizar_perfil_andar
+
+logger = get_logger("ingest_pos_ingest", "log/ingest.log", console=True)
+
+def executar_pos_ingest(origem: str):
+    """
+    Etapas executadas ao fim de cada carga: recalcula o cubo das análises por andar e o
+    ranking das proposições mais votadas, registra uma nova geração de ingestão (o que
+    invalida os ETags das rotas de leitura), cria com antecedência as partições do próximo
+    ano e recalcula o snapshot do dashboard servido em `/dashboard/snapshot`. Com
+    EXPORTACAO_APOS_INGEST, exporta também o snapshot em Parquet da nova geração, e com
+    ANALISE_BACKEND=duckdb monta o arquivo analítico do último snapshot.
+    """
+    # Antes da nova geração, para que as respostas cacheadas com o novo ETag já usem as tabelas novas
+    for nome, atualizar in (("cubo por andar", atualizar_perfil_andar), ("ranking das mais votadas", atualizar_mais_votadas)):
+        try:
+            with Session(engine) as session:
+                linhas = atualizar(session)
+                session.commit()
+            logger.info(f"{nome.capitalize()} recalculado: {linhas} linhas.")
+        except Exception as e:
+            logger.error(f"Falha ao recalcular o {nome} após '{origem}': {repr(e)}", exc_info=True)
+
+    with Session(engine) as session:
+        id_geracao = nova_geracao(session, origem).id
+        preparar_proximo_ano(session)
+        session.commit()
+    logger.info(f"Geração de ingestão {id_geracao} registrada por '{origem}'.")
+
+    try:
+        with Session(engine) as session:
+            snapshot = publicar_snapshot(session, origem=origem)
+        logger.info(f"Snapshot do dashboard na versão {snapshot.id} (etag {snapshot.etag[:12]}).")
+    except Exception as e:
+        # A carga em si já foi concluída; uma falha aqui não deve desfazê-la
+        logger.error(f"Falha ao gerar o snapshot do dashboard após '{origem}': {repr(e)}", exc_info=True)
+
+    if EXPORTACAO_APOS_INGEST:
+        try:
+            exportar()
+        except Exception as e:
+            logger.error(f"Falha ao exportar o snapshot em Parquet após '{origem}': {repr(e)}", exc_info=True)
+
+    if ANALISE_BACKEND == "duckdb":
+        try:
+            sincronizar()
+        except Exception as e:
+            logger.error(f"Falha ao sincronizar o arquivo analítico após '{origem}': {repr(e)}", exc_info=True)
+
+if __name__ == "__main__":
+    executar_pos_ingest("manual")
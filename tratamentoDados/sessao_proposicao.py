@@ -1,15 +1,23 @@
+import calendar
 import datetime
+import os
 from typing import List, Dict, Optional
-import requests
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlmodel import SQLModel, Session
 import json
 from models.proposicao import Proposicao
 from models.sessao_votacao import SessaoVotacao
 from database import engine
-import xml.etree.ElementTree as ET
 from models.votacao_proposicao import VotacaoProposicao
+from log.logger_config import ProgressoLog, get_logger
+from tratamentoDados.checkpoints import PontoRetomada, unidade_ano
+from tratamentoDados.detalhes import PROPOSICAO, VOTACAO, buscar_detalhes
+from tratamentoDados.parametros import URL_API, argumentos_ingest, executar_por_ano, listar_api
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from utils.carga_bulk import upsert
+from utils.metricas import INGEST_REGISTROS, publicar_metricas_ingest
+
+logger = get_logger("ingest_sessao_proposicao", "log/ingest.log", console=True)
 
 def carregar_sessao_json(caminho_arquivo: str) -> List[Dict]:
     try:
@@ -17,165 +25,141 @@ def carregar_sessao_json(caminho_arquivo: str) -> List[Dict]:
             dados = json.load(f)
             return dados.get("dados", [])
     except FileNotFoundError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não foi encontrado.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não foi encontrado.")
         return []
     except json.JSONDecodeError:
-        print(f"Erro: O arquivo '{caminho_arquivo}' não é um JSON válido.")
+        logger.error(f"O arquivo '{caminho_arquivo}' não é um JSON válido.")
         return []
 
-def buscar_detalhes_sessao_xml(uri: str) -> Optional[Dict]:
-    try:
-        headers = {'accept': 'application/xml'}
-        response = requests.get(uri, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        root = ET.fromstring(response.content)
-        
-        proposicoes_afetadas_ids: List[str] = []
-
-        for prop_afetada_elem in root.findall('.//proposicoesAfetadas/proposicoesAfetadas/id'):
-            if prop_afetada_elem.text:
-                proposicoes_afetadas_ids.append(prop_afetada_elem.text)
-        
-        return {"proposicoes_afetadas_ids": proposicoes_afetadas_ids}
-
-    except requests.exceptions.RequestException as e:
-        print(f"  - Erro de conexão ao acessar {uri}: {e}")
-        return None
-    except ET.ParseError:
-        print(f"  - Falha ao analisar o XML da URI {uri}.")
-        return None
-
-def buscar_detalhes_proposicao_api(proposicao_id: str) -> Optional[Dict]:
-    try:
-        url = f'https://dadosabertos.camara.leg.br/api/v2/proposicoes/{proposicao_id}'
-        headers = {'accept': 'application/json'}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json().get('dados', {})
-    except requests.exceptions.RequestException as e:
-        print(f"ERRO: Falha na requisição da proposição {proposicao_id}: {e}.")
-        return None
-    except json.JSONDecodeError:
-        print(f"ERRO: Resposta da API para proposição {proposicao_id} não é um JSON válido.")
+def arquivo_votacoes(ano: int) -> str:
+    return f"data/votacoes_{ano}.json"
+
+def baixar_votacoes_ano(ano: int):
+    """Salva em data/votacoes_<ano>.json as votações do ano, buscadas mês a mês (a API limita o intervalo de datas)."""
+    votacoes = []
+    for mes in range(1, 13):
+        fim = calendar.monthrange(ano, mes)[1]
+        votacoes.extend(listar_api(
+            "/votacoes",
+            {"dataInicio": f"{ano}-{mes:02d}-01", "dataFim": f"{ano}-{mes:02d}-{fim}", "itens": 200},
+            "sessao_proposicao",
+        ))
+    with open(arquivo_votacoes(ano), "w", encoding="utf-8") as f:
+        json.dump({"dados": votacoes}, f, ensure_ascii=False)
+
+def _obter_ou_criar_proposicao(session: Session, prop_id: str) -> Optional[int]:
+    """Id da proposição na base, buscando-a na API e gravando-a na primeira vez em que aparece."""
+    id_proposicao = session.exec(
+        select(Proposicao.id).where(Proposicao.id_dados_abertos == prop_id)
+    ).scalar_one_or_none()
+
+    if id_proposicao:
+        logger.debug(f"Proposição {prop_id} já existe no DB (ID: {id_proposicao}).")
+        INGEST_REGISTROS.inc(loader="proposicao", resultado="pulado")
+        return id_proposicao
+
+    dados_prop = buscar_detalhes(f"{URL_API}/proposicoes/{prop_id}", PROPOSICAO, "sessao_proposicao", logger)
+    if not dados_prop:
+        logger.warning(f"Falha ao buscar dados da proposição {prop_id}. Link não será criado.")
+        INGEST_REGISTROS.inc(loader="proposicao", resultado="pulado")
         return None
 
-
-def main():
-    arquivo_json = 'data/votacoes_2024.json'
-    sessoes_base = carregar_sessao_json(arquivo_json)
+    INGEST_REGISTROS.inc(loader="proposicao", resultado="buscado")
+    # Com vários anos em paralelo, a mesma proposição pode ser gravada por outro worker:
+    # o upsert na chave dos Dados Abertos devolve o id dela em vez de falhar
+    id_proposicao = upsert(session, Proposicao, {
+        "id_dados_abertos": str(dados_prop.pop('id')),
+        **dados_prop,
+    }, chave=["id_dados_abertos"]).scalar_one()
+    logger.debug(f"Proposição {prop_id} gravada (DB ID: {id_proposicao}).")
+    INGEST_REGISTROS.inc(loader="proposicao", resultado="inserido")
+    return id_proposicao
+
+def processar_ano(ano: int) -> int:
+    """
+    Grava as sessões de votação do ano, as proposições afetadas e os vínculos entre elas.
+    Cada sessão é uma transação, com upserts nas chaves naturais e a posição no checkpoint:
+    uma execução interrompida retoma da sessão seguinte. A falha de uma sessão não
+    interrompe as outras; a unidade termina com erro para ser tentada de novo a partir dela.
+    """
+    if not os.path.exists(arquivo_votacoes(ano)):
+        baixar_votacoes_ano(ano)
+    sessoes_base = carregar_sessao_json(arquivo_votacoes(ano))
     
     if not sessoes_base:
-        print('Sem sessões para processar. Encerrando.')
-        return 
-
-    total_sessoes = len(sessoes_base)
-    for i, sessao_dict in enumerate(sessoes_base):
-        id_sessao_json = sessao_dict.get('id')
-        print(f"\n--- Processando sessão {i+1}/{total_sessoes} (ID JSON: {id_sessao_json}) ---")
+        logger.info(f'Sem sessões para processar em {ano}.')
+        return 0
+
+    sessoes_processadas = 0
+    retomada = PontoRetomada("sessao_proposicao", unidade_ano(ano))
+    progresso = ProgressoLog(logger, f"Sessões processadas ({ano})", len(sessoes_base))
+    with Session(engine) as session:
+        for posicao, sessao_dict in enumerate(sessoes_base, start=1):
+            id_sessao_json = sessao_dict.get('id')
+            progresso.avancar()
+            if retomada.ja_concluido(posicao):
+                continue
+
+            uri_detalhes = sessao_dict.get('uri')
+            if not uri_detalhes:
+                logger.warning(f"URI de detalhes da sessão {id_sessao_json} não encontrada. Pulando.")
+                INGEST_REGISTROS.inc(loader="sessao", resultado="pulado")
+                continue
 
-        # Inicia uma nova sessão para cada item do JSON.
-        with Session(engine) as session:
             try:
-                # 1. VERIFICAR/CRIAR SESSÃO DE VOTAÇÃO
-                uri_detalhes = sessao_dict.get('uri')
-                if not uri_detalhes:
-                    print(f"DEBUG: URI de detalhes não encontrada. Pulando.")
-                    continue
-
-                # Verifica se a sessão já existe no banco
-                sessao_row = session.exec(
-                    select(SessaoVotacao).where(SessaoVotacao.id_dados_abertos == id_sessao_json)
-                ).first()
-
-                if sessao_row:
-                    nova_sessao = sessao_row.SessaoVotacao
-                    print(f"DEBUG: Sessão {id_sessao_json} já existe no DB (ID: {nova_sessao.id}). Usando existente.")
-                else:
-                    print(f"DEBUG: Sessão {id_sessao_json} não encontrada. Criando...")
-                    nova_sessao = SessaoVotacao(
-                        id_dados_abertos=sessao_dict['id'],
-                        data_hora_registro=sessao_dict.get('dataHoraRegistro'),
-                        descricao=sessao_dict.get('descricao'),
-                        sigla_orgao=sessao_dict.get('siglaOrgao'),
-                        descricao_ultima_abertura_votacao=sessao_dict.get('ultimaAberturaVotacao', {}).get('descricao'),
-                        aprovacao=str(sessao_dict['aprovacao']) if sessao_dict.get('aprovacao') is not None else None,
-                        uri=sessao_dict['uri']
-                    )
-                    session.add(nova_sessao)
-                    session.flush() 
-                    print(f"DEBUG: Sessão {id_sessao_json} adicionada (DB ID: {nova_sessao.id}).")
+                # 1. GRAVAR A SESSÃO DE VOTAÇÃO (upsert pelo id dos Dados Abertos)
+                id_sessao = upsert(session, SessaoVotacao, {
+                    "id_dados_abertos": sessao_dict['id'],
+                    "data_hora_registro": sessao_dict.get('dataHoraRegistro'),
+                    "ano": ano,
+                    "descricao": sessao_dict.get('descricao'),
+                    "sigla_orgao": sessao_dict.get('siglaOrgao'),
+                    "descricao_ultima_abertura_votacao": sessao_dict.get('ultimaAberturaVotacao', {}).get('descricao'),
+                    "aprovacao": str(sessao_dict['aprovacao']) if sessao_dict.get('aprovacao') is not None else None,
+                    "uri": sessao_dict['uri'],
+                }, chave=["id_dados_abertos"]).scalar_one()
+                INGEST_REGISTROS.inc(loader="sessao", resultado="inserido")
 
                 # 2. BUSCAR DETALHES E PROPOSIÇÕES ASSOCIADAS
-                detalhes_xml = buscar_detalhes_sessao_xml(uri_detalhes)
-                if not detalhes_xml:
-                    print(f"AVISO: Não foi possível obter detalhes XML para URI {uri_detalhes}. Pulando proposições desta sessão.")
-                    session.commit()
-                    continue
-                
-                ids_proposicoes = detalhes_xml['proposicoes_afetadas_ids']
-                if not ids_proposicoes:
-                    print("DEBUG: Sessão não possui proposições afetadas.")
-                    session.commit() # Salva a sessão mesmo sem proposições
-                    continue
-
-                # 3. PROCESSAR CADA PROPOSIÇÃO E CRIAR O LINK
+                # Sem os detalhes ou sem alguma proposição a sessão é gravada, mas a unidade
+                # termina com erro para que os vínculos sejam refeitos
+                detalhes = buscar_detalhes(uri_detalhes, VOTACAO, "sessao_proposicao", logger)
+                if not detalhes:
+                    logger.warning(f"Não foi possível obter os detalhes da URI {uri_detalhes}. Pulando proposições desta sessão.")
+                    retomada.falhar()
+                    ids_proposicoes = []
+                else:
+                    ids_proposicoes = detalhes['proposicoes_afetadas_ids']
+
+                # 3. PROCESSAR CADA PROPOSIÇÃO E CRIAR O LINK (ignorado se já existir)
                 for prop_id in ids_proposicoes:
-                    print(f"  -> Processando proposição afetada ID: {prop_id}")
-
-                    proposicao_row = session.exec(
-                        select(Proposicao).where(Proposicao.id_dados_abertos == prop_id)
-                    ).first()
-
-                    if proposicao_row:
-                        nova_proposicao = proposicao_row.Proposicao
-                        print(f"  DEBUG: Proposição {prop_id} já existe no DB (ID: {nova_proposicao.id}).")
-                    else:
-                        print(f"  DEBUG: Proposição {prop_id} não encontrada. Buscando na API...")
-                        dados_prop = buscar_detalhes_proposicao_api(prop_id)
-                        if not dados_prop:
-                            print(f"  AVISO: Falha ao buscar dados da proposição {prop_id}. Link não será criado.")
-                            continue 
-                        
-                        nova_proposicao = Proposicao(
-                            id_dados_abertos=str(dados_prop.get('id')),
-                            sigla_tipo=dados_prop.get('siglaTipo'),
-                            ano=dados_prop.get('ano'),
-                            ementa=dados_prop.get('ementa'),
-                            data_apresentacao=dados_prop.get('dataApresentacao'),
-                            status=dados_prop.get('statusProposicao', {}).get('descricaoSituacao'),
-                            url_inteiro_teor=dados_prop.get('urlInteiroTeor')
-                        )
-                        session.add(nova_proposicao)
-                        session.flush()
-                        print(f"  DEBUG: Proposição {prop_id} adicionada (DB ID: {nova_proposicao.id}).")
-
-                    # 4. CRIAR O LINK ASSOCIATIVO
-                    existing_link = session.exec(
-                        select(VotacaoProposicao).where(
-                            VotacaoProposicao.id_votacao == nova_sessao.id,
-                            VotacaoProposicao.id_proposicao == nova_proposicao.id
-                        )
-                    ).first()
-
-                    if existing_link:
-                        print(f"  DEBUG: Link Votação-Proposição já existe.")
-                    else:
-                        tabela_associativa = VotacaoProposicao(
-                            id_votacao=nova_sessao.id,
-                            id_proposicao=nova_proposicao.id,
-                        )
-                        session.add(tabela_associativa)
-                        print(f"  DEBUG: Link Votação-Proposição adicionado à sessão.")
-                
-                # 5. COMMIT FINAL DA TRANSAÇÃO DA SESSÃO
-                print(f"SUCESSO: Finalizando processamento da sessão {id_sessao_json}. Commitando no banco de dados...")
+                    id_proposicao = _obter_ou_criar_proposicao(session, prop_id)
+                    if not id_proposicao:
+                        retomada.falhar()
+                        continue
+                    upsert(session, VotacaoProposicao, {
+                        "id_votacao": id_sessao,
+                        "id_proposicao": id_proposicao,
+                    }, chave=["id_votacao", "id_proposicao"], atualizar=[])
+
+                # 4. COMMIT DA SESSÃO JUNTO COM A POSIÇÃO
+                retomada.concluir(session, posicao)
                 session.commit()
+                sessoes_processadas += 1
 
             except Exception as e:
-                print(f"ERRO CRÍTICO ao processar sessão {id_sessao_json}: {repr(e)}")
-                print("Realizando rollback e INTERROMPENDO a execução.")
+                logger.error(f"Erro ao processar sessão {id_sessao_json}: {repr(e)}. Realizando rollback e seguindo para a próxima.", exc_info=True)
                 session.rollback()
-                raise 
+                retomada.falhar()
+
+    progresso.concluir()
+    retomada.finalizar()
+    return sessoes_processadas
+
+def main(anos: List[int], workers: int, legislatura: Optional[int] = None):
+    executar_por_ano(processar_ano, anos, workers, logger)
+    publicar_metricas_ingest("sessao_proposicao")
+    executar_pos_ingest("sessao_proposicao")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main(**vars(argumentos_ingest("Carga das sessões de votação e proposições por ano.", legislatura=True, anos=True)))
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Etapa de transformação das cargas em processos separados.
+
+Os arquivos locais das cargas grandes são JSON Lines (um registro por linha), o que permite
+dividi-los em fatias de bytes alinhadas em quebras de linha sem ler o arquivo antes: cada
+processo lê a sua fatia, decodifica as linhas (orjson, se instalado) e devolve o registro já
+convertido por `mapear` em tuplas compactas, que o loader grava em bloco. Assim a parte
+presa à CPU (decodificar e montar as linhas) usa todos os núcleos, e só tuplas cruzam a
+fronteira entre processos.
+"""
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from config import INGEST_PROCESSOS_TRANSFORMACAO
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele cai no json da biblioteca padrão
+    orjson = None
+
+# Fatias por processo: mais fatias que processos equilibram registros de tamanhos diferentes
+FATIAS_POR_PROCESSO = 4
+
+# Um pool por tamanho, compartilhado pelos anos processados em paralelo (threads) da mesma
+# carga: os processos são criados uma vez só em vez de a cada arquivo
+_executores: Dict[int, ProcessPoolExecutor] = {}
+_trava_executores = threading.Lock()
+
+def _executor(processos: int) -> ProcessPoolExecutor:
+    with _trava_executores:
+        if processos not in _executores:
+            # spawn: os processos não herdam o pool de conexões nem as threads do loader
+            contexto = multiprocessing.get_context("spawn")
+            _executores[processos] = ProcessPoolExecutor(max_workers=processos, mp_context=contexto)
+        return _executores[processos]
+
+def escrever_jsonl(caminho: str, registros: Iterable[Dict]):
+    with open(caminho, "wb") as f:
+        for registro in registros:
+            f.write(orjson.dumps(registro) if orjson else json.dumps(registro, ensure_ascii=False).encode())
+            f.write(b"\n")
+
+def fatiar_arquivo(caminho: str, partes: int) -> List[Tuple[int, int]]:
+    """Divide o arquivo em até `partes` intervalos [início, fim) de bytes, cada um com linhas inteiras."""
+    tamanho = os.path.getsize(caminho)
+    limites = [0]
+    with open(caminho, "rb") as f:
+        for i in range(1, partes):
+            f.seek(max(tamanho * i // partes, limites[-1]))
+            # Avança até o início da próxima linha: a linha cortada fica na fatia anterior
+            f.readline()
+            limites.append(min(f.tell(), tamanho))
+    limites.append(tamanho)
+    return [(inicio, fim) for inicio, fim in zip(limites, limites[1:]) if fim > inicio]
+
+def transformar_fatia(caminho: str, inicio: int, fim: int, mapear: Callable) -> List:
+    resultado = []
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        while f.tell() < fim:
+            linha = f.readline()
+            if linha.strip():
+                resultado.append(mapear(orjson.loads(linha) if orjson else json.loads(linha)))
+    return resultado
+
+def transformar_arquivo(caminho: str, mapear: Callable, processos: int = INGEST_PROCESSOS_TRANSFORMACAO) -> Iterator:
+    """
+    Aplica `mapear` a cada registro do arquivo JSON Lines, dividido entre `processos`. Os
+    resultados saem na ordem do arquivo. `mapear` precisa ser uma função de módulo leve
+    (ver `tratamentoDados.mapeamentos`): cada processo novo importa o módulo dela.
+    """
+    fatias = fatiar_arquivo(caminho, max(1, processos) * FATIAS_POR_PROCESSO)
+    if processos <= 1 or len(fatias) <= 1:
+        for inicio, fim in fatias:
+            yield from transformar_fatia(caminho, inicio, fim, mapear)
+        return
+
+    inicios, fins = zip(*fatias)
+    lotes = _executor(processos).map(transformar_fatia, [caminho] * len(fatias), inicios, fins, [mapear] * len(fatias))
+    for lote in lotes:
+        yield from lote
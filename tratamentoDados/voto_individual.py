@@ -2,119 +2,164 @@ from sqlalchemy import select
 from sqlmodel import Session
 from database import engine
 import requests
-from typing import Optional
+from typing import List, Optional
 
 # Assumindo que os seus modelos estão definidos nestes ficheiros
+from models.tipo_voto import TipoVoto
 from models.voto_individual import VotoIndividual
 from models.sessao_votacao import SessaoVotacao
 from models.deputado import Deputado
+from models.mandato_deputado import MandatoDeputado
+from log.logger_config import ProgressoLog, get_logger
+from tratamentoDados.checkpoints import PontoRetomada, unidade_ano
+from tratamentoDados.parametros import argumentos_ingest, executar_por_ano
+from tratamentoDados.pos_ingest import executar_pos_ingest
+from utils.legislaturas import legislatura_do_ano
+from utils.particoes import garantir_particao
+from utils.placar import atualizar_placares_do_ano
+from utils.atividade import atualizar_atividade_do_ano
+from utils.carga_bulk import upsert
+from utils.coesao import atualizar_coesao_do_ano
+from utils.metricas import INGEST_REGISTROS, cronometrar_http, publicar_metricas_ingest
 
-def main():
+logger = get_logger("ingest_voto_individual", "log/ingest.log", console=True)
+
+def obter_id_tipo_voto(cache: dict, nome: str) -> int:
+    """
+    Id do tipo de voto na tabela de lookup, criando o registro na primeira ocorrência de um
+    nome novo. A criação é confirmada numa transação própria, para que o id em cache
+    continue válido mesmo se a sessão de votação em andamento sofrer rollback.
+    """
+    if nome not in cache:
+        with Session(engine) as session:
+            # Pode ter sido criado ao mesmo tempo pelo worker de outro ano
+            upsert(session, TipoVoto, {"nome": nome}, chave=["nome"], atualizar=[])
+            session.commit()
+            cache[nome] = session.exec(select(TipoVoto.id).where(TipoVoto.nome == nome)).scalar_one()
+        logger.info(f"Tipo de voto registado: {nome}")
+    return cache[nome]
+
+def processar_ano(ano: int) -> int:
+    """
+    Busca os votos individuais de cada sessão de votação do ano e os grava em
+    VotoIndividual. Cada sessão é uma transação: os votos são gravados por upsert na chave
+    natural (sessão, deputado, ano), junto com a posição no checkpoint, de modo que repetir
+    a carga não duplica votos e uma execução interrompida retoma da sessão seguinte. A
+    falha de uma sessão não interrompe as outras; a unidade termina com erro para ser
+    tentada de novo a partir dela. Ao fim, recalcula o placar das proposições votadas no
+    ano, a coesão dos partidos em cada sessão e a atividade dos deputados no ano.
     """
-    Este script busca os votos individuais para cada sessão de votação,
-    verifica se os deputados existem na base de dados,
-    e insere os registos de votos na tabela VotoIndividual.
-    """    
-    # Contador para fazer commits periódicos
     sessoes_processadas = 0
     
     with Session(engine) as session:
-        # 1. Buscar todas as sessões de votação da nossa base de dados
-        statement_sessoes = select(SessaoVotacao)
-        # .all() retorna uma lista de objetos Row
-        todas_sessoes_rows = session.exec(statement_sessoes).all()
-        total_sessoes = len(todas_sessoes_rows)
-        print(f"DEBUG: Encontradas {total_sessoes} sessões de votação para processar.")
-
-        for i, sessao_row in enumerate(todas_sessoes_rows):
-            # CORREÇÃO: Extrai a instância do modelo do objeto Row pelo índice [0]
-            sessao_db = sessao_row[0]
-            
-            print(f"\n--- Processando Sessão {i+1}/{total_sessoes} ---")
+        # A partição do ano é criada e confirmada antes, para não travar os outros anos
+        garantir_particao(session, "votoindividual", ano)
+        session.commit()
+
+        # 1. Buscar as sessões de votação do ano na nossa base de dados, sempre na mesma ordem
+        sessoes = session.exec(
+            select(SessaoVotacao.id, SessaoVotacao.id_dados_abertos)
+            .where(SessaoVotacao.ano == ano)
+            .order_by(SessaoVotacao.id)
+        ).all()
+        logger.info(f"Encontradas {len(sessoes)} sessões de votação de {ano} para processar.")
+        tipos_voto = {tipo.nome: tipo.id for tipo in session.exec(select(TipoVoto)).scalars()}
+        # Deputados por id dos Dados Abertos, com o partido atual
+        deputados = {
+            id_dados_abertos: (id_deputado, id_partido)
+            for id_dados_abertos, id_deputado, id_partido
+            in session.exec(select(Deputado.id_dados_abertos, Deputado.id, Deputado.id_partido)).all()
+        }
+        # Partido de cada deputado na legislatura do ano (o atual pode ser outro)
+        partidos_mandato = dict(session.exec(
+            select(MandatoDeputado.id_deputado, MandatoDeputado.id_partido)
+            .where(MandatoDeputado.id_legislatura == legislatura_do_ano(ano))
+        ).all())
+
+        retomada = PontoRetomada("voto_individual", unidade_ano(ano))
+        progresso = ProgressoLog(logger, f"Sessões processadas ({ano})", len(sessoes))
+        for id_sessao, id_sessao_dados_abertos in sessoes:
+            progresso.avancar()
+            # A posição é o id da sessão na base
+            if retomada.ja_concluido(id_sessao):
+                continue
 
             try:
-                # 2. Construir a URL e buscar os votos na API para a sessão atual
-                url = f'https://dadosabertos.camara.leg.br/api/v2/votacoes/{sessao_db.id_dados_abertos}/votos'
-                headers = {'accept': 'application/json'}
-                
-                print(f"DEBUG: Buscando votos na URL: {url}")
-                response = requests.get(url, headers=headers, timeout=10)
+                # 2. Buscar os votos na API para a sessão atual
+                url = f'https://dadosabertos.camara.leg.br/api/v2/votacoes/{id_sessao_dados_abertos}/votos'
+                logger.debug(f"Buscando votos na URL: {url}")
+                with cronometrar_http("voto_individual") as medicao:
+                    response = requests.get(url, headers={'accept': 'application/json'}, timeout=10)
+                    medicao["status"] = response.status_code
                 response.raise_for_status()  # Lança um erro para status HTTP 4xx/5xx
                 
                 votos_api = response.json().get('dados', [])
-                if not votos_api:
-                    print("INFO: Esta sessão não possui registos de votos individuais na API. Pulando.")
-                    continue
-                
-                print(f"DEBUG: Encontrados {len(votos_api)} votos para esta sessão.")
+                INGEST_REGISTROS.inc(len(votos_api), loader="voto_individual", resultado="buscado")
 
-                # 3. Iterar sobre cada voto recebido da API
+                # 3. Montar os votos da sessão, um por deputado
+                votos = {}
                 for voto_api in votos_api:
-                    deputado_info = voto_api.get('deputado_')
-                    if not deputado_info:
-                        print("AVISO: Voto sem informação do deputado. Pulando.")
+                    id_deputado_api = (voto_api.get('deputado_') or {}).get('id')
+                    if id_deputado_api not in deputados:
+                        # Os demais votos são gravados, mas a unidade termina com erro para
+                        # buscar a sessão de novo depois da carga dos deputados
+                        logger.warning(f"Deputado ID {id_deputado_api} não encontrado. Voto pulado.")
+                        INGEST_REGISTROS.inc(loader="voto_individual", resultado="pulado")
+                        retomada.falhar()
                         continue
 
-                    id_deputado_api = deputado_info.get('id')
-                    if not id_deputado_api:
-                        print(f"AVISO: Voto com info de deputado, mas sem ID. Pulando. Info: {deputado_info}")
-                        continue
-                    
-                    # 4. Verificar se o deputado já existe na nossa base de dados
-                    deputado_row = session.exec(
-                        select(Deputado).where(Deputado.id_dados_abertos == id_deputado_api)
-                    ).first()
-
-                    if deputado_row:
-                        # CORREÇÃO: Extrai a instância do modelo do objeto Row pelo índice [0]
-                        deputado_db = deputado_row[0]
-                    else:
-                        # 5. Se o deputado não existe, cria um novo registo
-                        print(f"  -> INFO: Deputado ID {id_deputado_api} não encontrado.")
-                        break
-                    
-                    # 6. Verificar se este voto específico já foi inserido para evitar duplicados
-                    voto_existente = session.exec(
-                        select(VotoIndividual).where(
-                            VotoIndividual.id_votacao == sessao_db.id,
-                            VotoIndividual.id_deputado == deputado_db.id
-                        )
-                    ).first()
-
-                    if voto_existente:
-                        print(f"  -> INFO: Voto para o deputado nesta sessão já existe. Pulando.")
-                        continue
+                    id_deputado, id_partido_atual = deputados[id_deputado_api]
+                    votos[id_deputado] = {
+                        "id_votacao": id_sessao,
+                        "id_deputado": id_deputado,
+                        "ano": ano,
+                        "id_tipo_voto": obter_id_tipo_voto(tipos_voto, voto_api.get('tipoVoto')),
+                        "data_hora_registro": voto_api.get("dataRegistroVoto"),
+                        "id_partido": partidos_mandato.get(id_deputado, id_partido_atual),
+                    }
+
+                # 4. Gravar os votos e a posição na mesma transação
+                if votos:
+                    upsert(session, VotoIndividual, list(votos.values()), chave=["id_votacao", "id_deputado", "ano"])
+                    INGEST_REGISTROS.inc(len(votos), loader="voto_individual", resultado="inserido")
+                else:
+                    logger.debug(f"A sessão {id_sessao_dados_abertos} não possui registos de votos individuais na API.")
+                retomada.concluir(session, id_sessao)
+                session.commit()
+                sessoes_processadas += 1
 
-                    # 7. Criar a nova instância de VotoIndividual com todos os dados
-                    novo_voto = VotoIndividual(
-                        id_votacao=sessao_db.id,
-                        id_deputado=deputado_db.id,
-                        tipo_voto=voto_api.get('tipoVoto'),
-                        data_hora_registro=voto_api.get("dataRegistroVoto"),
-                        sigla_partido_deputado=deputado_db.sigla_partido,
-                        uri_deputado=deputado_info.get('uri'),
-                        uri_sessao_votacao=sessao_db.uri
-                    )
-                    session.add(novo_voto)
-                    print(f"  -> DEBUG: Voto do Dep. {deputado_db.nome_eleitoral} ({voto_api.get('tipoVoto')}) adicionado à sessão.")
-
-            except requests.exceptions.RequestException as e:
-                print(f"ERRO: Falha de conexão ao buscar votos para a sessão {sessao_db.id_dados_abertos}: {e}")
-                continue
             except Exception as e:
-                print(f"ERRO INESPERADO ao processar a sessão {sessao_db.id_dados_abertos}: {repr(e)}")
-                break
+                logger.error(f"Falha ao processar os votos da sessão {id_sessao_dados_abertos}: {repr(e)}", exc_info=True)
+                session.rollback()
+                retomada.falhar()
 
-            sessoes_processadas += 1
-            # 8. Fazer commit a cada 50 sessões para salvar o progresso
-            if sessoes_processadas % 50 == 0:
-                print(f"\n--- COMMIT PARCIAL: Salvando {sessoes_processadas} sessões processadas na base de dados... ---")
-                session.commit()
-                print("--- SUCESSO: Dados salvos. Continuando... ---")
+        progresso.concluir()
 
-        # 9. Commit final para salvar quaisquer registos restantes
-        print("\n--- PROCESSAMENTO CONCLUÍDO: Realizando commit final... ---")
-        session.commit()
-        print("--- SUCESSO: Todos os votos foram carregados com êxito! ---")
+        # 5. Recalcular o placar das proposições votadas no ano, a coesão dos partidos e a
+        # atividade dos deputados, inclusive com as sessões gravadas em execuções anteriores;
+        # se falhar, a unidade é tentada de novo
+        try:
+            proposicoes = atualizar_placares_do_ano(session, ano)
+            coesao = atualizar_coesao_do_ano(session, ano)
+            deputados = atualizar_atividade_do_ano(session, ano)
+            session.commit()
+            logger.info(
+                f"Placar de {proposicoes} proposições, coesão de {coesao} pares partido x sessão e "
+                f"atividade de {deputados} deputados de {ano} recalculados."
+            )
+        except Exception as e:
+            logger.error(f"Falha ao recalcular as tabelas derivadas dos votos de {ano}: {repr(e)}", exc_info=True)
+            session.rollback()
+            retomada.falhar()
+
+    retomada.finalizar()
+    logger.info(f"Votos de {ano} carregados: {sessoes_processadas} sessões.")
+    return sessoes_processadas
+
+def main(anos: List[int], workers: int, legislatura: Optional[int] = None):
+    executar_por_ano(processar_ano, anos, workers, logger)
+    publicar_metricas_ingest("voto_individual")
+    executar_pos_ingest("voto_individual")
 
-main()
+if __name__ == "__main__":
+    main(**vars(argumentos_ingest("Carga dos votos individuais por ano.", legislatura=True, anos=True)))
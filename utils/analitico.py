@@ -0,0 +1,200 @@
+"""
+Backend analítico opcional das rotas de agregação, em DuckDB.
+
+Com ANALISE_BACKEND=duckdb, as consultas das rotas `/analise` rodam num arquivo DuckDB carregado a partir do último snapshot em Parquet (ver `utils.exportacao`)
+em vez do PostgreSQL. A consulta é a mesma nos dois caminhos: o statement do SQLAlchemy é
+compilado no dialeto do PostgreSQL, que o DuckDB aceita, e as tabelas do arquivo têm os
+nomes e as colunas das tabelas da base.
+
+Cada geração exportada ganha o seu arquivo (`ANALISE_DUCKDB_DIR/geracao_<n>.duckdb`),
+montado ao lado e renomeado quando completo; os de gerações anteriores são removidos
+depois da troca, e as consultas em andamento terminam no arquivo antigo, fechado quando
+a última delas termina. O DuckDB só é usado quando o snapshot é da geração de ingestão
+atual, a mesma dos ETags: enquanto a geração atual não tem snapshot exportado e arquivo
+montado (ou sem o duckdb instalado, ou em caso de erro), as consultas caem no
+PostgreSQL. Use junto com EXPORTACAO_APOS_INGEST=1.
+
+Uso (a partir da raiz do projeto):
+
+    python -m utils.analitico              # sincroniza com o último snapshot
+    python -m utils.analitico --forcar     # reconstrói o arquivo mesmo se já existir
+"""
+import argparse
+import os
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+
+from config import ANALISE_BACKEND, ANALISE_DUCKDB_DIR, EXPORTACAO_DIR
+from log.logger_config import get_logger
+from utils.exportacao import MANIFESTO, TABELAS, diretorio_snapshot, esquema_arrow, manifesto_atual
+from utils.geracao import geracao_atual
+
+try:
+    import duckdb
+except ImportError:  # duckdb é opcional; sem ele as agregações ficam no PostgreSQL
+    duckdb = None
+
+logger = get_logger("analitico", "log/analises.log")
+
+# Parâmetros como $1, $2..., o formato de parâmetros posicionais do DuckDB
+_DIALETO = postgresql.dialect(paramstyle="numeric_dollar")
+# Nulos por último em ordem crescente e primeiro em decrescente, como no PostgreSQL
+_CONFIGURACAO = {"default_null_order": "nulls_last_on_asc_first_on_desc"}
+
+_MODELOS = {modelo.__tablename__: modelo for modelo in TABELAS}
+
+class _Arquivo:
+    """
+    Conexão de leitura ao arquivo de uma geração. Ao ser substituída pela da geração
+    seguinte, só é fechada quando o último cursor aberto nela é devolvido.
+    """
+
+    def __init__(self, geracao: int, caminho: str):
+        self.geracao = geracao
+        self.conexao = duckdb.connect(caminho, read_only=True, config=_CONFIGURACAO)
+        self.cursores = 0
+        self.substituido = False
+
+    def fechar_se_livre(self):
+        if self.substituido and self.cursores == 0:
+            self.conexao.close()
+
+_atual: Optional[_Arquivo] = None
+_trava = threading.Lock()
+_sincronizando = threading.Lock()
+
+def arquivo_analitico(geracao: int, diretorio: str = ANALISE_DUCKDB_DIR) -> str:
+    return os.path.join(diretorio, f"geracao_{geracao}.duckdb")
+
+def _remover_antigos(geracao: int, diretorio: str):
+    for nome in os.listdir(diretorio):
+        if nome.startswith("geracao_") and nome.endswith(".duckdb") and nome != os.path.basename(arquivo_analitico(geracao)):
+            try:
+                os.remove(os.path.join(diretorio, nome))
+            except OSError:
+                pass
+
+def sincronizar(forcar: bool = False, exportacao: str = EXPORTACAO_DIR, diretorio: str = ANALISE_DUCKDB_DIR) -> Optional[int]:
+    """
+    Monta o arquivo DuckDB do último snapshot em Parquet, se ainda não existir, e retorna a
+    geração dele (None se não há snapshot).
+    """
+    if duckdb is None:
+        raise RuntimeError("O backend analítico requer o duckdb (pip install duckdb).")
+
+    manifesto = manifesto_atual(exportacao)
+    if manifesto is None:
+        return None
+    geracao = manifesto["geracao"]
+    arquivo = arquivo_analitico(geracao, diretorio)
+    if os.path.exists(arquivo) and not forcar:
+        return geracao
+
+    os.makedirs(diretorio, exist_ok=True)
+    # Um temporário por processo: os workers da API podem sincronizar ao mesmo tempo
+    temporario = f"{arquivo}.{os.getpid()}.tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    origem = diretorio_snapshot(geracao, exportacao)
+    with duckdb.connect(temporario) as conexao:
+        for tabela, dados in manifesto["tabelas"].items():
+            caminhos = [os.path.join(origem, arquivo["caminho"]) for arquivo in dados["arquivos"]]
+            if caminhos:
+                conexao.execute(f'CREATE TABLE "{tabela}" AS SELECT * FROM read_parquet($1)', [caminhos])
+            else:
+                # Tabela particionada ainda sem nenhum ano: cria vazia, com o esquema da exportação
+                conexao.from_arrow(esquema_arrow(_MODELOS[tabela]).empty_table()).create(tabela)
+            logger.info(f"{tabela}: {dados['linhas']} linhas carregadas no DuckDB.")
+    os.replace(temporario, arquivo)
+    _remover_antigos(geracao, diretorio)
+    logger.info(f"Arquivo analítico da geração {geracao} pronto em {arquivo}.")
+    return geracao
+
+def _sincronizar_em_segundo_plano():
+    if not _sincronizando.acquire(blocking=False):
+        return
+
+    def tarefa():
+        try:
+            sincronizar()
+        except Exception as e:
+            logger.error(f"Falha ao sincronizar o arquivo analítico: {repr(e)}", exc_info=True)
+        finally:
+            _sincronizando.release()
+
+    threading.Thread(target=tarefa, name="sincronizacao-analitico", daemon=True).start()
+
+def _abrir_cursor() -> Optional[Tuple[_Arquivo, object]]:
+    """
+    (arquivo, cursor) na geração de ingestão atual, ou None se ela ainda não tem snapshot
+    em Parquet ou arquivo DuckDB: servir um snapshot anterior devolveria dados antigos
+    sob o ETag da geração nova. Devolva o cursor com `_devolver_cursor`.
+    """
+    global _atual
+    geracao = geracao_atual()[0] or 0
+    if not os.path.exists(os.path.join(diretorio_snapshot(geracao, EXPORTACAO_DIR), MANIFESTO)):
+        return None
+    with _trava:
+        if _atual is None or _atual.geracao != geracao:
+            caminho = arquivo_analitico(geracao)
+            if not os.path.exists(caminho):
+                _sincronizar_em_segundo_plano()
+                return None
+            anterior, _atual = _atual, _Arquivo(geracao, caminho)
+            if anterior is not None:
+                anterior.substituido = True
+                anterior.fechar_se_livre()
+        _atual.cursores += 1
+        return _atual, _atual.conexao.cursor()
+
+def _devolver_cursor(arquivo: _Arquivo, cursor):
+    cursor.close()
+    with _trava:
+        arquivo.cursores -= 1
+        arquivo.fechar_se_livre()
+
+@lru_cache(maxsize=None)
+def _tipo_linha(colunas: Tuple[str, ...]):
+    return namedtuple("Linha", colunas, rename=True)
+
+def consultar_duckdb(cursor, statement) -> List:
+    # render_postcompile expande os IN (...) em um parâmetro por valor
+    compilado = statement.compile(dialect=_DIALETO, compile_kwargs={"render_postcompile": True})
+    parametros = [compilado.params[nome] for nome in compilado.positiontup or ()]
+    linha = _tipo_linha(tuple(statement.selected_columns.keys()))
+    return [linha(*valores) for valores in cursor.execute(compilado.string, parametros).fetchall()]
+
+def executar(session: Session, statement) -> List:
+    """
+    Executa uma consulta de agregação no backend configurado. As linhas se comportam como as
+    do SQLAlchemy (tupla com acesso pelos rótulos das colunas) nos dois backends.
+    """
+    if ANALISE_BACKEND == "duckdb" and duckdb is not None:
+        aberto = _abrir_cursor()
+        if aberto is not None:
+            arquivo, cursor = aberto
+            try:
+                return consultar_duckdb(cursor, statement)
+            except duckdb.Error as e:
+                logger.error(f"Falha na consulta ao DuckDB; usando o PostgreSQL: {repr(e)}", exc_info=True)
+            finally:
+                _devolver_cursor(arquivo, cursor)
+    return session.exec(statement).all()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincroniza o arquivo DuckDB das análises com o último snapshot em Parquet.")
+    parser.add_argument("--forcar", action="store_true", help="Reconstrói o arquivo mesmo se ele já existir.")
+    args = parser.parse_args()
+    geracao = sincronizar(forcar=args.forcar)
+    if geracao is None:
+        print("Nenhum snapshot exportado. Rode `python -m utils.exportacao` antes.")
+    else:
+        print(f"Arquivo analítico da geração {geracao}: {arquivo_analitico(geracao)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Atividade dos deputados nas votações (tabela `atividadedeputado`).
+
+Para cada deputado e ano: sessões de votação em que votou, proposições distintas dessas
+sessões (por `VotacaoProposicao`), votos por tipo e as sessões do ano com votos nominais,
+base da taxa de presença. O ranking `/deputado/ranking/atuantes` e o resumo
+`/deputado/deputados/{id}/resumo` somam as linhas do período em vez de contar votos
+distintos a cada chamada. Somando anos, uma proposição votada em dois anos conta nos dois.
+
+Os valores de um ano inteiro são calculados de uma vez, por um único INSERT ... SELECT que
+agrega os votos do ano (só a partição dele) no banco. A carga dos votos recalcula o ano ao
+fim de cada unidade; para recalcular todos os anos:
+
+    python -m utils.atividade
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, insert
+from sqlmodel import Session, func, select
+
+from log.logger_config import get_logger
+from models.atividade_deputado import AtividadeDeputado
+from models.votacao_proposicao import VotacaoProposicao
+from models.voto_individual import VotoIndividual
+from utils.querys import id_tipo_voto
+
+logger = get_logger("atividade", "log/ingest.log", console=True)
+
+# Tipos com coluna própria; os demais somam em votos_outros
+TIPOS_ATIVIDADE = {"Sim": "votos_sim", "Não": "votos_nao", "Abstenção": "votos_abstencao", "Obstrução": "votos_obstrucao"}
+
+def _select_atividade(ano: int):
+    proposicoes = (
+        select(VotoIndividual.id_deputado, func.count(func.distinct(VotacaoProposicao.id_proposicao)).label("proposicoes"))
+        .join(VotacaoProposicao, VotacaoProposicao.id_votacao == VotoIndividual.id_votacao)
+        .where(VotoIndividual.ano == ano)
+        .group_by(VotoIndividual.id_deputado)
+        .subquery()
+    )
+    sessoes_do_ano = (
+        select(func.count(func.distinct(VotoIndividual.id_votacao)))
+        .where(VotoIndividual.ano == ano)
+        .scalar_subquery()
+    )
+    por_tipo = [func.sum(case((VotoIndividual.id_tipo_voto == id_tipo_voto(nome), 1), else_=0)) for nome in TIPOS_ATIVIDADE]
+    outros = func.count()
+    for votos in por_tipo:
+        outros = outros - votos
+    return (
+        select(
+            VotoIndividual.ano,
+            VotoIndividual.id_deputado,
+            func.count(func.distinct(VotoIndividual.id_votacao)),
+            sessoes_do_ano,
+            func.coalesce(func.max(proposicoes.c.proposicoes), 0),
+            *por_tipo,
+            outros,
+        )
+        .outerjoin(proposicoes, proposicoes.c.id_deputado == VotoIndividual.id_deputado)
+        .where(VotoIndividual.ano == ano)
+        .group_by(VotoIndividual.ano, VotoIndividual.id_deputado)
+    )
+
+COLUNAS = ["ano", "id_deputado", "sessoes_votadas", "sessoes_do_ano", "proposicoes_votadas", *TIPOS_ATIVIDADE.values(), "votos_outros"]
+
+def atualizar_atividade_do_ano(session: Session, ano: int) -> int:
+    """Recalcula a atividade de todos os deputados que votaram no ano; retorna as linhas gravadas."""
+    session.exec(delete(AtividadeDeputado).where(AtividadeDeputado.ano == ano))
+    return session.execute(insert(AtividadeDeputado).from_select(COLUNAS, _select_atividade(ano))).rowcount
+
+def atualizar_atividade(session: Session, anos: Optional[Iterable[int]] = None) -> int:
+    """Recalcula os anos informados (todos os anos com votos, sem `anos`)."""
+    if anos is None:
+        anos = session.exec(select(VotoIndividual.ano).distinct()).all()
+    return sum(atualizar_atividade_do_ano(session, ano) for ano in sorted(anos))
+
+def main():
+    from database import engine
+
+    with Session(engine) as session:
+        total = atualizar_atividade(session)
+        session.commit()
+    logger.info(f"Atividade recalculada: {total} linhas (deputado x ano).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import io
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+
+TAMANHO_BLOCO_COPY = 50000
+
+def _valor_copy(valor) -> str:
+    # Formato texto do COPY: NULL como \N e escape de tab, quebra de linha e barra invertida
+    if valor is None:
+        return "\\N"
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+def copiar_linhas(conexao_dbapi, tabela: str, colunas: Sequence[str], linhas: Iterable[Sequence]) -> int:
+    """
+    Grava as linhas (tuplas na ordem de `colunas`) com `COPY ... FROM STDIN`, em blocos,
+    sem materializar todo o conjunto em memória. Funciona com psycopg (3) e psycopg2.
+    Retorna a quantidade de linhas copiadas.
+    """
+    sql = f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN"
+    total = 0
+    cursor = conexao_dbapi.cursor()
+    try:
+        if hasattr(cursor, "copy"):
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                for linha in linhas:
+                    copy.write_row(linha)
+                    total += 1
+            return total
+
+        # psycopg2: acumula blocos em um buffer de texto e envia com copy_expert
+        buffer = io.StringIO()
+        no_bloco = 0
+        for linha in linhas:
+            buffer.write("\t".join(_valor_copy(v) for v in linha))
+            buffer.write("\n")
+            no_bloco += 1
+            if no_bloco >= TAMANHO_BLOCO_COPY:
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                total += no_bloco
+                buffer, no_bloco = io.StringIO(), 0
+        if no_bloco:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            total += no_bloco
+        return total
+    finally:
+        cursor.close()
+
+def ajustar_sequencia(session, tabela: str, coluna: str = "id"):
+    """Avança a sequência do Postgres depois de uma carga com ids explícitos."""
+    # Nas tabelas particionadas a sequência é declarada no modelo e não pertence à coluna
+    session.execute(text(
+        f"SELECT setval(COALESCE(pg_get_serial_sequence('{tabela}', '{coluna}'), '{tabela}_{coluna}_seq'), "
+        f"COALESCE((SELECT MAX({coluna}) FROM {tabela}), 0) + 1, false)"
+    ))
+
+def upsert(
+    session, modelo, linhas: Union[Dict, List[Dict]], chave: Sequence[str], atualizar: Optional[Sequence[str]] = None,
+    retornar: Sequence[str] = ("id",),
+):
+    """
+    Grava `linhas` (um dict ou uma lista deles) com `INSERT ... ON CONFLICT (chave)`,
+    atualizando as colunas `atualizar` (padrão: todas as outras) quando a linha já existe.
+    Sem colunas a atualizar, o conflito é ignorado (sem `chave`, o de qualquer restrição
+    única). Retorna o resultado com o `id` de cada
+    linha inserida ou atualizada, o que torna as cargas idempotentes.
+    """
+    dialeto = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialeto.insert(modelo).values(linhas)
+    if atualizar is None:
+        atualizar = [coluna for coluna in (linhas if isinstance(linhas, dict) else linhas[0]) if coluna not in chave]
+    if atualizar:
+        statement = statement.on_conflict_do_update(
+            index_elements=list(chave), set_={coluna: statement.excluded[coluna] for coluna in atualizar}
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=list(chave) or None)
+    return session.execute(statement.returning(*(getattr(modelo, coluna) for coluna in retornar)))
@@ -0,0 +1,91 @@
+"""
+Coesão partidária por sessão de votação (tabela `coesaopartido`).
+
+Para cada partido e sessão, a partir dos votos dos deputados do partido (o partido na data
+do voto):
+
+- índice de Rice: |Sim - Não| / (Sim + Não), de 0 (partido dividido ao meio) a 1 (todos
+  votaram igual); nulo se ninguém do partido votou Sim ou Não;
+- concordância com a maioria: fração dos votos do partido iguais ao voto mais frequente
+  nele, considerando todos os tipos de voto (Abstenção e Obstrução inclusive).
+
+Os valores de um ano inteiro são calculados de uma vez, por um único INSERT ... SELECT que
+agrega os votos do ano (só a partição dele) no banco. A carga dos votos recalcula o ano ao
+fim de cada unidade; para recalcular todos os anos:
+
+    python -m utils.coesao
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import Float, case, cast, delete, insert
+from sqlmodel import Session, func, select
+
+from log.logger_config import get_logger
+from models.coesao_partido import CoesaoPartido
+from models.voto_individual import VotoIndividual
+from utils.querys import id_tipo_voto
+
+logger = get_logger("coesao", "log/ingest.log", console=True)
+
+def _select_coesao(ano: int):
+    # Votos de cada partido por sessão e tipo, numerados do tipo mais votado para o menos
+    por_tipo = (
+        select(
+            VotoIndividual.ano,
+            VotoIndividual.id_votacao,
+            VotoIndividual.id_partido,
+            VotoIndividual.id_tipo_voto,
+            func.count().label("votos"),
+            func.row_number().over(
+                partition_by=(VotoIndividual.id_votacao, VotoIndividual.id_partido),
+                order_by=(func.count().desc(), VotoIndividual.id_tipo_voto),
+            ).label("ordem"),
+        )
+        .where(VotoIndividual.ano == ano, VotoIndividual.id_partido.is_not(None))
+        .group_by(VotoIndividual.ano, VotoIndividual.id_votacao, VotoIndividual.id_partido, VotoIndividual.id_tipo_voto)
+        .subquery()
+    )
+    sim = func.sum(case((por_tipo.c.id_tipo_voto == id_tipo_voto("Sim"), por_tipo.c.votos), else_=0))
+    nao = func.sum(case((por_tipo.c.id_tipo_voto == id_tipo_voto("Não"), por_tipo.c.votos), else_=0))
+    return (
+        select(
+            por_tipo.c.ano,
+            por_tipo.c.id_votacao,
+            por_tipo.c.id_partido,
+            func.sum(por_tipo.c.votos),
+            sim,
+            nao,
+            func.max(case((por_tipo.c.ordem == 1, por_tipo.c.id_tipo_voto))),
+            func.max(por_tipo.c.votos),
+            cast(func.abs(sim - nao), Float) / func.nullif(sim + nao, 0),
+            cast(func.max(por_tipo.c.votos), Float) / func.sum(por_tipo.c.votos),
+        )
+        .group_by(por_tipo.c.ano, por_tipo.c.id_votacao, por_tipo.c.id_partido)
+    )
+
+COLUNAS = [
+    "ano", "id_votacao", "id_partido", "total_votos", "votos_sim", "votos_nao",
+    "id_tipo_voto_maioria", "votos_maioria", "indice_rice", "concordancia_maioria",
+]
+
+def atualizar_coesao_do_ano(session: Session, ano: int) -> int:
+    """Recalcula a coesão de todos os partidos em todas as sessões do ano; retorna as linhas gravadas."""
+    session.exec(delete(CoesaoPartido).where(CoesaoPartido.ano == ano))
+    return session.execute(insert(CoesaoPartido).from_select(COLUNAS, _select_coesao(ano))).rowcount
+
+def atualizar_coesao(session: Session, anos: Optional[Iterable[int]] = None) -> int:
+    """Recalcula os anos informados (todos os anos com votos, sem `anos`)."""
+    if anos is None:
+        anos = session.exec(select(VotoIndividual.ano).distinct()).all()
+    return sum(atualizar_coesao_do_ano(session, ano) for ano in sorted(anos))
+
+def main():
+    from database import engine
+
+    with Session(engine) as session:
+        total = atualizar_coesao(session)
+        session.commit()
+    logger.info(f"Coesão recalculada: {total} linhas (partido x sessão).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session, delete, select
+
+from config import ANO_REFERENCIA, DASHBOARD_SNAPSHOTS_MANTIDOS
+from models.dashboard_snapshot import DashboardSnapshot
+from routers.analise_router import comparativo_gastos_estados, get_ranking_alinhamento_partidario
+from routers.deputado_router import get_ranking_deputados_despesa
+from routers.partido_router import get_ranking_partidos_despesa
+from utils.mais_votadas import consultar_mais_votadas
+from utils.pagination import PaginationParams
+
+def montar_paineis(session: Session) -> dict:
+    """
+    Calcula os cinco painéis do index.html com os mesmos parâmetros que a página usava
+    ao chamar cada endpoint separadamente, no ANO_REFERENCIA.
+    """
+    ranking_deputados = get_ranking_deputados_despesa(
+        PaginationParams(page=1, per_page=15), session, ano=ANO_REFERENCIA, legislatura=None
+    )
+    return {
+        "partidos_despesa": get_ranking_partidos_despesa(session=session, ano=ANO_REFERENCIA, legislatura=None),
+        "deputados_despesa": ranking_deputados.items,
+        "proposicoes_mais_votadas": consultar_mais_votadas(session, 15),
+        "comparativo_estados": comparativo_gastos_estados(session=session, ano=ANO_REFERENCIA, uf=None),
+        "alinhamento_partidario": get_ranking_alinhamento_partidario(session=session, ano=ANO_REFERENCIA, legislatura=None),
+    }
+
+def _serializar(dados) -> str:
+    return json.dumps(jsonable_encoder(dados), ensure_ascii=False, separators=(",", ":"))
+
+def publicar_snapshot(session: Session, origem: str) -> DashboardSnapshot:
+    """
+    Gera uma nova versão do snapshot do dashboard. Se os painéis não mudaram desde a
+    última versão, nada é gravado e a versão atual é devolvida (o ETag continua válido).
+    """
+    paineis = _serializar(montar_paineis(session))
+    etag = hashlib.sha256(paineis.encode("utf-8")).hexdigest()
+
+    atual = session.exec(select(DashboardSnapshot).order_by(DashboardSnapshot.id.desc()).limit(1)).first()
+    if atual and atual.etag == etag:
+        return atual
+
+    gerado_em = datetime.now(timezone.utc)
+    snapshot = DashboardSnapshot(
+        etag=etag,
+        conteudo=f'{{"gerado_em":"{gerado_em.isoformat()}","paineis":{paineis}}}',
+        origem=origem,
+        gerado_em=gerado_em,
+    )
+    session.add(snapshot)
+    session.flush()
+
+    # Mantém só as últimas versões
+    session.exec(delete(DashboardSnapshot).where(DashboardSnapshot.id <= snapshot.id - DASHBOARD_SNAPSHOTS_MANTIDOS))
+    session.commit()
+    session.refresh(snapshot)
+    return snapshot
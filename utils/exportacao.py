@@ -0,0 +1,243 @@
+"""
+Exportação da base em Parquet, um snapshot por geração de ingestão.
+
+Cada snapshot fica em `EXPORTACAO_DIR/geracao_<n>/`, com um diretório por tabela. As
+tabelas com coluna `ano` gravada por ano (despesas, votos e sessões) são particionadas no
+estilo Hive (`despesa/ano=2024/parte-0.parquet`); as demais vão num arquivo só. As linhas
+são lidas com cursor no servidor (`stream_results`) e convertidas para Arrow em lotes, sem
+materializar a tabela em memória. O `manifesto.json` de cada snapshot lista os arquivos,
+as linhas e os bytes de cada um, e é gravado por último: um snapshot sem manifesto está
+incompleto e é ignorado.
+
+Uma exportação incremental reaproveita (por hard link) as partições de anos que nenhuma
+carga tocou desde o snapshot anterior, segundo os checkpoints da ingestão; as tabelas não
+particionadas são sempre regravadas. Requer o pyarrow.
+
+Uso (a partir da raiz do projeto):
+
+    python -m utils.exportacao               # incremental a partir do último snapshot
+    python -m utils.exportacao --completa    # regrava todas as tabelas
+"""
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, Numeric, SmallInteger, select
+from sqlmodel import Session
+
+from config import EXPORTACAO_DIR, EXPORTACAO_LOTE, EXPORTACAO_SNAPSHOTS_MANTIDOS
+from database import engine
+from log.logger_config import get_logger
+from models.checkpoint_ingest import CheckpointIngest
+from models.deputado import Deputado
+from models.despesa import Despesa
+from models.gabinete import Gabinete
+from models.geracao_ingest import GeracaoIngest
+from models.mandato_deputado import MandatoDeputado
+from models.partido import Partido
+from models.proposicao import Proposicao
+from models.sessao_votacao import SessaoVotacao
+from models.tipo_voto import TipoVoto
+from models.votacao_proposicao import VotacaoProposicao
+from models.voto_individual import VotoIndividual
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional; só a exportação depende dele
+    pa = pq = None
+
+logger = get_logger("exportacao", "log/exportacao.log", console=True)
+
+MANIFESTO = "manifesto.json"
+# Nome da partição das linhas sem ano, como no Hive (o pyarrow lê como nulo)
+PARTICAO_NULA = "__HIVE_DEFAULT_PARTITION__"
+
+# Tabela exportada -> etapa da ingestão que a grava por ano (None: não particionada)
+TABELAS = {
+    Partido: None,
+    Deputado: None,
+    Gabinete: None,
+    MandatoDeputado: None,
+    TipoVoto: None,
+    Proposicao: None,
+    VotacaoProposicao: None,
+    SessaoVotacao: "sessao_proposicao",
+    Despesa: "despesa",
+    VotoIndividual: "voto_individual",
+}
+
+def _tipo_arrow(tipo):
+    if isinstance(tipo, SmallInteger):
+        return pa.int16()
+    if isinstance(tipo, BigInteger):
+        return pa.int64()
+    if isinstance(tipo, Integer):
+        return pa.int32()
+    if isinstance(tipo, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us", tz="UTC" if tipo.timezone else None)
+    if isinstance(tipo, Date):
+        return pa.date32()
+    return pa.string()
+
+def esquema_arrow(modelo):
+    return pa.schema([pa.field(coluna.name, _tipo_arrow(coluna.type), nullable=coluna.nullable) for coluna in modelo.__table__.columns])
+
+def _gravar_parquet(conexao, statement, esquema, caminho: str) -> int:
+    """Grava o resultado de `statement` em `caminho`, lote a lote, e retorna as linhas gravadas."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    resultado = conexao.execution_options(stream_results=True, yield_per=EXPORTACAO_LOTE).execute(statement)
+    linhas = 0
+    with pq.ParquetWriter(caminho, esquema, compression="zstd") as escritor:
+        for lote in resultado.partitions():
+            colunas = zip(*lote)
+            escritor.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, esquema)], schema=esquema
+            ))
+            linhas += len(lote)
+    return linhas
+
+def _arquivo(destino: str, caminho: str, ano: Optional[int], linhas: int, reaproveitado: bool) -> Dict:
+    return {
+        "caminho": caminho, "ano": ano, "linhas": linhas,
+        "bytes": os.path.getsize(os.path.join(destino, caminho)), "reaproveitado": reaproveitado,
+    }
+
+def _reaproveitar(origem: str, destino: str):
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    try:
+        os.link(origem, destino)
+    except OSError:
+        # Sistemas de arquivos sem hard link
+        shutil.copy2(origem, destino)
+
+def diretorio_snapshot(geracao: int, diretorio: str = EXPORTACAO_DIR) -> str:
+    return os.path.join(diretorio, f"geracao_{geracao}")
+
+def snapshots(diretorio: str = EXPORTACAO_DIR) -> List[int]:
+    """Gerações com snapshot completo (com manifesto), da mais antiga para a mais recente."""
+    if not os.path.isdir(diretorio):
+        return []
+    geracoes = []
+    for nome in os.listdir(diretorio):
+        prefixo, _, numero = nome.partition("_")
+        if prefixo == "geracao" and numero.isdigit() and os.path.exists(os.path.join(diretorio, nome, MANIFESTO)):
+            geracoes.append(int(numero))
+    return sorted(geracoes)
+
+def manifesto_atual(diretorio: str = EXPORTACAO_DIR) -> Optional[Dict]:
+    geracoes = snapshots(diretorio)
+    if not geracoes:
+        return None
+    with open(os.path.join(diretorio_snapshot(geracoes[-1], diretorio), MANIFESTO), encoding="utf-8") as f:
+        return json.load(f)
+
+def _anos_alterados(session: Session, desde: datetime) -> Dict[str, Set[str]]:
+    """Unidades (anos) de cada etapa da ingestão gravadas depois de `desde`."""
+    alterados: Dict[str, Set[str]] = {}
+    for etapa, unidade in session.exec(
+        select(CheckpointIngest.etapa, CheckpointIngest.unidade).where(CheckpointIngest.atualizado_em > desde)
+    ).all():
+        alterados.setdefault(etapa, set()).add(unidade)
+    return alterados
+
+def _consulta(modelo, *filtros):
+    # Colunas na ordem da tabela (a do esquema), ordenadas pela chave primária
+    return select(*modelo.__table__.columns).where(*filtros).order_by(*modelo.__table__.primary_key.columns)
+
+def _exportar_particionada(
+    conexao, modelo, etapa: str, destino: str, anterior: Optional[Dict], origem: Optional[str], alterados: Dict[str, Set[str]]
+) -> List[Dict]:
+    """Exporta a tabela um ano por vez; os anos sem alteração são ligados aos arquivos de `origem`."""
+    tabela = modelo.__tablename__
+    esquema = esquema_arrow(modelo)
+    anteriores = {arquivo["ano"]: arquivo for arquivo in anterior["tabelas"].get(tabela, {}).get("arquivos", [])} if anterior else {}
+
+    arquivos = []
+    for (ano,) in conexao.execute(select(modelo.ano).distinct().order_by(modelo.ano)).all():
+        particao = f"ano={PARTICAO_NULA if ano is None else ano}"
+        caminho = os.path.join(tabela, particao, "parte-0.parquet")
+        reaproveitado = ano is not None and ano in anteriores and str(ano) not in alterados.get(etapa, set())
+        if reaproveitado:
+            _reaproveitar(os.path.join(origem, caminho), os.path.join(destino, caminho))
+            linhas = anteriores[ano]["linhas"]
+        else:
+            filtro = modelo.ano.is_(None) if ano is None else modelo.ano == ano
+            linhas = _gravar_parquet(conexao, _consulta(modelo, filtro), esquema, os.path.join(destino, caminho))
+        arquivos.append(_arquivo(destino, caminho, ano, linhas, reaproveitado))
+    return arquivos
+
+def exportar(completa: bool = False, diretorio: str = EXPORTACAO_DIR) -> Dict:
+    """
+    Exporta a base para um snapshot da geração de ingestão atual e retorna o manifesto.
+    Sem `completa`, parte do último snapshot (se houver): não faz nada se ele já é da
+    geração atual e reaproveita as partições de anos que não mudaram.
+    """
+    if pa is None:
+        raise RuntimeError("A exportação em Parquet requer o pyarrow (pip install pyarrow).")
+
+    # Marcado antes da leitura: uma carga que termine durante a exportação entra na próxima
+    inicio = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        geracao = session.exec(select(GeracaoIngest.id).order_by(GeracaoIngest.id.desc()).limit(1)).scalar_one_or_none() or 0
+        anterior = None if completa else manifesto_atual(diretorio)
+        if anterior and anterior["geracao"] == geracao:
+            logger.info(f"O snapshot da geração {geracao} já existe; nada a exportar.")
+            return anterior
+        alterados = _anos_alterados(session, datetime.fromisoformat(anterior["criado_em"])) if anterior else {}
+
+    destino = diretorio_snapshot(geracao, diretorio)
+    origem = diretorio_snapshot(anterior["geracao"], diretorio) if anterior else None
+    temporario = f"{destino}.tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+
+    manifesto = {"geracao": geracao, "criado_em": inicio.isoformat(), "incremental_de": anterior and anterior["geracao"], "tabelas": {}}
+    with engine.connect() as conexao:
+        for modelo, etapa in TABELAS.items():
+            tabela = modelo.__tablename__
+            if etapa:
+                arquivos = _exportar_particionada(conexao, modelo, etapa, temporario, anterior, origem, alterados)
+            else:
+                caminho = os.path.join(tabela, "parte-0.parquet")
+                linhas = _gravar_parquet(conexao, _consulta(modelo), esquema_arrow(modelo), os.path.join(temporario, caminho))
+                arquivos = [_arquivo(temporario, caminho, None, linhas, False)]
+            manifesto["tabelas"][tabela] = {
+                "particionada_por": "ano" if etapa else None,
+                "linhas": sum(arquivo["linhas"] for arquivo in arquivos),
+                "arquivos": arquivos,
+            }
+            logger.info(
+                f"{tabela}: {manifesto['tabelas'][tabela]['linhas']} linhas em {len(arquivos)} arquivo(s) "
+                f"({sum(arquivo['reaproveitado'] for arquivo in arquivos)} reaproveitado(s))."
+            )
+
+    with open(os.path.join(temporario, MANIFESTO), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporario, destino)
+    logger.info(f"Snapshot da geração {geracao} exportado em {destino}.")
+
+    # Os hard links mantêm os arquivos reaproveitados vivos depois da remoção dos antigos
+    for antiga in snapshots(diretorio)[:-EXPORTACAO_SNAPSHOTS_MANTIDOS]:
+        shutil.rmtree(diretorio_snapshot(antiga, diretorio), ignore_errors=True)
+    return manifesto
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta a base em Parquet (um snapshot por geração de ingestão).")
+    parser.add_argument("--completa", action="store_true", help="Regrava todas as tabelas, sem reaproveitar o último snapshot.")
+    parser.add_argument("--diretorio", default=EXPORTACAO_DIR)
+    args = parser.parse_args()
+    manifesto = exportar(completa=args.completa, diretorio=args.diretorio)
+    for tabela, dados in manifesto["tabelas"].items():
+        print(f"{tabela:<20}{dados['linhas']:>12} linhas{len(dados['arquivos']):>6} arquivo(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlmodel import Session, select
+
+from config import HTTP_CACHE_TTL_GERACAO
+from database import engine
+from models.geracao_ingest import GeracaoIngest
+
+# (geração, concluída em, lida em) — reaproveitada por HTTP_CACHE_TTL_GERACAO segundos
+_atual: Tuple[Optional[int], Optional[datetime], float] = (None, None, float("-inf"))
+_lock = threading.Lock()
+
+def nova_geracao(session: Session, origem: str) -> GeracaoIngest:
+    """Registra uma carga concluída; todas as respostas em cache passam a estar desatualizadas."""
+    geracao = GeracaoIngest(origem=origem)
+    session.add(geracao)
+    session.commit()
+    session.refresh(geracao)
+    return geracao
+
+def geracao_atual() -> Tuple[Optional[int], Optional[datetime]]:
+    """
+    Geração atual dos dados e quando foi concluída, ou (None, None) se nenhuma carga foi
+    registrada. Consulta o banco no máximo uma vez a cada HTTP_CACHE_TTL_GERACAO segundos.
+    """
+    global _atual
+    if time.monotonic() - _atual[2] < HTTP_CACHE_TTL_GERACAO:
+        return _atual[0], _atual[1]
+
+    with _lock:
+        if time.monotonic() - _atual[2] < HTTP_CACHE_TTL_GERACAO:
+            return _atual[0], _atual[1]
+        with Session(engine) as session:
+            ultima = session.exec(
+                select(GeracaoIngest.id, GeracaoIngest.concluida_em).order_by(GeracaoIngest.id.desc()).limit(1)
+            ).first()
+        _atual = (*(ultima or (None, None)), time.monotonic())
+        return _atual[0], _atual[1]
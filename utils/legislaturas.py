@@ -0,0 +1,40 @@
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from config import ANO_REFERENCIA
+
+ULTIMA_LEGISLATURA = 57
+# Primeiro ano da 57ª legislatura; cada legislatura dura 4 anos
+INICIO_ULTIMA_LEGISLATURA = 2023
+
+ANO_DESCRICAO = "Filtrar por ano."
+LEGISLATURA_DESCRICAO = "Filtrar por legislatura (ex: 57 = 2023-2026)."
+
+def legislatura_do_ano(ano: int) -> int:
+    return ULTIMA_LEGISLATURA - (INICIO_ULTIMA_LEGISLATURA - ano + 3) // 4
+
+def anos_da_legislatura(legislatura: int) -> List[int]:
+    inicio = INICIO_ULTIMA_LEGISLATURA - (ULTIMA_LEGISLATURA - legislatura) * 4
+    return list(range(inicio, inicio + 4))
+
+def periodo_padrao(ano: Optional[int], legislatura: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+    """Nas rotas analíticas, sem `ano` nem `legislatura` vale o ANO_REFERENCIA."""
+    if ano is None and legislatura is None:
+        return ANO_REFERENCIA, None
+    return ano, legislatura
+
+def filtro_periodo(coluna_ano, ano: Optional[int] = None, legislatura: Optional[int] = None) -> list:
+    """
+    Condições sobre `coluna_ano` para o período pedido. A legislatura vira um intervalo de
+    anos, o que mantém a poda de partições e o uso dos índices na coluna de ano.
+    """
+    condicoes = []
+    if legislatura is not None:
+        anos = anos_da_legislatura(legislatura)
+        if ano is not None and ano not in anos:
+            raise HTTPException(status_code=400, detail=f"O ano {ano} não pertence à legislatura {legislatura} ({anos[0]}-{anos[-1]}).")
+        condicoes.append(coluna_ano.between(anos[0], anos[-1]))
+    if ano is not None:
+        condicoes.append(coluna_ano == ano)
+    return condicoes
@@ -0,0 +1,62 @@
+"""
+Ranking das proposições mais votadas (tabela `rankingproposicao`).
+
+O ranking conta as sessões de votação de cada proposição (`VotacaoProposicao`) e numera as
+proposições da mais para a menos votada (empates pelo id). É recalculado inteiro ao fim de
+cada carga, com um único INSERT ... SELECT, e as rotas só leem um intervalo de posições.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, func, select
+
+from models.proposicao import Proposicao
+from models.ranking_proposicao import RankingProposicao
+from models.votacao_proposicao import VotacaoProposicao
+from utils.projecao import linhas_para_dicts
+
+def atualizar_mais_votadas(session: Session) -> int:
+    """Recalcula o ranking e retorna o número de proposições ranqueadas."""
+    contagem = (
+        select(VotacaoProposicao.id_proposicao, func.count(VotacaoProposicao.id_votacao).label("total_votacoes"))
+        .group_by(VotacaoProposicao.id_proposicao)
+        .subquery()
+    )
+    ranking = (
+        select(
+            func.row_number().over(order_by=(contagem.c.total_votacoes.desc(), Proposicao.id)),
+            Proposicao.id,
+            Proposicao.id_dados_abertos,
+            Proposicao.sigla_tipo,
+            Proposicao.ano,
+            Proposicao.ementa,
+            contagem.c.total_votacoes,
+        )
+        .join(contagem, contagem.c.id_proposicao == Proposicao.id)
+    )
+    colunas = ["posicao", "id_proposicao", "id_dados_abertos", "sigla_tipo", "ano", "ementa", "total_votacoes"]
+
+    session.exec(delete(RankingProposicao))
+    return session.execute(insert(RankingProposicao).from_select(colunas, ranking)).rowcount
+
+def select_mais_votadas(ano: Optional[int] = None, sigla_tipo: Optional[str] = None):
+    """Colunas do `ProposicaoMaisVotadaDTO` (e a posição), com os filtros opcionais, sem ordenação."""
+    statement = select(
+        RankingProposicao.posicao,
+        RankingProposicao.id_proposicao.label("id"),
+        RankingProposicao.id_dados_abertos,
+        RankingProposicao.sigla_tipo,
+        RankingProposicao.ano,
+        RankingProposicao.ementa,
+        RankingProposicao.total_votacoes,
+    )
+    if ano is not None:
+        statement = statement.where(RankingProposicao.ano == ano)
+    if sigla_tipo:
+        statement = statement.where(RankingProposicao.sigla_tipo == sigla_tipo.upper())
+    return statement
+
+def consultar_mais_votadas(session: Session, limite: int, ano: Optional[int] = None, sigla_tipo: Optional[str] = None) -> List[Dict]:
+    """As `limite` primeiras proposições do ranking, com os filtros opcionais."""
+    statement = select_mais_votadas(ano, sigla_tipo).order_by(RankingProposicao.posicao).limit(limite)
+    return linhas_para_dicts(session.exec(statement).all())
@@ -0,0 +1,199 @@
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from log.logger_config import get_logger
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence, extra: Optional[Tuple[str, str]] = None) -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+        self._valores: Dict[Tuple, object] = {}
+
+    def _chave(self, rotulos: Dict) -> Tuple:
+        return tuple(str(rotulos.get(nome, "")) for nome in self.rotulos)
+
+    def cabecalho(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos) -> float:
+        return self._valores.get(self._chave(rotulos), 0)
+
+    def renderizar(self) -> List[str]:
+        with self._lock:
+            itens = list(self._valores.items())
+        return self.cabecalho() + [f"{self.nome}{_formatar_rotulos(self.rotulos, k)} {v}" for k, v in itens]
+
+class Medidor(_Metrica):
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), funcao: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        super().__init__(nome, ajuda, rotulos)
+        # Medidores calculados na hora da coleta (ex: estado do pool de conexões)
+        self._funcao = funcao
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def dec(self, valor: float = 1, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def set(self, valor: float, **rotulos):
+        with self._lock:
+            self._valores[self._chave(rotulos)] = valor
+
+    def renderizar(self) -> List[str]:
+        if self._funcao:
+            itens = list(self._funcao().items())
+        else:
+            with self._lock:
+                itens = list(self._valores.items())
+        return self.cabecalho() + [f"{self.nome}{_formatar_rotulos(self.rotulos, k)} {v}" for k, v in itens]
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), buckets: Sequence[float] = BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+
+    def observar(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            contagens, soma, total = self._valores.get(chave) or ([0] * len(self.buckets), 0.0, 0)
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    contagens[i] += 1
+            self._valores[chave] = (contagens, soma + valor, total + 1)
+
+    def renderizar(self) -> List[str]:
+        with self._lock:
+            itens = [(k, (list(c), s, t)) for k, (c, s, t) in self._valores.items()]
+        linhas = self.cabecalho()
+        for chave, (contagens, soma, total) in itens:
+            for limite, contagem in zip(self.buckets, contagens):
+                linhas.append(f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, ('le', repr(limite)))} {contagem}")
+            linhas.append(f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, ('le', '+Inf'))} {total}")
+            linhas.append(f"{self.nome}_sum{_formatar_rotulos(self.rotulos, chave)} {soma}")
+            linhas.append(f"{self.nome}_count{_formatar_rotulos(self.rotulos, chave)} {total}")
+        return linhas
+
+class Registro:
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def renderizar(self) -> str:
+        """Formato de exposição em texto do Prometheus (0.0.4)."""
+        linhas: List[str] = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.renderizar())
+        return "\n".join(linhas) + "\n"
+
+registro = Registro()
+
+# API
+HTTP_REQUISICOES = registro.registrar(Contador(
+    "http_requisicoes_total", "Requisições atendidas por rota e status.", ("metodo", "rota", "status")))
+HTTP_DURACAO = registro.registrar(Histograma(
+    "http_requisicao_duracao_segundos", "Latência das requisições por rota e status.", ("metodo", "rota", "status")))
+HTTP_EM_ANDAMENTO = registro.registrar(Medidor(
+    "http_requisicoes_em_andamento", "Requisições sendo processadas no momento."))
+DB_POOL_CHECKOUT = registro.registrar(Histograma(
+    "db_pool_checkout_segundos", "Tempo de espera para obter uma conexão do pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)))
+CACHE_CONSULTAS = registro.registrar(Contador(
+    "cache_consultas_total", "Consultas aos caches por resultado (acerto/falha).", ("cache", "resultado")))
+
+# Ingestão (tratamentoDados)
+INGEST_REGISTROS = registro.registrar(Contador(
+    "ingest_registros_total", "Registros processados pelos loaders.", ("loader", "resultado")))
+INGEST_HTTP_DURACAO = registro.registrar(Histograma(
+    "ingest_http_duracao_segundos", "Latência das chamadas à API de Dados Abertos.", ("loader", "status")))
+
+def registrar_pool(engine):
+    """Expõe o estado do pool de conexões do engine como medidor calculado na coleta."""
+    def estado_pool() -> Dict[Tuple, float]:
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            return {}
+        return {
+            ("em_uso",): pool.checkedout(),
+            ("ociosas",): pool.checkedin(),
+            ("excedentes",): max(pool.overflow(), 0),
+        }
+    registro.registrar(Medidor("db_pool_conexoes", "Conexões do pool por estado.", ("estado",), funcao=estado_pool))
+
+def registrar_cache(cache: str, acerto: bool):
+    CACHE_CONSULTAS.inc(cache=cache, resultado="acerto" if acerto else "falha")
+
+@contextmanager
+def cronometrar_http(loader: str):
+    """Mede a duração de uma chamada HTTP de um loader; o status é preenchido por quem chama."""
+    resultado = {"status": "erro"}
+    inicio = time.perf_counter()
+    try:
+        yield resultado
+    finally:
+        INGEST_HTTP_DURACAO.observar(time.perf_counter() - inicio, loader=loader, status=resultado["status"])
+
+def publicar_metricas_ingest(job: str):
+    """
+    Publica as métricas acumuladas por um loader. Com `PUSHGATEWAY_URL` definido envia para
+    um Pushgateway (ou coletor compatível); caso contrário grava um arquivo `.prom` no
+    diretório do textfile collector (`METRICAS_TEXTFILE_DIR`, padrão `log/metricas`).
+    """
+    conteudo = registro.renderizar()
+    pushgateway = os.getenv("PUSHGATEWAY_URL")
+    if pushgateway:
+        try:
+            requests.put(
+                f"{pushgateway.rstrip('/')}/metrics/job/{job}",
+                data=conteudo.encode("utf-8"),
+                headers={"Content-Type": "text/plain; version=0.0.4"},
+                timeout=5,
+            )
+        except requests.exceptions.RequestException as e:
+            get_logger("ingest_metricas", "log/ingest.log").warning(f"Falha ao enviar métricas para o Pushgateway: {e}")
+        return
+
+    diretorio = os.getenv("METRICAS_TEXTFILE_DIR", "log/metricas")
+    os.makedirs(diretorio, exist_ok=True)
+    # Escrita atômica: o coletor nunca lê um arquivo pela metade
+    fd, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    os.replace(temporario, os.path.join(diretorio, f"{job}.prom"))
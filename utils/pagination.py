@@ -1,6 +1,10 @@
-from typing import Generic, TypeVar, List
+import base64
+import binascii
+import json
+import math
+from typing import Generic, Optional, Tuple, TypeVar, List
 from pydantic import BaseModel
-from fastapi import Query
+from fastapi import HTTPException, Query
 
 T = TypeVar('T') 
 
@@ -19,4 +23,53 @@ class PaginatedResponse(BaseModel, Generic[T]):
     def total_pages(self) -> int:
         if self.per_page == 0:
             return 0
-        return (self.total + self.per_page - 1) // self.per_page
\ No newline at end of file
+        return (self.total + self.per_page - 1) // self.per_page
+
+def pagina(items: list, total: int, pagination: PaginationParams) -> dict:
+    """Mesmo formato do `PaginatedResponse`, como dict, para respostas serializadas direto pela `RespostaJSON`."""
+    return {
+        "items": items,
+        "total": total,
+        "page": pagination.page,
+        "per_page": pagination.per_page,
+        "total_pages": math.ceil(total / pagination.per_page) if total > 0 else 0,
+    }
+
+
+class CursorParams(BaseModel):
+    cursor: Optional[str] = Query(None, description="Cursor devolvido em `next_cursor` pela página anterior")
+    limit: int = Query(100, ge=1, le=1000, description="Number of items per page")
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    items: List[T] # List of items in the current page
+    next_cursor: Optional[str] # Cursor for the next page (None on the last page)
+    limit: int # Maximum number of items per page
+
+def codificar_cursor(ultimo_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": ultimo_id}).encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+def paginar_por_cursor(session, statement, coluna_id, params: CursorParams) -> Tuple[list, Optional[str]]:
+    """
+    Paginação por keyset na coluna `coluna_id` (que precisa estar no SELECT): custo constante
+    por página, ao contrário do OFFSET, e sem a contagem total. Devolve as linhas e o cursor
+    da próxima página.
+    """
+    if params.cursor:
+        statement = statement.where(coluna_id > decodificar_cursor(params.cursor))
+    linhas = session.exec(statement.order_by(coluna_id).limit(params.limit + 1)).all()
+
+    proximo = None
+    if len(linhas) > params.limit:
+        linhas = linhas[:params.limit]
+        proximo = codificar_cursor(getattr(linhas[-1], coluna_id.key))
+    return linhas, proximo
+
+def pagina_cursor(items: list, proximo_cursor: Optional[str], params: CursorParams) -> dict:
+    """Mesmo formato do `CursorPaginatedResponse`, como dict."""
+    return {"items": items, "next_cursor": proximo_cursor, "limit": params.limit}
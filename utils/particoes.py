@@ -0,0 +1,102 @@
+import json
+import re
+from datetime import date
+from typing import List, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+# Tabelas de fatos particionadas por RANGE (ano), uma partição por ano: <tabela>_<ano>
+TABELAS_PARTICIONADAS = ("despesa", "votoindividual")
+SCHEMA_ARQUIVO = "arquivo"
+
+# Partições já confirmadas neste processo, para não consultar o catálogo a cada lote. Uma
+# partição criada numa transação só entra depois do commit dela (um rollback desfaz o
+# CREATE TABLE); até lá fica em `info` da conexão
+_existentes: Set[Tuple[str, int]] = set()
+_PENDENTES = "particoes_pendentes"
+
+@event.listens_for(Engine, "commit")
+def _confirmar_pendentes(conexao):
+    _existentes.update(conexao.info.pop(_PENDENTES, ()))
+
+@event.listens_for(Engine, "rollback")
+def _descartar_pendentes(conexao):
+    conexao.info.pop(_PENDENTES, None)
+
+def _postgres(conexao) -> bool:
+    # Aceita tanto Session quanto Connection; fora do Postgres as tabelas não são particionadas
+    bind = conexao.get_bind() if hasattr(conexao, "get_bind") else conexao
+    return bind.dialect.name == "postgresql"
+
+def nome_particao(tabela: str, ano: int) -> str:
+    return f"{tabela}_{ano}"
+
+def garantir_particao(conexao, tabela: str, ano: int):
+    """
+    Cria a partição de `tabela` para `ano` se ela ainda não existir. Chamada pelas cargas
+    antes de gravar linhas de um ano novo.
+    """
+    if (tabela, ano) in _existentes or not _postgres(conexao):
+        return
+    # A Connection da transação em curso, também quando `conexao` é uma Session
+    conexao = conexao.connection() if hasattr(conexao, "get_bind") else conexao
+    pendentes = conexao.info.setdefault(_PENDENTES, set())
+    if (tabela, ano) in pendentes:
+        return
+    particao = nome_particao(tabela, ano)
+    if conexao.execute(text("SELECT to_regclass(:nome)"), {"nome": particao}).scalar() is None:
+        conexao.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {particao} PARTITION OF {tabela} FOR VALUES FROM ({ano}) TO ({ano + 1})"
+        ))
+    pendentes.add((tabela, ano))
+
+def garantir_particoes(conexao, anos):
+    """Garante as partições de todas as tabelas particionadas para os anos informados."""
+    for ano in sorted(set(anos)):
+        for tabela in TABELAS_PARTICIONADAS:
+            garantir_particao(conexao, tabela, ano)
+
+def preparar_proximo_ano(conexao):
+    """Cria com antecedência as partições do ano corrente e do seguinte."""
+    ano = date.today().year
+    garantir_particoes(conexao, [ano, ano + 1])
+
+def listar_particoes(conexao, tabela: str) -> List[Tuple[str, int]]:
+    """Partições anexadas a `tabela` como (nome, linhas estimadas), em ordem de nome."""
+    return [tuple(linha) for linha in conexao.execute(text(
+        "SELECT c.relname, c.reltuples::bigint FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:tabela) ORDER BY c.relname"
+    ), {"tabela": tabela}).all()]
+
+def arquivar_particao(conexao, tabela: str, ano: int, remover: bool = False):
+    """
+    Desanexa a partição do ano, o que só altera o catálogo: os dados saem das consultas
+    sem DELETE nem VACUUM. A tabela desanexada vai para o schema `arquivo` ou, com
+    `remover`, é descartada.
+    """
+    particao = nome_particao(tabela, ano)
+    conexao.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {particao}"))
+    if remover:
+        conexao.execute(text(f"DROP TABLE {particao}"))
+    else:
+        conexao.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA_ARQUIVO}"))
+        conexao.execute(text(f"ALTER TABLE {particao} SET SCHEMA {SCHEMA_ARQUIVO}"))
+    _existentes.discard((tabela, ano))
+
+def particoes_lidas(conexao, sql: str) -> Set[str]:
+    """Partições que o plano de `sql` efetivamente lê, para conferir a poda (partition pruning)."""
+    plano = conexao.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+    padrao = re.compile(rf"^({'|'.join(TABELAS_PARTICIONADAS)})_\d{{4}}$")
+
+    lidas = set()
+    pendentes = [plano[0]["Plan"]]
+    while pendentes:
+        no = pendentes.pop()
+        if padrao.match(no.get("Relation Name", "")):
+            lidas.add(no["Relation Name"])
+        pendentes.extend(no.get("Plans", []))
+    return lidas
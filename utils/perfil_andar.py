@@ -0,0 +1,81 @@
+"""
+Cubo das análises por andar dos gabinetes (tabela `perfilandar`).
+
+As rotas de `/gabinete/analise` e `/gabinete/perfil_completo_por_andar` agregavam a cada
+chamada Gabinete -> Deputado -> Partido -> Despesa, filtrando andar e prédio com ILIKE. O
+cubo guarda essas agregações prontas por (ano, andar, prédio, partido), com andar e prédio
+normalizados em chaves comparadas por igualdade (e cobertas pelo índice único), e as rotas
+só somam as poucas linhas do andar pedido. Cada combinação de andar, prédio e partido com
+gabinete tem uma linha para cada ano com despesas (e para o ANO_REFERENCIA), mesmo sem
+gastos: a ocupação do andar não depende do ano.
+
+O cubo é recalculado inteiro, numa transação, ao fim de cada carga.
+"""
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, func, select
+
+from config import ANO_REFERENCIA
+from models.deputado import Deputado
+from models.despesa import Despesa
+from models.gabinete import Gabinete
+from models.perfil_andar import PerfilAndar
+
+def chave_local(valor: Optional[str]) -> str:
+    """Normaliza um prédio ou andar para comparação: 'Anexo  IV ' e 'anexo iv' viram 'anexo iv'."""
+    sem_acentos = unicodedata.normalize("NFKD", valor or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acentos.casefold().split())
+
+def atualizar_perfil_andar(session: Session) -> int:
+    """Recalcula o cubo a partir dos gabinetes e das despesas e retorna as linhas gravadas."""
+    # Ocupação: deputados por andar, prédio e partido, como vieram da API
+    ocupacao = session.exec(
+        select(Gabinete.predio, Gabinete.andar, Deputado.id_partido, func.count(Deputado.id))
+        .join(Deputado, Gabinete.id_deputado == Deputado.id)
+        .group_by(Gabinete.predio, Gabinete.andar, Deputado.id_partido)
+    ).all()
+    # Cada deputado tem um gabinete só, então as contagens de grupos que a normalização junta podem ser somadas
+    gastos = session.exec(
+        select(
+            Gabinete.predio, Gabinete.andar, Deputado.id_partido, Despesa.ano,
+            func.count(Despesa.id), func.count(func.distinct(Deputado.id)), func.sum(Despesa.valor_liquido),
+        )
+        .join(Deputado, Gabinete.id_deputado == Deputado.id)
+        .join(Despesa, Despesa.id_deputado == Deputado.id)
+        .group_by(Gabinete.predio, Gabinete.andar, Deputado.id_partido, Despesa.ano)
+    ).all()
+
+    # Nome exibido de cada (prédio, andar) normalizado: o primeiro em ordem alfabética
+    exibicao: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}
+    deputados: Dict[Tuple[str, str, Optional[int]], int] = defaultdict(int)
+    for predio, andar, id_partido, quantidade in sorted(ocupacao, key=lambda linha: (linha[0] or "", linha[1] or "")):
+        local = (chave_local(predio), chave_local(andar))
+        exibicao.setdefault(local, (predio, andar))
+        deputados[(*local, id_partido)] += quantidade
+
+    despesas: Dict[Tuple, list] = defaultdict(lambda: [0, 0, 0.0])
+    for predio, andar, id_partido, ano, quantidade, com_despesa, total in gastos:
+        acumulado = despesas[(chave_local(predio), chave_local(andar), id_partido, ano)]
+        acumulado[0] += quantidade
+        acumulado[1] += com_despesa
+        acumulado[2] += total or 0.0
+
+    anos = {chave[3] for chave in despesas} | {ANO_REFERENCIA}
+    linhas = []
+    for (predio_chave, andar_chave, id_partido), no_andar in deputados.items():
+        predio, andar = exibicao[(predio_chave, andar_chave)]
+        for ano in sorted(anos):
+            quantidade, com_despesa, total = despesas.get((predio_chave, andar_chave, id_partido, ano), (0, 0, 0.0))
+            linhas.append({
+                "ano": ano, "andar_chave": andar_chave, "predio_chave": predio_chave, "andar": andar, "predio": predio,
+                "id_partido": id_partido, "deputados_no_andar": no_andar, "deputados_com_despesa": com_despesa,
+                "quantidade_despesas": quantidade, "total_gasto": total,
+            })
+
+    session.exec(delete(PerfilAndar))
+    if linhas:
+        session.execute(insert(PerfilAndar), linhas)
+    return len(linhas)
@@ -0,0 +1,147 @@
+"""
+Placar das proposições (tabela `placar`), servido em `/proposicao/{id}/placar`.
+
+Para cada proposição, o placar traz a contagem dos votos por tipo (Sim, Não, Abstenção,
+Obstrução e os demais que aparecerem) no total e em cada sessão de votação ligada a ela por
+`VotacaoProposicao`, e em cada sessão também por partido e por UF. O partido é o do
+deputado na data do voto (`VotoIndividual.id_partido`) e a UF a do mandato na legislatura
+da votação. O payload JSON fica gravado pronto, uma linha por proposição: a rota só lê a
+linha pela chave primária.
+
+A carga dos votos recalcula, ao fim de cada ano, o placar das proposições com sessões
+naquele ano. Para recalcular todos (por exemplo, depois da migração que cria a tabela):
+
+    python -m utils.placar
+"""
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlmodel import Session, func, select
+
+from log.logger_config import get_logger
+from models.deputado import Deputado
+from models.mandato_deputado import MandatoDeputado
+from models.partido import Partido
+from models.placar import Placar
+from models.sessao_votacao import SessaoVotacao
+from models.tipo_voto import TipoVoto
+from models.votacao_proposicao import VotacaoProposicao
+from models.voto_individual import VotoIndividual
+from utils.carga_bulk import upsert
+from utils.legislaturas import legislatura_do_ano
+
+logger = get_logger("placar", "log/ingest.log", console=True)
+
+# Tipos sempre presentes no placar, mesmo com zero votos
+TIPOS_PLACAR = ("Sim", "Não", "Abstenção", "Obstrução")
+SEM_PARTIDO = "sem_partido"
+SEM_UF = "sem_uf"
+# Placares gravados por INSERT
+LOTE = 500
+
+def _contagem() -> Dict[str, int]:
+    return dict.fromkeys(TIPOS_PLACAR + ("total",), 0)
+
+def _somar(contagem: Dict[str, int], tipo: str, quantidade: int):
+    contagem[tipo] = contagem.get(tipo, 0) + quantidade
+    contagem["total"] += quantidade
+
+def placar_vazio(id_proposicao: int) -> Dict:
+    return {"id_proposicao": id_proposicao, "placar": _contagem(), "sessoes": []}
+
+def _contar_votos(session: Session, ano: int, ids_sessao: List[int]):
+    """Votos das sessões de um ano por (sessão, tipo, partido, UF)."""
+    uf = func.coalesce(MandatoDeputado.sigla_uf, Deputado.sigla_uf)
+    return session.exec(
+        select(VotoIndividual.id_votacao, VotoIndividual.id_tipo_voto, VotoIndividual.id_partido, uf, func.count())
+        .join(Deputado, Deputado.id == VotoIndividual.id_deputado)
+        .outerjoin(MandatoDeputado, (MandatoDeputado.id_deputado == VotoIndividual.id_deputado)
+                   & (MandatoDeputado.id_legislatura == legislatura_do_ano(ano)))
+        .where(VotoIndividual.ano == ano, VotoIndividual.id_votacao.in_(ids_sessao))
+        .group_by(VotoIndividual.id_votacao, VotoIndividual.id_tipo_voto, VotoIndividual.id_partido, uf)
+    ).all()
+
+def montar_placares(session: Session, ids_proposicao: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+    """Placar de cada proposição informada (de todas as que têm sessões, sem `ids_proposicao`)."""
+    consulta = (
+        select(
+            VotacaoProposicao.id_proposicao, SessaoVotacao.id, SessaoVotacao.id_dados_abertos, SessaoVotacao.ano,
+            SessaoVotacao.data_hora_registro, SessaoVotacao.sigla_orgao, SessaoVotacao.aprovacao,
+        )
+        .join(SessaoVotacao, SessaoVotacao.id == VotacaoProposicao.id_votacao)
+        # Mais recentes primeiro, como em /proposicao/{id}/sessoes
+        .order_by(VotacaoProposicao.id_proposicao, SessaoVotacao.data_hora_registro.desc(), SessaoVotacao.id)
+    )
+    if ids_proposicao is not None:
+        consulta = consulta.where(VotacaoProposicao.id_proposicao.in_(list(ids_proposicao)))
+    vinculos = session.exec(consulta).all()
+
+    sessoes: Dict[int, Dict] = {}
+    por_ano: Dict[int, List[int]] = defaultdict(list)
+    for _, id_sessao, id_dados_abertos, ano, data_hora, sigla_orgao, aprovacao in vinculos:
+        if id_sessao not in sessoes:
+            sessoes[id_sessao] = {
+                "id_votacao": id_sessao, "id_dados_abertos": id_dados_abertos, "data_hora_registro": data_hora,
+                "sigla_orgao": sigla_orgao, "aprovacao": aprovacao,
+                "placar": _contagem(), "por_partido": {}, "por_uf": {},
+            }
+            if ano is not None:
+                por_ano[ano].append(id_sessao)
+
+    tipos = dict(session.exec(select(TipoVoto.id, TipoVoto.nome)).all())
+    siglas = dict(session.exec(select(Partido.id, Partido.sigla)).all())
+    for ano, ids_sessao in por_ano.items():
+        for id_sessao, id_tipo_voto, id_partido, uf, quantidade in _contar_votos(session, ano, ids_sessao):
+            sessao, tipo = sessoes[id_sessao], tipos[id_tipo_voto]
+            _somar(sessao["placar"], tipo, quantidade)
+            _somar(sessao["por_partido"].setdefault(siglas.get(id_partido) or SEM_PARTIDO, _contagem()), tipo, quantidade)
+            _somar(sessao["por_uf"].setdefault(uf or SEM_UF, _contagem()), tipo, quantidade)
+
+    placares: Dict[int, Dict] = {}
+    for id_proposicao, id_sessao, *_ in vinculos:
+        placar = placares.setdefault(id_proposicao, placar_vazio(id_proposicao))
+        sessao = sessoes[id_sessao]
+        placar["sessoes"].append(sessao)
+        for tipo, quantidade in sessao["placar"].items():
+            if tipo != "total":
+                _somar(placar["placar"], tipo, quantidade)
+    return placares
+
+def atualizar_placares(session: Session, ids_proposicao: Optional[Iterable[int]] = None) -> int:
+    """Recalcula e grava o placar das proposições informadas (de todas, sem `ids_proposicao`)."""
+    agora = datetime.now(timezone.utc)
+    linhas = [
+        {
+            "id_proposicao": id_proposicao,
+            "sessoes": len(placar["sessoes"]),
+            "total_votos": placar["placar"]["total"],
+            "conteudo": json.dumps(placar, ensure_ascii=False, separators=(",", ":")),
+            "atualizado_em": agora,
+        }
+        for id_proposicao, placar in montar_placares(session, ids_proposicao).items()
+    ]
+    for inicio in range(0, len(linhas), LOTE):
+        upsert(session, Placar, linhas[inicio:inicio + LOTE], chave=["id_proposicao"], retornar=("id_proposicao",))
+    return len(linhas)
+
+def atualizar_placares_do_ano(session: Session, ano: int) -> int:
+    """Recalcula o placar das proposições com alguma sessão de votação no ano."""
+    ids_proposicao = session.exec(
+        select(VotacaoProposicao.id_proposicao).distinct()
+        .join(SessaoVotacao, SessaoVotacao.id == VotacaoProposicao.id_votacao)
+        .where(SessaoVotacao.ano == ano)
+    ).all()
+    return atualizar_placares(session, ids_proposicao) if ids_proposicao else 0
+
+def main():
+    from database import engine
+
+    with Session(engine) as session:
+        total = atualizar_placares(session)
+        session.commit()
+    logger.info(f"Placar recalculado para {total} proposições.")
+
+if __name__ == "__main__":
+    main()
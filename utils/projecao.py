@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional, Sequence, Type
+
+from fastapi import HTTPException
+
+from sqlmodel import SQLModel
+
+def colunas(dto: Type[SQLModel], modelo: Type[SQLModel], prefixo: str = "") -> list:
+    """
+    Colunas de `modelo` correspondentes aos campos de `dto`, para consultas projetadas:
+    o banco devolve só o que a resposta usa e as linhas não passam pelo identity map do ORM.
+    """
+    return [getattr(modelo, campo).label(prefixo + campo) for campo in dto.model_fields if campo in modelo.__table__.columns]
+
+def linhas_para_dicts(linhas: Sequence) -> List[Dict]:
+    """Converte as linhas de uma consulta projetada em dicts prontos para a `RespostaJSON`."""
+    return [linha._asdict() for linha in linhas]
+
+def extrair_aninhado(item: Dict, prefixo: str) -> Dict:
+    """
+    Move as colunas `<prefixo>campo` de um item para um dict aninhado em `item[prefixo]`
+    (ou None, se vieram todas nulas de um outer join).
+    """
+    aninhado = {chave[len(prefixo):]: item.pop(chave) for chave in [c for c in item if c.startswith(prefixo)]}
+    item[prefixo.rstrip("_")] = aninhado if any(v is not None for v in aninhado.values()) else None
+    return item
+
+def campos_selecionados(dto: Type[SQLModel], fields: Optional[str]) -> List[str]:
+    """
+    Valida o parâmetro `fields` (ex: `tipo_voto,id_votacao`) contra os campos do DTO.
+    Sem `fields`, devolve todos os campos.
+    """
+    if not fields:
+        return list(dto.model_fields)
+    pedidos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    invalidos = [campo for campo in pedidos if campo not in dto.model_fields]
+    if invalidos or not pedidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos em `fields`: {', '.join(invalidos) or '(vazio)'}. Disponíveis: {', '.join(dto.model_fields)}.",
+        )
+    return pedidos
@@ -1,13 +1,66 @@
+from typing import List, Optional
+from sqlalchemy import String, cast, literal
 from sqlmodel import select, func
+from models.deputado import Deputado
 from models.despesa import Despesa
+from models.mandato_deputado import MandatoDeputado
+from models.partido import Partido
+from models.sessao_votacao import SessaoVotacao
+from models.tipo_voto import TipoVoto
+from models.voto_individual import VotoIndividual
+from utils.legislaturas import filtro_periodo, legislatura_do_ano
 
-def get_despesas_deputado_2024_subquery():
+URI_DEPUTADOS = "https://dadosabertos.camara.leg.br/api/v2/deputados/"
+
+def get_despesas_deputado_subquery(ano: Optional[int] = None, legislatura: Optional[int] = None):
     despesas_subquery = (
         select(
             Despesa.id_deputado,
             func.sum(Despesa.valor_liquido).label("total_despesas")
         )
+        .where(*filtro_periodo(Despesa.ano, ano, legislatura))
         .group_by(Despesa.id_deputado)
         .subquery() 
     )
-    return despesas_subquery
\ No newline at end of file
+    return despesas_subquery
+
+def legislatura_do_periodo(ano: Optional[int], legislatura: Optional[int]) -> int:
+    return legislatura if legislatura is not None else legislatura_do_ano(ano)
+
+def deputados_da_legislatura(legislatura: int):
+    """Ids dos deputados com mandato na legislatura (para usar com `in_`)."""
+    return select(MandatoDeputado.id_deputado).where(MandatoDeputado.id_legislatura == legislatura)
+
+def id_tipo_voto(nome: str):
+    """Id do tipo de voto pelo nome, como subquery escalar (avaliada uma vez por consulta)."""
+    return select(TipoVoto.id).where(TipoVoto.nome == nome).scalar_subquery()
+
+# Campo da resposta de VotoIndividual -> (expressão, join necessário: (tabela, condição, outer))
+_CAMPOS_VOTO = {
+    "id": (VotoIndividual.id, None),
+    "id_votacao": (VotoIndividual.id_votacao, None),
+    "id_deputado": (VotoIndividual.id_deputado, None),
+    "data_hora_registro": (VotoIndividual.data_hora_registro, None),
+    "tipo_voto": (TipoVoto.nome, (TipoVoto, TipoVoto.id == VotoIndividual.id_tipo_voto, False)),
+    "sigla_partido_deputado": (Partido.sigla, (Partido, Partido.id == VotoIndividual.id_partido, True)),
+    # As URIs não são mais gravadas em cada voto: são reconstruídas a partir das tabelas de origem
+    "uri_deputado": (
+        literal(URI_DEPUTADOS) + cast(Deputado.id_dados_abertos, String),
+        (Deputado, Deputado.id == VotoIndividual.id_deputado, False),
+    ),
+    "uri_sessao_votacao": (SessaoVotacao.uri, (SessaoVotacao, SessaoVotacao.id == VotoIndividual.id_votacao, False)),
+}
+
+def select_votos(campos: List[str]):
+    """
+    SELECT de VotoIndividual com os campos do `VotoIndividualResponse` pedidos, fazendo só
+    os joins que esses campos exigem.
+    """
+    statement = select(*[_CAMPOS_VOTO[campo][0].label(campo) for campo in campos]).select_from(VotoIndividual)
+    tabelas = set()
+    for campo in campos:
+        join = _CAMPOS_VOTO[campo][1]
+        if join and join[0] not in tabelas:
+            tabelas.add(join[0])
+            statement = statement.join(join[0], join[1], isouter=join[2])
+    return statement
@@ -0,0 +1,20 @@
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele cai no json da biblioteca padrão
+    orjson = None
+
+class RespostaJSON(JSONResponse):
+    """
+    Classe de resposta padrão da API. Serializa com orjson quando instalado (várias vezes
+    mais rápido que `json.dumps` para listas grandes); o conteúdo deve ser composto de
+    tipos nativos (dict, list, str, números, datetime), como as linhas de `linhas_para_dicts`.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)